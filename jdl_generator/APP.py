@@ -1,5 +1,8 @@
 import os
 import pandas as pd
+from workbook import read_sheet, workbook_path
+import instrumentation
+from outputs import write_if_changed
 
 def generate_app_jdl(**config_params):
     """
@@ -30,30 +33,50 @@ def generate_app_jdl(**config_params):
 
     return "\n".join(lines) + "\n"
 
-def main():
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    excel_file_name = "TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx"
-    excel_file_path = os.path.join(base_dir, excel_file_name)
-    aba_app = "APP"
-    output_file = os.path.join(base_dir, "APP.jdl")
-    
-    if not os.path.exists(excel_file_path):
-        print(f"[ERRO] Arquivo de planilha '{excel_file_path}' não encontrado.")
-        return
-    
-    try:
-        # Lê a planilha com as configurações da aplicação
-        df = pd.read_excel(excel_file_path, sheet_name=aba_app, dtype=str)
-        
-        # Verifica se a planilha tem o formato esperado (uma linha por parâmetro)
-        if 'Parameter' in df.columns and 'Value' in df.columns:
-            # Formato: Parameter | Value
-            config = {}
-            for _, row in df.iterrows():
-                param = row.get("Parameter", "").strip()
-                value = row.get("Value", "").strip()
-                
-                if param:
+def read_app_config(excel_file_path, aba_app="APP"):
+    """
+    Lê os parâmetros do bloco application da aba APP, em um dos dois
+    formatos aceitos (colunas Parameter | Value, ou uma coluna por
+    parâmetro com uma linha de valores), já convertidos para bool, int,
+    lista ou None. O resultado vai direto para generate_app_jdl(**config).
+    """
+    # Lê a planilha com as configurações da aplicação
+    df = read_sheet(excel_file_path, aba_app)
+    instrumentation.rows_read(aba_app, len(df))
+
+    # Verifica se a planilha tem o formato esperado (uma linha por parâmetro)
+    if 'Parameter' in df.columns and 'Value' in df.columns:
+        # Formato: Parameter | Value
+        config = {}
+        for _, row in df.iterrows():
+            param = row.get("Parameter", "").strip()
+            value = row.get("Value", "").strip()
+
+            if param:
+                # Converte valores booleanos e numéricos
+                if value.lower() in ["true", "yes", "1"]:
+                    value = True
+                elif value.lower() in ["false", "no", "0"]:
+                    value = False
+                elif value.isdigit():
+                    value = int(value)
+                elif value.lower() == "none":
+                    value = None
+                elif "," in value and not value.startswith("["):
+                    # Converte strings separadas por vírgula em listas
+                    value = [item.strip() for item in value.split(",")]
+
+                config[param] = value
+    else:
+        # Formato: uma coluna por parâmetro, uma linha de valores
+        config = {}
+        # Pega a primeira linha de dados (assumindo que é a linha de valores)
+        if len(df) > 0:
+            for col in df.columns:
+                param = col.strip()
+                value = str(df.iloc[0][col]).strip() if not pd.isna(df.iloc[0][col]) else None
+
+                if param and value is not None:
                     # Converte valores booleanos e numéricos
                     if value.lower() in ["true", "yes", "1"]:
                         value = True
@@ -66,47 +89,46 @@ def main():
                     elif "," in value and not value.startswith("["):
                         # Converte strings separadas por vírgula em listas
                         value = [item.strip() for item in value.split(",")]
-                    
-                    config[param] = value
-        else:
-            # Formato: uma coluna por parâmetro, uma linha de valores
-            config = {}
-            # Pega a primeira linha de dados (assumindo que é a linha de valores)
-            if len(df) > 0:
-                for col in df.columns:
-                    param = col.strip()
-                    value = str(df.iloc[0][col]).strip() if not pd.isna(df.iloc[0][col]) else None
-                    
-                    if param and value is not None:
-                        # Converte valores booleanos e numéricos
-                        if value.lower() in ["true", "yes", "1"]:
-                            value = True
-                        elif value.lower() in ["false", "no", "0"]:
-                            value = False
-                        elif value.isdigit():
-                            value = int(value)
-                        elif value.lower() == "none":
-                            value = None
-                        elif "," in value and not value.startswith("["):
-                            # Converte strings separadas por vírgula em listas
-                            value = [item.strip() for item in value.split(",")]
-                        
-                        # Converte snake_case para camelCase para os parâmetros
-                        parts = param.split('_')
-                        camel_param = parts[0] + ''.join(word.capitalize() for word in parts[1:])
-                        
-                        config[camel_param] = value
-        
+
+                    # Converte snake_case para camelCase para os parâmetros
+                    parts = param.split('_')
+                    camel_param = parts[0] + ''.join(word.capitalize() for word in parts[1:])
+
+                    config[camel_param] = value
+
+    return config
+
+def populate(model, excel_file_path, aba_app="APP"):
+    """
+    Guarda no modelo os parâmetros do bloco application (ver read_app_config).
+    """
+    model.application = read_app_config(excel_file_path, aba_app)
+    return model
+
+def main(base_dir=None):
+    if base_dir is None:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+    excel_file_path = workbook_path(base_dir)
+    aba_app = "APP"
+    output_file = os.path.join(base_dir, "APP.jdl")
+    
+    if not os.path.exists(excel_file_path):
+        instrumentation.stage_failed(f"Arquivo de planilha '{excel_file_path}' não encontrado.")
+        return
+    
+    try:
+        config = read_app_config(excel_file_path, aba_app)
+
         # Gera o JDL com os parâmetros da planilha
         jdl_content = generate_app_jdl(**config)
         
     except Exception as e:
-        print(f"[ERRO] Falha ao processar configurações da aplicação: {str(e)}")
+        instrumentation.stage_failed(f"Falha ao processar configurações da aplicação: {str(e)}")
         return
     
     # Escreve no arquivo
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(jdl_content)
+    write_if_changed(output_file, jdl_content)
+    instrumentation.bytes_written(output_file)
         
     print(f"Arquivo 'APP.jdl' gerado/atualizado!")
 
@@ -1,6 +1,9 @@
 import os
-import re
 import pandas as pd
+import instrumentation
+from outputs import write_if_changed
+from workbook import read_sheet, iter_sheet_rows, iter_frame_rows, is_streaming, workbook_path
+from jdl_model import JdlModel, Field, Validation, render_entities
 
 def snake_to_camel_case(s: str) -> str:
     """
@@ -14,179 +17,262 @@ def snake_to_camel_case(s: str) -> str:
         return s
     return parts[0] + ''.join(word.capitalize() for word in parts[1:])
 
-def main():
+TRUTHY_VALUES = ["yes", "true", "1", "sim"]
+
+# Abaixo deste número de linhas, o custo fixo das operações vetorizadas de
+# build_fields (~50 ms, independente do tamanho) não compensa e cada linha
+# é montada por build_field. Importa no modo --watch, em que a aba é
+# reprocessada a cada salvamento.
+VECTORIZE_MIN_ROWS = 2000
+
+def clean_nan(val: str) -> str:
+    if not isinstance(val, str):
+        return ""
+    val = val.strip()
+    return "" if val.lower() == "nan" else val
+
+def build_field(row):
     """
-    Este script lê o arquivo ENTIDADES.jdl (já existente, contendo apenas as definições de entidades)
-    e a planilha 'TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx' (aba 'CAMPOS'), inserindo os campos no formato
-    JDL, removendo 'nan' quando necessário, e gerando pattern(/regex/) SEM aspas.
+    Monta o Field (tipo, validações e Javadoc) de uma linha da aba CAMPOS.
+    'row' pode ser uma linha do DataFrame ou um dict vindo de iter_sheet_rows().
+    Retorna (entidade, Field) ou None se a linha deve ser ignorada.
     """
+    entity       = clean_nan(row.get("Entity", ""))
+    field_name   = clean_nan(row.get("Field Name", ""))
+    field_type   = clean_nan(row.get("Field Type", ""))
+    required_raw = clean_nan(row.get("Required", "")).lower()
+    required     = required_raw in TRUTHY_VALUES
 
-    base_dir = os.path.dirname(os.path.abspath(__file__))
+    # Se não houver nome de entidade ou campo, pula
+    if not entity or not field_name:
+        return None
 
-    # 1) Arquivo de entrada JDL (apenas entidades)
-    jdl_file_name = "ENTIDADES.jdl"
-    jdl_file_path = os.path.join(base_dir, jdl_file_name)
-    if not os.path.exists(jdl_file_path):
-        print(f"[ERRO] Arquivo '{jdl_file_path}' não foi encontrado. Execute primeiro o script que gera ENTIDADES.jdl.")
-        return
+    field_annotation   = clean_nan(row.get("Field Annotation(s)", ""))
+    comment_str        = clean_nan(row.get("Field Javadoc/Comment", ""))
+    observacao_exemplo = clean_nan(row.get("Observações/Exemplo", ""))
 
-    # 2) Nome do arquivo da planilha e aba
-    excel_file_name = "TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx"
-    excel_file_path = os.path.join(base_dir, excel_file_name)
-    aba_campos = "CAMPOS"
-    if not os.path.exists(excel_file_path):
-        print(f"[ERRO] Arquivo de planilha '{excel_file_path}' não encontrado.")
-        return
+    minlength  = clean_nan(row.get("Minlength", ""))
+    maxlength  = clean_nan(row.get("Maxlength", ""))
+    pattern    = clean_nan(row.get("Pattern", ""))       # e.g. ^[A-Z][a-z]+$, sem slashes
+    unique_raw = clean_nan(row.get("Unique", "")).lower()
+    minval     = clean_nan(row.get("Min", ""))
+    maxval     = clean_nan(row.get("Max", ""))
+    minbytes   = clean_nan(row.get("Minbytes", ""))
+    maxbytes   = clean_nan(row.get("Maxbytes", ""))
 
-    # Lê o conteúdo original do ENTIDADES.jdl
-    with open(jdl_file_path, "r", encoding="utf-8") as f:
-        original_jdl = f.read()
+    unique_val = unique_raw in TRUTHY_VALUES
 
-    try:
-        # Lê a planilha com os campos, converte tudo para string, substitui NaN por ""
-        df = pd.read_excel(excel_file_path, sheet_name=aba_campos, dtype=str)
-        df = df.fillna("")
-    except Exception as e:
-        print(f"[ERRO] Falha ao ler a planilha: {str(e)}")
-        return
+    # Monta as validações de acordo com a sintaxe do JDL
+    validations = []
+    if required:
+        validations.append(Validation("required"))
+    if minlength and minlength.isdigit():
+        validations.append(Validation("minlength", minlength))
+    if maxlength and maxlength.isdigit():
+        validations.append(Validation("maxlength", maxlength))
+    # pattern deve ficar assim: pattern(/^[A-Z][a-z]+\d$/)
+    if pattern:
+        # Garantimos que, se o usuário não incluiu as barras, nós as adicionamos
+        regex_clean = pattern.strip()
+        if regex_clean:
+            # Adicionamos manualmente / e / se não estiverem presentes,
+            # mas se o usuário já incluiu, não duplicamos
+            if not regex_clean.startswith("/"):
+                regex_clean = "/" + regex_clean
+            if not regex_clean.endswith("/"):
+                regex_clean += "/"
+            validations.append(Validation("pattern", regex_clean))
+    if minval and minval.replace('.', '', 1).replace('-', '', 1).isdigit():
+        validations.append(Validation("min", minval))
+    if maxval and maxval.replace('.', '', 1).replace('-', '', 1).isdigit():
+        validations.append(Validation("max", maxval))
+    if minbytes and minbytes.isdigit():
+        validations.append(Validation("minbytes", minbytes))
+    if maxbytes and maxbytes.isdigit():
+        validations.append(Validation("maxbytes", maxbytes))
+    if unique_val:
+        validations.append(Validation("unique"))
+
+    field = Field(
+        field_name,
+        field_type,
+        validations,
+        annotation=field_annotation,
+        comment=comment_str,
+        example=observacao_exemplo,
+    )
+    return entity, field
+
+def _clean_column(df, name):
+    """
+    Versão vetorizada de clean_nan para uma coluna inteira: strip e 'nan' -> "".
+    Colunas ausentes viram uma coluna de strings vazias.
+    """
+    if name not in df.columns:
+        return pd.Series("", index=df.index, dtype=object)
+    col = df[name].fillna("").astype(str).str.strip()
+    return col.mask(col.str.lower() == "nan", "")
+
+def _is_number(col):
+    # Mesmo critério de build_field: aceita um '.' e um '-' (ex.: -1.5)
+    return col.str.replace(".", "", n=1, regex=False).str.replace("-", "", n=1, regex=False).str.isdigit()
+
+def build_fields(df):
+    """
+    Equivalente vetorizado de build_field() para a aba inteira: normaliza cada
+    coluna uma única vez, calcula as máscaras (Required, Unique, valores
+    numéricos, pattern) coluna a coluna e só então monta os Field.
+    Gera tuplas (entidade, Field) na ordem da planilha.
+    """
+    entity     = _clean_column(df, "Entity")
+    field_name = _clean_column(df, "Field Name")
+    keep = (entity != "") & (field_name != "")
+    if not keep.all():
+        df = df[keep]
+        entity = entity[keep]
+        field_name = field_name[keep]
+
+    field_type = _clean_column(df, "Field Type")
+    annotation = _clean_column(df, "Field Annotation(s)")
+    comment    = _clean_column(df, "Field Javadoc/Comment")
+    example    = _clean_column(df, "Observações/Exemplo")
+
+    required = _clean_column(df, "Required").str.lower().isin(TRUTHY_VALUES)
+    unique   = _clean_column(df, "Unique").str.lower().isin(TRUTHY_VALUES)
 
-    def clean_nan(val: str) -> str:
-        if not isinstance(val, str):
-            return ""
-        val = val.strip()
-        return "" if val.lower() == "nan" else val
+    # Cada validação com argumento vira uma coluna com o valor ou None
+    def valued(column, check):
+        col = _clean_column(df, column)
+        return col.astype(object).where(check(col), None)
 
-    campos_by_entity = {}
+    digits = lambda col: col.str.isdigit()
+    minlength = valued("Minlength", digits)
+    maxlength = valued("Maxlength", digits)
+    minval    = valued("Min", _is_number)
+    maxval    = valued("Max", _is_number)
+    minbytes  = valued("Minbytes", digits)
+    maxbytes  = valued("Maxbytes", digits)
 
-    for _, row in df.iterrows():
+    # pattern(/regex/): adiciona as barras apenas se ainda não estiverem presentes
+    raw_pattern = _clean_column(df, "Pattern")
+    pattern = raw_pattern.where(raw_pattern.str.startswith("/"), "/" + raw_pattern)
+    pattern = pattern.where(pattern.str.endswith("/"), pattern + "/")
+    pattern = pattern.astype(object).where(raw_pattern != "", None)
+
+    # Converte as colunas já prontas em listas Python uma única vez
+    columns = zip(*(col.tolist() for col in (
+        entity, field_name, field_type, required, minlength, maxlength, pattern,
+        minval, maxval, minbytes, maxbytes, unique, annotation, comment, example,
+    )))
+    for (ent, name, ftype, req, minl, maxl, patt,
+         mn, mx, minb, maxb, uniq, annot, comm, exam) in columns:
+        validations = []
+        if req:
+            validations.append(Validation("required"))
+        if minl is not None:
+            validations.append(Validation("minlength", minl))
+        if maxl is not None:
+            validations.append(Validation("maxlength", maxl))
+        if patt is not None:
+            validations.append(Validation("pattern", patt))
+        if mn is not None:
+            validations.append(Validation("min", mn))
+        if mx is not None:
+            validations.append(Validation("max", mx))
+        if minb is not None:
+            validations.append(Validation("minbytes", minb))
+        if maxb is not None:
+            validations.append(Validation("maxbytes", maxb))
+        if uniq:
+            validations.append(Validation("unique"))
+        yield ent, Field(name, ftype, validations, annotation=annot, comment=comm, example=exam)
+
+def populate(model, excel_file_path, aba_campos="CAMPOS"):
+    """
+    Adiciona ao modelo os campos da aba CAMPOS. Campos de entidades que não
+    existem no modelo são ignorados.
+    """
+    # Uma pasta de arquivos por aba (ver sources) é sempre lida registro a
+    # registro: a aba CAMPOS, a maior, nunca vira DataFrame
+    if not (is_streaming(aba_campos) or os.path.isdir(excel_file_path)):
+        # Lê a planilha com os campos e monta todos os Field (de forma
+        # vetorizada, se a aba for grande)
+        df = read_sheet(excel_file_path, aba_campos)
+        if len(df) >= VECTORIZE_MIN_ROWS:
+            items = build_fields(df)
+        else:
+            items = filter(None, map(build_field, iter_frame_rows(df)))
+        added = 0
+        for entity, field in items:
+            if model.add_field(entity, field):
+                added += 1
+        # Sem entidade/nome de campo ou com entidade inexistente no modelo
+        instrumentation.rows_read(aba_campos, len(df))
+        instrumentation.rows_skipped(aba_campos, len(df) - added)
+        return model
+
+    # Modo streaming: as linhas vêm direto da fonte, sem materializar o
+    # DataFrame da aba; cada Field continua indo para o modelo, como acima
+    rows = iter_sheet_rows(excel_file_path, aba_campos)
+    read = skipped = 0
+    for row in rows:
+        read += 1
         try:
-            entity       = clean_nan(row.get("Entity", ""))
-            field_name   = clean_nan(row.get("Field Name", ""))
-            field_type   = clean_nan(row.get("Field Type", ""))
-            required_raw = clean_nan(row.get("Required", "")).lower()
-            required     = required_raw in ["yes", "true", "1", "sim"]
-
-            # Se não houver nome de entidade ou campo, pula
-            if not entity or not field_name:
+            item = build_field(row)
+            if item is None:
+                skipped += 1
                 continue
-
-            field_annotation   = clean_nan(row.get("Field Annotation(s)", ""))
-            comment_str        = clean_nan(row.get("Field Javadoc/Comment", ""))
-            observacao_exemplo = clean_nan(row.get("Observações/Exemplo", ""))
-
-            minlength  = clean_nan(row.get("Minlength", ""))
-            maxlength  = clean_nan(row.get("Maxlength", ""))
-            pattern    = clean_nan(row.get("Pattern", ""))       # e.g. ^[A-Z][a-z]+$, sem slashes
-            unique_raw = clean_nan(row.get("Unique", "")).lower()
-            minval     = clean_nan(row.get("Min", ""))
-            maxval     = clean_nan(row.get("Max", ""))
-            minbytes   = clean_nan(row.get("Minbytes", ""))
-            maxbytes   = clean_nan(row.get("Maxbytes", ""))
-
-            unique_val = unique_raw in ["yes", "true", "1", "sim"]
-
-            # Monta as validações de acordo com a sintaxe do JDL
-            validations = []
-            if required:
-                validations.append("required")
-            if minlength and minlength.isdigit():
-                validations.append(f"minlength({minlength})")
-            if maxlength and maxlength.isdigit():
-                validations.append(f"maxlength({maxlength})")
-            # pattern deve ficar assim: pattern(/^[A-Z][a-z]+\d$/)
-            if pattern:
-                # Garantimos que, se o usuário não incluiu as barras, nós as adicionamos
-                regex_clean = pattern.strip()
-                if regex_clean:
-                    # Adicionamos manualmente / e / se não estiverem presentes,
-                    # mas se o usuário já incluiu, não duplicamos
-                    if not regex_clean.startswith("/"):
-                        regex_clean = "/" + regex_clean
-                    if not regex_clean.endswith("/"):
-                        regex_clean += "/"
-                    validations.append(f"pattern({regex_clean})")
-            if minval and minval.replace('.', '', 1).replace('-', '', 1).isdigit():
-                validations.append(f"min({minval})")
-            if maxval and maxval.replace('.', '', 1).replace('-', '', 1).isdigit():
-                validations.append(f"max({maxval})")
-            if minbytes and minbytes.isdigit():
-                validations.append(f"minbytes({minbytes})")
-            if maxbytes and maxbytes.isdigit():
-                validations.append(f"maxbytes({maxbytes})")
-            if unique_val:
-                validations.append("unique")
-
-            # Ex.: "name String required minlength(2) maxlength(40)"
-            field_line = f"{field_name} {field_type}"
-            if validations:
-                field_line += " " + " ".join(validations)
-
-            # Inclui comentários Javadoc antes do campo, se houver
-            comment_lines = []
-            if field_annotation:
-                comment_lines.append(f"Annotations: {field_annotation}")
-            if comment_str:
-                comment_lines.append(f"Comment: {comment_str}")
-            if observacao_exemplo:
-                comment_lines.append(f"Example: {observacao_exemplo}")
-
-            if comment_lines:
-                doc_comment = "  /**\n"
-                for c_line in comment_lines:
-                    # Corrigindo o problema com backslash em f-strings
-                    escaped_line = c_line.replace('"', '\\"')
-                    doc_comment += "   * " + escaped_line + "\n"
-                doc_comment += "   */\n"
-                final_line = doc_comment + f"  {field_line}"
-            else:
-                final_line = f"  {field_line}"
-
-            campos_by_entity.setdefault(entity, []).append(final_line)
+            entity, field = item
+            if not model.add_field(entity, field):
+                skipped += 1
         except Exception as e:
             print(f"[AVISO] Erro ao processar linha: {str(e)}")
+            skipped += 1
             continue
+    instrumentation.rows_read(aba_campos, read)
+    instrumentation.rows_skipped(aba_campos, skipped)
+    return model
 
-    # Regex para capturar cada entidade e substituir bloco interno
-    pattern_entity = re.compile(
-        r'(entity\s+(\w+)\s*\(([^)]*)\)\s*\{)([^}]*)(\})',
-        re.IGNORECASE | re.DOTALL
-    )
+def main(model=None, base_dir=None):
+    """
+    Este script insere, nas entidades do modelo, os campos lidos da planilha
+    'TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx' (aba 'CAMPOS') no formato JDL,
+    removendo 'nan' quando necessário, e gerando pattern(/regex/) SEM aspas.
+    Em seguida, regrava ENTIDADES.jdl a partir do modelo.
 
-    def replacer(match):
-        try:
-            entity_decl   = match.group(1)
-            entity_name   = match.group(2)
-            entity_alias  = match.group(3)
-            middle        = match.group(4)
-            closing_brace = match.group(5)
-
-            # Verifica se entity_alias é None ou vazio
-            if not entity_alias:
-                entity_alias = entity_name.lower()
-                
-            alias_camel = snake_to_camel_case(entity_alias)
-            entity_first_line = f"entity {entity_name} ({alias_camel})" + "{"
-
-            fields_list = campos_by_entity.get(entity_name, [])
-            if not fields_list:
-                # Se não há campos, apenas corrige alias
-                return f"{entity_first_line}{middle}{closing_brace}"
-
-            fields_str = "\n".join(fields_list)
-            return f"{entity_first_line}\n{fields_str}\n{closing_brace}"
-        except Exception as e:
-            print(f"[AVISO] Erro ao substituir entidade: {str(e)}")
-            # Em caso de erro, retorna o match original sem alterações
-            return match.group(0)
+    Executado isoladamente (sem 'model'), as entidades são lidas novamente
+    da aba ENTIDADES.
+    """
+
+    if base_dir is None:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
 
-    new_jdl = pattern_entity.sub(replacer, original_jdl)
+    # 1) Arquivo JDL de saída (entidades + campos)
+    jdl_file_name = "ENTIDADES.jdl"
+    jdl_file_path = os.path.join(base_dir, jdl_file_name)
+
+    # 2) Nome do arquivo da planilha e aba
+    excel_file_path = workbook_path(base_dir)
+    aba_campos = "CAMPOS"
+    if not os.path.exists(excel_file_path):
+        instrumentation.stage_failed(f"Arquivo de planilha '{excel_file_path}' não encontrado.")
+        return
+
+    try:
+        if model is None:
+            import ENTIDADES
+            model = ENTIDADES.populate(JdlModel(), excel_file_path)
+        populate(model, excel_file_path, aba_campos)
+    except Exception as e:
+        instrumentation.stage_failed(f"Falha ao ler a planilha: {str(e)}")
+        return
 
     try:
-        with open(jdl_file_path, "w", encoding="utf-8") as f:
-            f.write(new_jdl)
+        write_if_changed(jdl_file_path, render_entities(model))
+        instrumentation.bytes_written(jdl_file_path)
         print(f"[INFO] Script concluído. Arquivo '{jdl_file_name}' atualizado removendo 'nan' e configurando pattern(/regex/) sem aspas.")
     except Exception as e:
-        print(f"[ERRO] Falha ao escrever no arquivo: {str(e)}")
+        instrumentation.stage_failed(f"Falha ao escrever no arquivo: {str(e)}")
 
 if __name__ == "__main__":
     try:
@@ -1,5 +1,8 @@
 import os
-import pandas as pd
+from workbook import read_sheet, normalize_headers, column_values, workbook_path
+import instrumentation
+from outputs import write_if_changed
+from jdl_model import JdlModel, render_entities
 
 def snake_to_camel_case(s: str) -> str:
     """
@@ -11,61 +14,71 @@ def snake_to_camel_case(s: str) -> str:
         return s
     return parts[0] + ''.join(word.capitalize() for word in parts[1:])
 
-def main():
+# Nomes alternativos das colunas (ex.: cabeçalhos da planilha modelo)
+HEADER_ALIASES = {
+    "Entity": ["Entidade"],
+    "Alias":  ["tableName"],
+}
+
+def populate(model, excel_file_path, aba_entidades="ENTIDADES"):
     """
-    Este script (re)cria o arquivo ENTIDADES.jdl, contendo apenas as
-    definições iniciais das entidades (sem campos). As entidades, com
-    seus respectivos aliases, são lidas de uma planilha Excel, que deve
-    conter ao menos duas colunas:
+    Preenche o modelo com as entidades (ainda sem campos) lidas da aba ENTIDADES.
+    A aba deve conter ao menos duas colunas:
       - Entity (nome da Entidade, ex.: 'Profile')
       - Alias (nome do alias, ex.: 'profile_custom')
-    
-    Em seguida, o arquivo ENTIDADES.jdl pode ser complementado pelo
-    script CAMPOS.py, que insere os campos, validações e comentários.
+    """
+    # Lê a planilha com o nome das entidades (células vazias viram "")
+    df = read_sheet(excel_file_path, aba_entidades)
+    df = normalize_headers(df, HEADER_ALIASES).fillna("")
+    instrumentation.rows_read(aba_entidades, len(df))
+
+    skipped = 0
+    for entity, alias in zip(column_values(df, "Entity"), column_values(df, "Alias")):
+        if not entity:
+            skipped += 1
+            continue
+        # Se não foi definido um alias, podemos usar algo padronizado
+        if not alias:
+            alias = entity.lower()
+        model.add_entity(entity, snake_to_camel_case(alias))
+    instrumentation.rows_skipped(aba_entidades, skipped)
+    return model
+
+def main(model=None, base_dir=None):
+    """
+    Este script (re)cria o arquivo ENTIDADES.jdl, contendo apenas as
+    definições iniciais das entidades (sem campos). As entidades, com
+    seus respectivos aliases, são lidas da aba ENTIDADES da planilha.
+
+    Quando executado pelo pipeline, 'model' é o JdlModel compartilhado,
+    que em seguida é complementado por CAMPOS.py (campos, validações e
+    comentários) e ENUMS.py.
     """
 
-    base_dir = os.path.dirname(os.path.abspath(__file__))
+    if base_dir is None:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
 
     # Nome do arquivo JDL que iremos (re)criar
     jdl_file_name = "ENTIDADES.jdl"
     jdl_file_path = os.path.join(base_dir, jdl_file_name)
 
     # Nome do arquivo da planilha e aba
-    excel_file_name = "TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx"
-    excel_file_path = os.path.join(base_dir, excel_file_name)
+    excel_file_path = workbook_path(base_dir)
     aba_entidades   = "ENTIDADES"  # Ajuste conforme o nome real da aba
 
     # Se o arquivo Excel não existir, encerramos
     if not os.path.exists(excel_file_path):
-        print(f"[ERRO] Arquivo de planilha '{excel_file_path}' não encontrado.")
+        instrumentation.stage_failed(f"Arquivo de planilha '{excel_file_path}' não encontrado.")
         return
 
-    # Lê a planilha com o nome das entidades
-    df = pd.read_excel(excel_file_path, sheet_name=aba_entidades)
-
-    # Prepara uma lista de (entity_name, alias_camel) a partir da planilha
-    entidades_info = []
-    for _, row in df.iterrows():
-        entity = str(row.get("Entity", "")).strip()
-        alias  = str(row.get("Alias", "")).strip()
-        if not entity:
-            continue
-        # Se não foi definido um alias, podemos usar algo padronizado
-        if not alias:
-            alias = entity.lower()
-        alias_camel = snake_to_camel_case(alias)
-        entidades_info.append((entity, alias_camel))
-
-    # Cria (ou recria) o arquivo ENTIDADES.jdl
-    with open(jdl_file_path, "w", encoding="utf-8") as f:
-        f.write("// ENTIDADES.jdl\n")
-        f.write("// Gerado automaticamente. Este arquivo contém apenas as entidades básicas.\n")
-        f.write("// Os campos e validações serão posteriormente adicionados via CAMPOS.py.\n\n")
+    if model is None:
+        model = JdlModel()
+    populate(model, excel_file_path, aba_entidades)
 
-        # Escreve cada entity com seu alias
-        for (entidade, alias_camel) in entidades_info:
-            f.write(f"entity {entidade} ({alias_camel}) {{\n")
-            f.write("}\n\n")
+    # Cria (ou recria) o arquivo ENTIDADES.jdl a partir do modelo; se o conteúdo
+    # não mudou, o arquivo existente (e o seu mtime) é mantido
+    write_if_changed(jdl_file_path, render_entities(model))
+    instrumentation.bytes_written(jdl_file_path)
 
     print(f"[INFO] Arquivo '{jdl_file_name}' foi recriado com as definições iniciais das entidades.")
     print("[INFO] Agora, execute o script CAMPOS.py para inserir os campos dentro de cada entidade.")
@@ -1,5 +1,8 @@
 import re
 import os
+import mmap
+import instrumentation
+from outputs import atomic_output
 
 def snake_to_camel_case(s: str) -> str:
     """
@@ -12,62 +15,160 @@ def snake_to_camel_case(s: str) -> str:
     return parts[0] + ''.join(word.capitalize() for word in parts[1:])
 
 
-def fix_jdl_content(content: str) -> str:
+# Single tokenizer for all fixes. Alternatives are tried in this order at each
+# position, so comments, string literals, pattern(/regex/) bodies and enum
+# headers are consumed before anything inside them could be mistaken for a
+# 'nan'. The leading lookahead lets the scanner skip, in C, every position
+# that cannot start a token.
+_TOKEN_SOURCE = r"""
+  (?= [/"] | \b[pmen] )
+  (?:
+    (?P<comment> /\*.*?\*/ | //[^\n]* )
+  | (?P<pattern> \bpattern\(\s* (?P<quote>['"]?) / (?P<regex>[^\n]*?) / (?P=quote) \s*\) )
+  | (?P<string> "(?:\\.|[^"\\\n])*" )
+  | (?P<empty> \b(?:min|max|minbytes|maxbytes|minlength|maxlength|pattern)\(\s*(?:nan|n)?\s*\) )
+  | (?P<entity> \bentity\s+ (?P<name>\w+) \s*\( (?P<alias>\w+) \) )
+  | (?P<enum> \benum\s+\w+\s*\{ )
+  | (?P<nan> \bnan\b )
+  )
+"""
+# Inside an enum body only comments and strings matter: they are skipped
+# whole, so the first '}' outside them closes the enum. Each alternative
+# starts with a different character, so the scan never backtracks.
+_ENUM_BODY_SOURCE = r"""
+    /\*.*?\*/ | //[^\n]* | "(?:\\.|[^"\\\n])*" | (?P<close> \} )
+"""
+_FLAGS = re.IGNORECASE | re.DOTALL | re.VERBOSE
+_TOKENS_STR = re.compile(_TOKEN_SOURCE, _FLAGS)
+_TOKENS_BYTES = re.compile(_TOKEN_SOURCE.encode("ascii"), _FLAGS)
+_ENUM_BODY_STR = re.compile(_ENUM_BODY_SOURCE, _FLAGS)
+_ENUM_BODY_BYTES = re.compile(_ENUM_BODY_SOURCE.encode("ascii"), _FLAGS)
+# In a bytes pattern \w and \b only know ASCII letters, so the bytes scan
+# is only used for documents without any non-ASCII byte
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+
+def _enum_end(buf, pos, enum_body):
     """
-    Fixes only:
-      - 'nan' or empty values in validations (min(nan), pattern('/nan/'), etc.)
-      - alias name from snake_case to camelCase in "entity X (alias) { ... }"
-    It does NOT remove line breaks, braces, or parentheses.
+    Position just after the '}' that closes the enum whose body starts at
+    'pos'. An enum that is never closed runs to the end of the document.
     """
+    for match in enum_body.finditer(buf, pos):
+        if match.lastgroup == "close":
+            return match.end()
+    return len(buf)
 
-    # 1. Remove isolated "nan" (case-insensitive)
-    content = re.sub(r'\bnan\b', '', content, flags=re.IGNORECASE)
-
-    # 2. Remove pattern('/nan/')
-    content = re.sub(r"pattern\('/nan/'\)", '', content, flags=re.IGNORECASE)
-
-    # 3. Remove min(nan), max(nan), minbytes(nan), maxbytes(nan) if present
-    content = re.sub(r'(min|max|minbytes|maxbytes)\(\s*n(an)?\s*\)', '', content, flags=re.IGNORECASE)
 
-    # 4. Remove leftover empty parentheses from validations (e.g. min(), max())
-    #    leaving parentheses that are necessary for other parts of the JDL untouched.
-    content = re.sub(r'\b(min|max|minbytes|maxbytes|pattern)\(\s*\)', '', content, flags=re.IGNORECASE)
-
-    # 5. Convert entity alias snake_case -> camelCase
-    #    Matches lines like "entity SomeEntity (some_alias){"
-    pattern_alias = re.compile(r'(entity\s+\w+\s*\()([A-Za-z0-9_]+)(\)\s*\{?)', re.IGNORECASE)
-    def alias_replacer(match):
-        prefix = match.group(1)        # e.g. "entity Profile("
-        alias_snake = match.group(2)  # e.g. "profile_custom"
-        suffix = match.group(3)       # e.g. "){"
-        alias_camel = snake_to_camel_case(alias_snake)
-        return f"{prefix}{alias_camel}{suffix}"
+def _iter_fixed_chunks(buf):
+    """
+    Walks 'buf' (str, bytes or an mmap) once and yields the fixed output in
+    chunks of the same type as the input (str for str, bytes otherwise).
+    Text between tokens is yielded untouched. Bytes input must be ASCII
+    (see fix_jdl_file); 'ação_x' or 'ãnan' would not be seen as words.
+    """
+    is_text = isinstance(buf, str)
+    tokens = _TOKENS_STR if is_text else _TOKENS_BYTES
+    enum_body = _ENUM_BODY_STR if is_text else _ENUM_BODY_BYTES
+    pos = 0
+
+    while True:
+        match = tokens.search(buf, pos)
+        if match is None:
+            break
+        kind = match.lastgroup
+        start, end = match.span()
+        if start > pos:
+            yield buf[pos:start]
+        pos = end
+
+        if kind == "enum":
+            # The whole enum block, including 'nan' keys and values, is kept
+            pos = _enum_end(buf, end, enum_body)
+            yield buf[start:pos]
+        elif kind == "pattern":
+            regex = match.group("regex")
+            regex = regex if is_text else regex.decode("utf-8", "replace")
+            # pattern('/nan/'), pattern(//): no real regex, drop the validation
+            if regex.strip().lower() in ("", "nan"):
+                continue
+            yield match.group(0)
+        elif kind == "empty":
+            # min(nan), max(), minbytes(n), ...: leftover empty validation
+            continue
+        elif kind == "entity":
+            alias = match.group("alias")
+            alias = alias if is_text else alias.decode("ascii")
+            if alias.lower() == "nan":
+                # Empty alias in the workbook: keep only "entity Name"
+                yield buf[start:match.end("name")]
+                continue
+            camel = snake_to_camel_case(alias)
+            yield buf[start:match.start("alias")]
+            yield camel if is_text else camel.encode("ascii")
+            yield buf[match.end("alias"):end]
+        elif kind == "nan":
+            # Bare 'nan' outside comments, strings and enums is an empty cell
+            continue
+        else:
+            # Comments and strings are kept as-is
+            yield match.group(0)
+
+    if pos < len(buf):
+        yield buf[pos:]
 
-    content = pattern_alias.sub(alias_replacer, content)
 
-    # Return the updated content without altering line breaks, braces, or parentheses
-    return content
+def fix_jdl_content(content: str) -> str:
+    """
+    Fixes only:
+      - 'nan' or empty values in validations: the whole validation is
+        removed (min(nan), maxlength(), pattern('/nan/'), pattern(//), etc.)
+      - alias name from snake_case to camelCase in "entity X (alias) { ... }";
+        a 'nan' alias is dropped ("entity X (nan){" -> "entity X{")
+    All fixes are applied in a single linear scan that understands comments,
+    string literals, pattern(/regex/) calls, entity headers and enum bodies,
+    so 'nan' inside Javadoc, strings or enum keys is kept, and only a whole
+    word 'nan' is removed (an entity named 'Nan' is kept).
+    It does NOT remove line breaks, braces, or parentheses.
+    """
+    return "".join(_iter_fixed_chunks(content))
 
 
-def main():
-    base_dir = os.path.dirname(os.path.abspath(__file__))
+def fix_jdl_file(input_file, output_file):
+    """
+    Same fixes as fix_jdl_content, but reading 'input_file' through a memory
+    map and writing the chunks straight to 'output_file', so no full-size
+    copy of an ASCII document is kept in memory. A document with non-ASCII
+    text (accented identifiers, Javadoc in Portuguese) is decoded and fixed
+    as str, exactly like fix_jdl_content. 'output_file' is only replaced
+    (atomically) when the fixed content differs from what it already holds.
+    """
+    with open(input_file, "rb") as src, atomic_output(output_file, "wb") as dst:
+        if os.fstat(src.fileno()).st_size == 0:
+            return
+        with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if _NON_ASCII.search(buf) is None:
+                for chunk in _iter_fixed_chunks(buf):
+                    dst.write(chunk)
+                return
+            text = str(buf, "utf-8", "surrogateescape")
+        dst.write(fix_jdl_content(text).encode("utf-8", "surrogateescape"))
+
+
+def main(base_dir=None):
+    if base_dir is None:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
     input_file = os.path.join(base_dir, "complete.jdl")
     output_file = os.path.join(base_dir, "complete_fixed.jdl")
 
     if not os.path.exists(input_file):
-        print(f"[ERRO] Arquivo '{input_file}' não encontrado.")
+        instrumentation.stage_failed(f"Arquivo '{input_file}' não encontrado.")
         return
 
-    with open(input_file, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    fixed_content = fix_jdl_content(content)
-
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(fixed_content)
+    fix_jdl_file(input_file, output_file)
+    instrumentation.bytes_written(output_file)
 
     print(f"[INFO] Arquivo corrigido gerado: {output_file}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
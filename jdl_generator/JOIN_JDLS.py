@@ -1,53 +1,163 @@
 import os
+import re
+import sys
+import mmap
+import instrumentation
+from outputs import atomic_output
 
-def main():
+EXCLUDED_FILES = ['complete.jdl', 'complete_fixed.jdl', 'changes.jdl']
+
+# Tokens relevantes para localizar blocos "application { ... }": comentários e
+# strings são consumidos inteiros para que chaves dentro deles sejam ignoradas.
+_BRACE_TOKENS = re.compile(
+    rb'(?P<comment>/\*.*?\*/|//[^\n]*)'
+    rb'|(?P<string>"(?:\\.|[^"\\\n])*")'
+    rb'|(?P<app>\bapplication\s*\{)'
+    rb'|(?P<open>\{)'
+    rb'|(?P<close>\})',
+    re.DOTALL
+)
+
+_NON_BLANK = re.compile(rb'\S')
+
+# Tamanho máximo de cada cópia no fallback sem os.sendfile
+_COPY_CHUNK = 1024 * 1024
+
+def list_jdl_files(base_dir):
     """
-    Este script concatena todos os arquivos *.jdl (exceto 'complete.jdl' e 'complete_fixed.jdl') 
-    em um único arquivo 'complete.jdl', garantindo que não haja duplicação de blocos de configuração.
+    Lista, na ordem de concatenação, os fragmentos *.jdl da pasta
+    (exceto os de EXCLUDED_FILES), com APP.jdl primeiro.
     """
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    excluded_files = ['complete.jdl', 'complete_fixed.jdl']
-    jdl_files = [f for f in os.listdir(base_dir) if f.endswith('.jdl') and f not in excluded_files]
-    
+    jdl_files = [f for f in os.listdir(base_dir) if f.endswith('.jdl') and f not in EXCLUDED_FILES]
+
     # Ordenar os arquivos para garantir que APP.jdl venha primeiro
     jdl_files.sort()
     if 'APP.jdl' in jdl_files:
         jdl_files.remove('APP.jdl')
         jdl_files.insert(0, 'APP.jdl')
-    
+    return jdl_files
+
+def find_application_blocks(buf):
+    """
+    Localiza os blocos 'application { ... }' de nível superior, contando a
+    profundidade das chaves (o bloco pode conter config { }, entities { }, etc.).
+    Retorna uma lista de (início, fim) em bytes; um bloco sem fechamento vai
+    até o fim do arquivo.
+    """
+    if buf.find(b'application') == -1:
+        return []
+
+    blocks = []
+    depth = 0
+    block_start = None
+    for match in _BRACE_TOKENS.finditer(buf):
+        kind = match.lastgroup
+        if kind == 'app' and depth == 0:
+            block_start = match.start()
+            depth = 1
+        elif kind in ('app', 'open'):
+            depth += 1
+        elif kind == 'close' and depth > 0:
+            depth -= 1
+            if depth == 0 and block_start is not None:
+                blocks.append((block_start, match.end()))
+                block_start = None
+    if block_start is not None:
+        blocks.append((block_start, len(buf)))
+    return blocks
+
+def _copy_range(src, dst, offset, count):
+    """
+    Copia 'count' bytes de 'src' (a partir de 'offset') para 'dst'. No Linux
+    usa os.sendfile, que copia dentro do kernel sem passar pelo Python.
+    """
+    if hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+        while count > 0:
+            sent = os.sendfile(dst.fileno(), src.fileno(), offset, count)
+            if sent == 0:
+                break
+            offset += sent
+            count -= sent
+        return
+
+    src.seek(offset)
+    while count > 0:
+        chunk = src.read(min(count, _COPY_CHUNK))
+        if not chunk:
+            break
+        dst.write(chunk)
+        count -= len(chunk)
+
+def _ranges_to_copy(buf, skip_blocks):
+    """
+    Trechos (início, fim) do fragmento que vão para o complete.jdl. Se
+    'skip_blocks' for informado, esses blocos e os espaços em branco logo
+    após cada um são deixados de fora.
+    """
+    ranges = []
+    pos = 0
+    for start, end in skip_blocks:
+        if start > pos:
+            ranges.append((pos, start))
+        pos = end
+        while pos < len(buf) and buf[pos:pos + 1].isspace():
+            pos += 1
+    if pos < len(buf):
+        ranges.append((pos, len(buf)))
+    return ranges
+
+def main(base_dir=None):
+    """
+    Este script concatena todos os arquivos *.jdl (exceto 'complete.jdl' e 'complete_fixed.jdl')
+    em um único arquivo 'complete.jdl', garantindo que não haja duplicação de blocos de configuração.
+
+    Os fragmentos são copiados direto de arquivo para arquivo (os.sendfile quando
+    disponível), sem serem lidos inteiros para a memória. O resultado é montado
+    em um arquivo temporário e só substitui 'complete.jdl' se o conteúdo mudou.
+    """
+    if base_dir is None:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+    jdl_files = list_jdl_files(base_dir)
+
     output_file = os.path.join(base_dir, 'complete.jdl')
-    
+
     # Rastrear se já incluímos um bloco de configuração de aplicação
     app_config_included = False
-    
-    with open(output_file, 'w', encoding='utf-8') as outfile:
+
+    with atomic_output(output_file, 'wb', buffering=0) as outfile:
         for jdl_file in jdl_files:
             file_path = os.path.join(base_dir, jdl_file)
-            with open(file_path, 'r', encoding='utf-8') as infile:
-                content = infile.read()
-                
-                # Verificar se este arquivo contém um bloco de configuração de aplicação
-                if 'application {' in content and app_config_included and jdl_file != 'APP.jdl':
-                    # Remover o bloco de configuração duplicado
-                    start_idx = content.find('application {')
-                    end_idx = content.find('}', content.find('}', start_idx) + 1) + 1
-                    if start_idx >= 0 and end_idx > start_idx:
-                        content = content[end_idx:].strip()
-                        if not content:
+            with open(file_path, 'rb') as infile:
+                if os.fstat(infile.fileno()).st_size == 0:
+                    continue
+                with mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                    # Pular arquivos que só têm espaços em branco
+                    if not _NON_BLANK.search(buf):
+                        continue
+
+                    blocks = find_application_blocks(buf)
+
+                    # Remover blocos de configuração duplicados (já incluímos o de APP.jdl)
+                    if blocks and app_config_included and jdl_file != 'APP.jdl':
+                        ranges = _ranges_to_copy(buf, blocks)
+                        if not any(_NON_BLANK.search(buf, s, e) for s, e in ranges):
                             continue  # Pular este arquivo se não sobrar nada após remover o bloco
-                
-                # Marcar que já incluímos um bloco de configuração
-                if 'application {' in content and jdl_file == 'APP.jdl':
-                    app_config_included = True
-                
-                # Se o conteúdo não terminar com newline, adiciona
-                if content and not content.endswith('\n'):
-                    content += '\n'
-                
-                # Escreve o conteúdo do arquivo atual
-                if content.strip():
-                    outfile.write(content)
-                    outfile.write('\n')  # Linha extra para separar arquivos
+                    else:
+                        ranges = [(0, len(buf))]
+
+                    # Marcar que já incluímos um bloco de configuração
+                    if blocks and jdl_file == 'APP.jdl':
+                        app_config_included = True
+
+                    for start, end in ranges:
+                        _copy_range(infile, outfile, start, end - start)
+
+                    # Se o conteúdo não terminar com newline, adiciona
+                    last_end = ranges[-1][1]
+                    if buf[last_end - 1:last_end] != b'\n':
+                        outfile.write(b'\n')
+                    outfile.write(b'\n')  # Linha extra para separar arquivos
+    instrumentation.bytes_written(output_file)
 
     print("Arquivo 'complete.jdl' concatenado com sucesso!")
 
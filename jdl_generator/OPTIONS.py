@@ -1,48 +1,67 @@
 import os
-import pandas as pd
+from workbook import read_sheet, normalize_headers, column_values, workbook_path
+import instrumentation
+from outputs import write_if_changed
+from jdl_model import JdlModel, Option, render_options
 
-def main():
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    excel_file_name = "TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx"
-    excel_file_path = os.path.join(base_dir, excel_file_name)
+# Nomes alternativos das colunas (ex.: cabeçalhos da planilha modelo)
+HEADER_ALIASES = {
+    "Option Type": ["Option Name", "Option"],
+}
+
+def populate(model, excel_file_path, aba_options="OPTIONS"):
+    """
+    Adiciona ao modelo as opções (dto, service, paginate, ...) da aba OPTIONS.
+    """
+    # Lê a planilha com as opções
+    df = read_sheet(excel_file_path, aba_options)
+    df = normalize_headers(df, HEADER_ALIASES).fillna("")
+    instrumentation.rows_read(aba_options, len(df))
+
+    rows = zip(
+        column_values(df, "Entity"),
+        column_values(df, "Option Type"),   # dto, service, paginate, etc.
+        column_values(df, "Option Value"),  # mapstruct, serviceClass, etc.
+    )
+    skipped = 0
+    for entity, option_type, option_value in rows:
+        if not entity or not option_type:
+            skipped += 1
+            continue
+
+        model.options.append(Option(option_type, entity, option_value))
+    instrumentation.rows_skipped(aba_options, skipped)
+    return model
+
+def main(model=None, base_dir=None):
+    if base_dir is None:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+    excel_file_path = workbook_path(base_dir)
     aba_options = "OPTIONS"
     output_file = os.path.join(base_dir, "OPTIONS.jdl")
     
     if not os.path.exists(excel_file_path):
-        print(f"[ERRO] Arquivo de planilha '{excel_file_path}' não encontrado.")
+        instrumentation.stage_failed(f"Arquivo de planilha '{excel_file_path}' não encontrado.")
         return
     
     try:
-        # Lê a planilha com as opções
-        df = pd.read_excel(excel_file_path, sheet_name=aba_options, dtype=str)
-        df = df.fillna("")
-        
-        # Gera o conteúdo JDL baseado nos dados da planilha
-        jdl_content = ""
-        for _, row in df.iterrows():
-            entity = row.get("Entity", "").strip()
-            option_type = row.get("Option Type", "").strip()  # dto, service, paginate, etc.
-            option_value = row.get("Option Value", "").strip()  # mapstruct, serviceClass, etc.
-            
-            if not entity or not option_type:
-                continue
-                
-            # Constrói a linha de opção
-            if option_value:
-                jdl_line = f"{option_type} {entity} with {option_value}\n"
-            else:
-                jdl_line = f"{option_type} {entity}\n"
-                
-            jdl_content += jdl_line
+        if model is None:
+            # Executado isoladamente: as entidades definem o alcance do '*'
+            import ENTIDADES
+            model = ENTIDADES.populate(JdlModel(), excel_file_path)
+        populate(model, excel_file_path, aba_options)
+
+        # Gera o conteúdo JDL a partir do modelo
+        jdl_content = render_options(model)
         
         # Escreve no arquivo
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(jdl_content)
+        write_if_changed(output_file, jdl_content)
+        instrumentation.bytes_written(output_file)
             
         print(f"Arquivo 'OPTIONS.jdl' gerado/atualizado!")
         
     except Exception as e:
-        print(f"[ERRO] Falha ao processar opções: {str(e)}")
+        instrumentation.stage_failed(f"Falha ao processar opções: {str(e)}")
 
 if __name__ == "__main__":
-    main()
+    main()
\ No newline at end of file
@@ -1,19 +1,64 @@
 import os
-import pandas as pd
+from workbook import read_sheet, normalize_headers, column_values, workbook_path
+import instrumentation
+from outputs import write_if_changed
+from jdl_model import JdlModel, Relationship, render_relationships
+
+RELATIONSHIP_TYPES = {
+    "onetomany": "OneToMany",
+    "manytoone": "ManyToOne",
+    "manytomany": "ManyToMany",
+    "onetoone": "OneToOne",
+}
+
+# Nomes alternativos das colunas (ex.: cabeçalhos da planilha modelo)
+HEADER_ALIASES = {
+    "Entity From":   ["From Entity"],
+    "Field From":    ["Injected Field (From)"],
+    "Entity To":     ["To Entity"],
+    "Field To":      ["Injected Field (To)"],
+    "Required From": ["Required (From)"],
+    "Required To":   ["Required (To)"],
+}
+
+# Células preenchidas só com um traço (ex.: "–" em "Injected Field (To)" na
+# planilha modelo) significam "sem valor"
+PLACEHOLDERS = {"-", "–", "—"}
+
+def clean_cell(value):
+    """
+    Valor da célula sem espaços nas pontas, com os marcadores de PLACEHOLDERS
+    tratados como célula vazia.
+    """
+    value = value.strip() if isinstance(value, str) else ""
+    return "" if value in PLACEHOLDERS else value
 
 def format_relationship_type(rel_type):
     """
     Converte uma string como 'one-to-many' para o formato esperado no JDL, ex.: 'OneToMany'
     """
+    key = rel_type.lower().replace("-", "").replace("_", "").replace(" ", "")
+    if key in RELATIONSHIP_TYPES:
+        return RELATIONSHIP_TYPES[key]
     return rel_type.title().replace("-", "")
 
 def is_required(val):
     """
-    Converte um valor textual em booleano para 'required' (ex.: "yes", "true", "1" → True)
+    Converte um valor textual em booleano para 'required' (ex.: "yes", "true", "1" → True).
+    Qualquer outro valor (vazio, "no", "optional") é False.
     """
     if not isinstance(val, str):
         return False
-    return val.strip().lower() in ["yes", "true", "1", "optional"] == False  # Se for "optional", retorna False
+    return val.strip().lower() in ["yes", "true", "1", "sim", "required"]
+
+def with_display_field(field, display_field):
+    """
+    Acrescenta o campo de exibição ao campo injetado, ex.: ('owner', 'name') ->
+    'owner(name)', a menos que ele já tenha um entre parênteses.
+    """
+    if not field or not display_field or "(" in field:
+        return field
+    return f"{field}({display_field})"
 
 def generate_relationships():
     """
@@ -43,52 +88,68 @@ relationship OneToOne {
 """
     return jdl_text
 
-def main():
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    excel_file_name = "TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx"
-    excel_file_path = os.path.join(base_dir, excel_file_name)
+def populate(model, excel_file_path, aba_relacionamentos="RELACIONAMENTOS"):
+    """
+    Adiciona ao modelo os relacionamentos da aba RELACIONAMENTOS.
+    """
+    # Lê a planilha com os relacionamentos
+    df = read_sheet(excel_file_path, aba_relacionamentos)
+    df = normalize_headers(df, HEADER_ALIASES).fillna("")
+    instrumentation.rows_read(aba_relacionamentos, len(df))
+
+    rows = zip(
+        *(column_values(df, name) for name in (
+            "Relationship Type", "Entity From", "Field From",
+            "Entity To", "Field To", "Display Field",
+            "Required From", "Required To", "Options",
+        ))
+    )
+    skipped = 0
+    for row in rows:
+        rel_type, entity_from, field_from, entity_to, field_to, display, req_from, req_to, options = map(clean_cell, row)
+        if not rel_type or not entity_from or not entity_to:
+            skipped += 1
+            continue
+
+        # Formata o tipo de relacionamento (one-to-many -> OneToMany)
+        model.relationships.append(Relationship(
+            format_relationship_type(rel_type),
+            entity_from, with_display_field(field_from, display),
+            entity_to, field_to,
+            required_from=is_required(req_from),
+            required_to=is_required(req_to),
+            built_in_entity="builtinentity" in options.lower().replace(" ", ""),
+        ))
+    instrumentation.rows_skipped(aba_relacionamentos, skipped)
+    return model
+
+def main(model=None, base_dir=None):
+    if base_dir is None:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+    excel_file_path = workbook_path(base_dir)
     aba_relacionamentos = "RELACIONAMENTOS"
     output_file = os.path.join(base_dir, "RELACIONAMENTOS.jdl")
     
     if not os.path.exists(excel_file_path):
-        print(f"[ERRO] Arquivo de planilha '{excel_file_path}' não encontrado.")
+        instrumentation.stage_failed(f"Arquivo de planilha '{excel_file_path}' não encontrado.")
         return
     
     try:
-        # Lê a planilha com os relacionamentos
-        df = pd.read_excel(excel_file_path, sheet_name=aba_relacionamentos, dtype=str)
-        df = df.fillna("")
-        
-        # Gera o conteúdo JDL baseado nos dados da planilha
-        jdl_content = ""
-        for _, row in df.iterrows():
-            rel_type = row.get("Relationship Type", "").strip()
-            entity_from = row.get("Entity From", "").strip()
-            field_from = row.get("Field From", "").strip()
-            entity_to = row.get("Entity To", "").strip()
-            field_to = row.get("Field To", "").strip()
-            
-            if not rel_type or not entity_from or not entity_to:
-                continue
-                
-            # Formata o tipo de relacionamento (one-to-many -> OneToMany)
-            rel_type_formatted = rel_type.title().replace("-", "")
-            
-            # Constrói a linha de relacionamento
-            jdl_line = f"relationship {rel_type_formatted} {{\n"
-            jdl_line += f"    {entity_from}{{{field_from}}} to {entity_to}{{{field_to}}}\n"
-            jdl_line += "}\n\n"
-            
-            jdl_content += jdl_line
+        if model is None:
+            model = JdlModel()
+        populate(model, excel_file_path, aba_relacionamentos)
+
+        # Gera o conteúdo JDL a partir do modelo
+        jdl_content = render_relationships(model)
         
         # Escreve no arquivo
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write(jdl_content)
+        write_if_changed(output_file, jdl_content)
+        instrumentation.bytes_written(output_file)
             
         print(f"Arquivo 'RELACIONAMENTOS.jdl' gerado/atualizado!")
         
     except Exception as e:
-        print(f"[ERRO] Falha ao processar relacionamentos: {str(e)}")
+        instrumentation.stage_failed(f"Falha ao processar relacionamentos: {str(e)}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,258 @@
+import os
+import sys
+import json
+import instrumentation
+from outputs import write_if_changed
+from workbook import read_sheet, iter_sheet_rows, is_streaming, normalize_headers, workbook_path
+
+# Tipos de campo aceitos pelo JDL (além dos enums definidos na aba ENUMS)
+JDL_FIELD_TYPES = {
+    "String", "Integer", "Long", "BigDecimal", "Float", "Double", "Boolean",
+    "LocalDate", "LocalTime", "ZonedDateTime", "Instant", "Duration", "UUID",
+    "Blob", "AnyBlob", "ImageBlob", "TextBlob",
+}
+
+# Opções de entidade conhecidas pelo JDL
+JDL_OPTIONS = {
+    "dto", "service", "paginate", "search", "microservice", "clientRootFolder",
+    "angularSuffix", "filter", "readOnly", "skipClient", "skipServer",
+    "noFluentMethod", "embedded",
+}
+
+# Entidades do próprio JHipster, que podem ser alvo de relacionamentos
+BUILT_IN_ENTITIES = {"User", "Authority"}
+
+# Colunas sem as quais a aba não gera nada
+REQUIRED_COLUMNS = {
+    "ENTIDADES": ["Entity"],
+    "CAMPOS": ["Entity", "Field Name", "Field Type"],
+    "ENUMS": ["Enum Name", "Enum Key"],
+    "RELACIONAMENTOS": ["Relationship Type", "Entity From", "Entity To"],
+    "OPTIONS": ["Entity", "Option Type"],
+}
+
+REPORT_FILE_NAME = "VALIDACAO.json"
+
+class Problem:
+    __slots__ = ("level", "sheet", "row", "message")
+
+    def __init__(self, level, sheet, row, message):
+        self.level = level      # "ERRO" ou "AVISO"
+        self.sheet = sheet
+        self.row = row          # número da linha na planilha (None = aba inteira)
+        self.message = message
+
+    def __str__(self):
+        where = f"{self.sheet}, linha {self.row}" if self.row else self.sheet
+        return f"[{self.level}] {where}: {self.message}"
+
+    def to_dict(self):
+        return {"level": self.level, "sheet": self.sheet, "row": self.row, "message": self.message}
+
+def _clean(value):
+    value = value.strip() if isinstance(value, str) else ""
+    return "" if value.lower() == "nan" else value
+
+def sheet_rows(excel_file_path, sheet, aliases=None):
+    """
+    (colunas, linhas) da aba, com linhas = lista de (número da linha na
+    planilha, dict { coluna: valor }). Abas em modo streaming e pastas de
+    arquivos (ver sources), em que a linha é a do arquivo, são lidas com
+    iter_sheet_rows. Devolve (None, []) se a aba não existir.
+    """
+    if is_streaming(sheet) or os.path.isdir(excel_file_path):
+        try:
+            rows = list(iter_sheet_rows(excel_file_path, sheet, with_row_numbers=True))
+        except ValueError:
+            return None, []
+        if aliases:
+            renames = {}
+            # A última linha tem todas as colunas (em JSON-lines, as primeiras
+            # só têm as vistas até ali; ver sources.iter_rows)
+            header = rows[-1][1].keys() if rows else []
+            for expected, alternatives in aliases.items():
+                if expected not in header:
+                    renames.update({alt: expected for alt in alternatives if alt in header})
+            rows = [(n, {renames.get(k, k): v for k, v in row.items()}) for n, row in rows]
+        columns = set(rows[-1][1]) if rows else set()
+        return columns, rows
+
+    try:
+        df = read_sheet(excel_file_path, sheet)
+    except ValueError:
+        return None, []
+    if aliases:
+        df = normalize_headers(df, aliases)
+    df = df.fillna("")
+    # Monta os dicts a partir das colunas (to_dict("records") converte célula
+    # a célula). O índice começa em 0 e a linha 1 da planilha é o cabeçalho.
+    columns = list(df.columns)
+    values = zip(*(df[c].tolist() for c in columns)) if columns else ()
+    records = [dict(zip(columns, row)) for row in values]
+    return set(columns), [(index + 2, row) for index, row in zip(df.index, records)]
+
+def validate(excel_file_path):
+    """
+    Confere as referências cruzadas entre as abas e devolve a lista de
+    problemas encontrados. Cada aba é percorrida uma única vez e as
+    consultas usam índices (dicts/sets) montados antes, então o custo é
+    linear no número de linhas.
+    """
+    import ENTIDADES
+    import OPTIONS
+    import RELACIONAMENTOS
+
+    problems = []
+    def error(sheet, row, message):
+        problems.append(Problem("ERRO", sheet, row, message))
+    def warning(sheet, row, message):
+        problems.append(Problem("AVISO", sheet, row, message))
+
+    sheets = {
+        "ENTIDADES": sheet_rows(excel_file_path, "ENTIDADES", ENTIDADES.HEADER_ALIASES),
+        "CAMPOS": sheet_rows(excel_file_path, "CAMPOS"),
+        "ENUMS": sheet_rows(excel_file_path, "ENUMS"),
+        "RELACIONAMENTOS": sheet_rows(excel_file_path, "RELACIONAMENTOS", RELACIONAMENTOS.HEADER_ALIASES),
+        "OPTIONS": sheet_rows(excel_file_path, "OPTIONS", OPTIONS.HEADER_ALIASES),
+    }
+    for sheet, (columns, rows) in sheets.items():
+        instrumentation.rows_read(sheet, len(rows))
+        if columns is None:
+            error(sheet, None, "aba não encontrada na planilha")
+            continue
+        missing = [c for c in REQUIRED_COLUMNS[sheet] if c not in columns]
+        if missing:
+            error(sheet, None, f"coluna(s) obrigatória(s) ausente(s): {', '.join(missing)}")
+
+    # 1) Índice de entidades
+    entities = {}
+    for row_number, row in sheets["ENTIDADES"][1]:
+        name = _clean(row.get("Entity"))
+        if not name:
+            if _clean(row.get("Alias")):
+                warning("ENTIDADES", row_number, "linha com alias mas sem nome de entidade (ignorada)")
+            continue
+        if name in entities:
+            warning("ENTIDADES", row_number, f"entidade '{name}' repetida (já definida na linha {entities[name]})")
+            continue
+        if not name.isidentifier():
+            error("ENTIDADES", row_number, f"nome de entidade inválido: '{name}'")
+        entities[name] = row_number
+
+    # 2) Índice de enums (e chaves repetidas)
+    enums = {}
+    for row_number, row in sheets["ENUMS"][1]:
+        name = _clean(row.get("Enum Name"))
+        key = _clean(row.get("Enum Key")).upper()
+        if not name or not key:
+            if name or key:
+                warning("ENUMS", row_number, "linha sem nome do enum ou sem chave (ignorada)")
+            continue
+        keys = enums.setdefault(name, {})
+        if key in keys:
+            warning("ENUMS", row_number, f"chave '{key}' repetida no enum '{name}' (linha {keys[key]})")
+        else:
+            keys[key] = row_number
+        if name in entities:
+            error("ENUMS", row_number, f"enum '{name}' tem o mesmo nome de uma entidade")
+
+    # 3) Campos: entidade existente, nome único e tipo conhecido
+    fields = {}
+    for row_number, row in sheets["CAMPOS"][1]:
+        entity = _clean(row.get("Entity"))
+        field = _clean(row.get("Field Name"))
+        field_type = _clean(row.get("Field Type"))
+        if not entity or not field:
+            if entity or field or field_type:
+                warning("CAMPOS", row_number, "linha sem entidade ou sem nome do campo (ignorada)")
+            continue
+        if entity not in entities:
+            error("CAMPOS", row_number, f"entidade '{entity}' do campo '{field}' não existe na aba ENTIDADES")
+            continue
+        key = (entity, field)
+        if key in fields:
+            error("CAMPOS", row_number, f"campo '{entity}.{field}' repetido (linha {fields[key]})")
+        else:
+            fields[key] = row_number
+        if not field_type:
+            error("CAMPOS", row_number, f"campo '{entity}.{field}' sem tipo")
+        elif field_type not in JDL_FIELD_TYPES and field_type not in enums:
+            error("CAMPOS", row_number, f"tipo '{field_type}' do campo '{entity}.{field}' não é um tipo JDL nem um enum da aba ENUMS")
+        for column in ("Minlength", "Maxlength", "Minbytes", "Maxbytes"):
+            value = _clean(row.get(column))
+            if value and not value.isdigit():
+                warning("CAMPOS", row_number, f"{column} '{value}' do campo '{entity}.{field}' não é um inteiro (ignorado)")
+
+    # 4) Relacionamentos: tipo válido e as duas pontas existentes
+    valid_types = set(RELACIONAMENTOS.RELATIONSHIP_TYPES.values())
+    for row_number, row in sheets["RELACIONAMENTOS"][1]:
+        # Mesma limpeza de RELACIONAMENTOS.populate ("–" = célula vazia)
+        cell = lambda name: RELACIONAMENTOS.clean_cell(_clean(row.get(name)))
+        rel_type = cell("Relationship Type")
+        entity_from = cell("Entity From")
+        entity_to = cell("Entity To")
+        if not rel_type or not entity_from or not entity_to:
+            if rel_type or entity_from or entity_to:
+                warning("RELACIONAMENTOS", row_number, "linha sem tipo ou sem uma das entidades (ignorada)")
+            continue
+        if RELACIONAMENTOS.format_relationship_type(rel_type) not in valid_types:
+            error("RELACIONAMENTOS", row_number, f"tipo de relacionamento desconhecido: '{rel_type}'")
+        if entity_from not in entities:
+            error("RELACIONAMENTOS", row_number, f"entidade de origem '{entity_from}' não existe na aba ENTIDADES")
+        built_in = "builtinentity" in cell("Options").lower().replace(" ", "")
+        if entity_to not in entities and not (built_in or entity_to in BUILT_IN_ENTITIES):
+            error("RELACIONAMENTOS", row_number, f"entidade de destino '{entity_to}' não existe na aba ENTIDADES")
+        # 'required' fica dentro das chaves do campo injetado; sem o campo,
+        # o lado é só o nome da entidade e a marcação se perde
+        for side, entity in (("From", entity_from), ("To", entity_to)):
+            if not cell(f"Field {side}") and RELACIONAMENTOS.is_required(cell(f"Required {side}")):
+                warning("RELACIONAMENTOS", row_number,
+                        f"'Required ({side})' marcado, mas o lado '{entity}' não tem campo injetado ('required' ignorado)")
+
+    # 5) Opções: entidade existente e opção conhecida
+    for row_number, row in sheets["OPTIONS"][1]:
+        entity = _clean(row.get("Entity"))
+        option_type = _clean(row.get("Option Type"))
+        if not entity or not option_type:
+            if entity or option_type:
+                warning("OPTIONS", row_number, "linha sem entidade ou sem opção (ignorada)")
+            continue
+        if entity not in entities:
+            error("OPTIONS", row_number, f"entidade '{entity}' da opção '{option_type}' não existe na aba ENTIDADES")
+        if option_type not in JDL_OPTIONS:
+            warning("OPTIONS", row_number, f"opção '{option_type}' desconhecida pelo JDL")
+
+    return problems
+
+def main(base_dir=None, strict=False):
+    """
+    Valida as referências entre as abas da planilha (entidades de CAMPOS,
+    RELACIONAMENTOS e OPTIONS, tipos enum dos campos, etc.), mostra cada
+    problema com a aba e a linha e grava o resultado em VALIDACAO.json.
+    Com strict=True, encerra com erro se houver algum problema de nível ERRO.
+    """
+    if base_dir is None:
+        base_dir = os.path.dirname(os.path.abspath(__file__))
+    excel_file_path = workbook_path(base_dir)
+    report_file = os.path.join(base_dir, REPORT_FILE_NAME)
+
+    if not os.path.exists(excel_file_path):
+        instrumentation.stage_failed(f"Arquivo de planilha '{excel_file_path}' não encontrado.")
+        return []
+
+    problems = validate(excel_file_path)
+    for problem in problems:
+        print(problem)
+
+    errors = sum(1 for p in problems if p.level == "ERRO")
+    write_if_changed(report_file, json.dumps([p.to_dict() for p in problems], indent=2, ensure_ascii=False) + "\n")
+    instrumentation.bytes_written(report_file)
+    print(f"[INFO] Validação concluída: {errors} erro(s), {len(problems) - errors} aviso(s).")
+
+    if strict and errors:
+        raise ValueError(f"a planilha tem {errors} erro(s) de validação")
+    return problems
+
+if __name__ == "__main__":
+    problems = main()
+    sys.exit(1 if any(p.level == "ERRO" for p in problems) else 0)
@@ -0,0 +1,84 @@
+"""
+API para usar o gerador como biblioteca, sem arquivos intermediários:
+
+    from api import build_model, render_jdl
+
+    model = build_model("TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx")
+    with open("app.jdl", "w", encoding="utf-8") as f:
+        for chunk in render_jdl(model):
+            f.write(chunk)
+
+build_model() monta o JdlModel com o populate() de cada etapa (a fonte
+pode ser o .xlsx ou uma pasta de arquivos por aba, ver sources).
+render_jdl() gera o mesmo texto do complete_fixed.jdl, pedaço a pedaço
+(uma entidade, um enum, uma linha de relacionamento por vez), de modo que
+o chamador pode enviá-lo para um socket ou arquivo sem montar o documento
+inteiro em memória.
+"""
+from jdl_model import JdlModel, iter_render_entities, iter_render_options, iter_render_relationships
+
+# Fragmentos na ordem em que JOIN_JDLS os concatena (APP.jdl primeiro e
+# os demais em ordem alfabética)
+FRAGMENTS = ["APP.jdl", "ENTIDADES.jdl", "OPTIONS.jdl", "RELACIONAMENTOS.jdl"]
+
+def build_model(source, application=True):
+    """
+    JdlModel completo a partir de 'source' (.xlsx ou pasta de arquivos por
+    aba): entidades, campos, enums, relacionamentos, opções e, com
+    application=True, os parâmetros do bloco application da aba APP.
+    Abas obrigatórias ausentes geram ValueError, como nas etapas.
+    """
+    from pipeline import STAGES, MODEL_STAGES, load_stage
+
+    model = JdlModel()
+    for name in STAGES:
+        if name in MODEL_STAGES or (name == "APP" and application):
+            load_stage(name).populate(model, source)
+    return model
+
+def iter_fragments(model):
+    """
+    (nome do fragmento, gerador de pedaços de texto), na ordem de FRAGMENTS.
+    O bloco application só entra se o modelo tiver os parâmetros da aba APP.
+    """
+    from APP import generate_app_jdl
+
+    renderers = {
+        "ENTIDADES.jdl": iter_render_entities,
+        "OPTIONS.jdl": iter_render_options,
+        "RELACIONAMENTOS.jdl": iter_render_relationships,
+    }
+    for name in FRAGMENTS:
+        if name == "APP.jdl":
+            if model.application is not None:
+                yield name, iter([generate_app_jdl(**model.application)])
+        else:
+            yield name, renderers[name](model)
+
+def render_jdl(model, fix=True):
+    """
+    Gera o JDL completo do modelo em pedaços de texto. Os fragmentos são
+    unidos como em JOIN_JDLS (fragmentos vazios são omitidos e cada um
+    termina com uma linha em branco) e, com fix=True, cada pedaço passa
+    pelas mesmas correções de FIX_COMPLETE_JDL, então "".join(render_jdl(m))
+    é igual ao complete_fixed.jdl gerado pelo pipeline.
+    """
+    from FIX_COMPLETE_JDL import fix_jdl_content
+
+    for _, chunks in iter_fragments(model):
+        # Pedaços em branco no início são retidos até se saber se o
+        # fragmento tem algum conteúdo
+        pending = []
+        last = None
+        for chunk in chunks:
+            if fix:
+                chunk = fix_jdl_content(chunk)
+            if last is None and not chunk.strip():
+                pending.append(chunk)
+                continue
+            if last is None:
+                yield from pending
+            yield chunk
+            last = chunk
+        if last is not None:
+            yield "\n" if last.endswith("\n") else "\n\n"
@@ -0,0 +1,159 @@
+"""
+Modo batch: gera o JDL de várias planilhas (ex.: uma por serviço) em
+paralelo, um processo por planilha, usando todos os núcleos.
+
+Uso:
+    python batch.py servicos/*/TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx
+    python batch.py "planilhas/*.xlsx" --output-dir "saida/{stem}" --jobs 8
+
+Cada planilha gera seus arquivos (APP.jdl, ..., complete_fixed.jdl) em uma
+pasta própria: a pasta da planilha, ou o modelo de --output-dir, em que
+{stem} é o nome do arquivo sem extensão e {parent} o nome da pasta da
+planilha. A saída de cada build vai para <pasta>/build.log; ao final é
+mostrado o tempo de cada planilha e as falhas.
+"""
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+LOG_FILE_NAME = "build.log"
+
+def expand_workbooks(patterns):
+    """
+    Caminhos absolutos das planilhas, na ordem dos padrões e sem repetições.
+    Padrões sem correspondência são devolvidos como estão, para que a falha
+    apareça no resumo.
+    """
+    workbooks = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) or [pattern]
+        for path in matches:
+            path = os.path.abspath(path)
+            if path not in workbooks:
+                workbooks.append(path)
+    return workbooks
+
+def output_dir_for(excel_file_path, template=None):
+    if template is None:
+        return os.path.dirname(excel_file_path)
+    stem = os.path.splitext(os.path.basename(excel_file_path))[0]
+    parent = os.path.basename(os.path.dirname(excel_file_path))
+    return os.path.abspath(template.format(stem=stem, parent=parent))
+
+def build_workbook(excel_file_path, output_dir, pipeline_options):
+    """
+    Executa o pipeline completo de uma planilha (em um processo do pool) e
+    devolve um dict com o resultado, o tempo e o erro, se houver.
+    """
+    import workbook
+    from pipeline import run_pipeline
+
+    result = {"workbook": excel_file_path, "output_dir": output_dir, "status": "ok", "error": None}
+    start = time.perf_counter()
+    try:
+        if not os.path.exists(excel_file_path):
+            raise FileNotFoundError(f"planilha '{excel_file_path}' não encontrada")
+        os.makedirs(output_dir, exist_ok=True)
+        with open(os.path.join(output_dir, LOG_FILE_NAME), "w", encoding="utf-8") as log:
+            with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+                run_pipeline(base_dir=output_dir, excel_file_path=excel_file_path, **pipeline_options)
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = str(e) or type(e).__name__
+    finally:
+        # O processo é reaproveitado para outras planilhas
+        workbook.set_workbook_path(output_dir, None)
+        workbook.clear_cache()
+    result["seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+def run_batch(workbooks, output_template=None, jobs=None, **pipeline_options):
+    """
+    Gera o JDL de cada planilha de 'workbooks' com até 'jobs' processos
+    (padrão: um por núcleo). 'pipeline_options' são repassadas a
+    run_pipeline(). Devolve a lista de resultados, na ordem de 'workbooks'.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    output_dirs = [output_dir_for(path, output_template) for path in workbooks]
+    duplicated = {d for d in output_dirs if output_dirs.count(d) > 1}
+    if duplicated:
+        raise ValueError(f"mais de uma planilha gravaria na mesma pasta: {', '.join(sorted(duplicated))} "
+                         f"(use --output-dir com {{parent}} ou {{stem}})")
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=min(jobs, len(workbooks)) or 1) as executor:
+        futures = {
+            executor.submit(build_workbook, path, output_dir, pipeline_options): path
+            for path, output_dir in zip(workbooks, output_dirs)
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results[futures[future]] = result
+            label = "OK  " if result["status"] == "ok" else "ERRO"
+            print(f"[{label}] {result['seconds']:8.2f}s  {result['workbook']}")
+    return [results[path] for path in workbooks]
+
+def print_summary(results, elapsed):
+    failed = [r for r in results if r["status"] != "ok"]
+    total = sum(r["seconds"] for r in results)
+    print(f"\n[INFO] {len(results)} planilha(s) em {elapsed:.2f}s "
+          f"(soma dos builds: {total:.2f}s), {len(failed)} falha(s).")
+    for result in failed:
+        log_path = os.path.join(result["output_dir"], LOG_FILE_NAME)
+        hint = f" (ver {log_path})" if os.path.exists(log_path) else ""
+        print(f"[ERRO] {result['workbook']}: {result['error']}{hint}")
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Gera o JDL de várias planilhas em paralelo.")
+    parser.add_argument("workbooks", nargs="+", metavar="PLANILHA",
+                        help="planilhas .xlsx ou padrões glob (ex.: 'servicos/*/*.xlsx')")
+    parser.add_argument("--output-dir", metavar="MODELO",
+                        help="pasta de saída de cada planilha; aceita {stem} e {parent} "
+                             "(padrão: a pasta da própria planilha)")
+    parser.add_argument("--jobs", "-j", type=int, default=None, metavar="N",
+                        help="planilhas processadas ao mesmo tempo (padrão: número de núcleos)")
+    parser.add_argument("--full", action="store_true",
+                        help="ignora o cache do build incremental de cada planilha")
+    parser.add_argument("--strict", action="store_true",
+                        help="considera falha uma planilha com erros de validação")
+    parser.add_argument("--streaming", action="store_true",
+                        help="lê a aba CAMPOS linha a linha (openpyxl read_only), sem materializar o "
+                             "DataFrame da aba; os campos continuam todos no modelo")
+    parser.add_argument("--workbook-cache", action="store_true",
+                        help="usa o cache em disco das abas (desligado por padrão: com muitas "
+                             "planilhas na mesma pasta, o limite de entradas o esvaziaria)")
+    parser.add_argument("--report", metavar="ARQUIVO",
+                        help="grava o resultado e o tempo de cada planilha em JSON")
+    return parser
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    workbooks = expand_workbooks(args.workbooks)
+    pipeline_options = {
+        "incremental": not args.full,
+        "strict": args.strict,
+        "streaming": args.streaming,
+        "workbook_cache": args.workbook_cache,
+    }
+
+    start = time.perf_counter()
+    try:
+        results = run_batch(workbooks, args.output_dir, args.jobs, **pipeline_options)
+    except ValueError as e:
+        print(f"[ERRO] {e}", file=sys.stderr)
+        return 2
+    print_summary(results, time.perf_counter() - start)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"[INFO] Relatório gravado em {args.report}")
+    return 1 if any(r["status"] != "ok" for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
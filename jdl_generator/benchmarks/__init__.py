@@ -0,0 +1,10 @@
+"""
+Benchmarks do gerador de JDL.
+
+    python -m benchmarks.run --sizes 100 1k 10k --output bench.json
+    python -m benchmarks.run --sizes 1k --compare bench.json
+
+synthetic.py cria planilhas TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx sintéticas
+de tamanho configurável; run.py cronometra cada etapa e o pipeline completo
+e grava um relatório JSON que pode ser comparado entre execuções.
+"""
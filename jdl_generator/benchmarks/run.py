@@ -0,0 +1,208 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+
+GENERATOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if GENERATOR_DIR not in sys.path:
+    sys.path.insert(0, GENERATOR_DIR)
+
+import pipeline
+import workbook
+from jdl_model import JdlModel
+from benchmarks.synthetic import generate_workbook
+
+def parse_size(text):
+    """
+    '100' -> 100, '1k' -> 1000, '10k' -> 10000, '1m' -> 1000000
+    """
+    text = text.strip().lower()
+    multiplier = 1
+    if text.endswith("k"):
+        multiplier, text = 1000, text[:-1]
+    elif text.endswith("m"):
+        multiplier, text = 1000000, text[:-1]
+    return int(float(text) * multiplier)
+
+def max_rss_kb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS informa em bytes, Linux em KB
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+@contextlib.contextmanager
+def quiet():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def _run_stages(work_dir, excel_file_path, measure_memory):
+    """
+    Executa a leitura da planilha e cada etapa, em ordem, medindo o tempo
+    (ou, com measure_memory, o pico de memória alocada via tracemalloc).
+    """
+    results = {}
+    workbook.clear_cache()
+    model = JdlModel()
+
+    steps = [("WORKBOOK", lambda: workbook.read_workbook(excel_file_path))]
+    steps += [(name, lambda name=name: pipeline.run_stage(name, model, work_dir)) for name in pipeline.STAGES]
+
+    for name, step in steps:
+        if measure_memory:
+            tracemalloc.reset_peak()
+            with quiet():
+                step()
+            results[name] = tracemalloc.get_traced_memory()[1]
+        else:
+            start = time.perf_counter()
+            with quiet():
+                step()
+            results[name] = time.perf_counter() - start
+    return results
+
+def benchmark_size(label, entities, args):
+    work_dir = tempfile.mkdtemp(prefix=f"jdl_bench_{label}_")
+    excel_file_path = os.path.join(work_dir, workbook.EXCEL_FILE_NAME)
+    try:
+        start = time.perf_counter()
+        params = generate_workbook(
+            excel_file_path,
+            entities=entities,
+            fields_per_entity=args.fields,
+            enums=args.enums,
+            enum_keys=args.enum_keys,
+            relationships_per_entity=args.relationships,
+            seed=args.seed,
+        )
+        generate_seconds = time.perf_counter() - start
+
+        # Tempo de cada etapa: melhor de N execuções
+        timings = None
+        for _ in range(args.repeat):
+            run = _run_stages(work_dir, excel_file_path, measure_memory=False)
+            timings = run if timings is None else {k: min(v, run[k]) for k, v in timings.items()}
+
+        # Pico de memória de cada etapa (execução separada: tracemalloc distorce o tempo)
+        tracemalloc.start()
+        try:
+            peaks = _run_stages(work_dir, excel_file_path, measure_memory=True)
+        finally:
+            tracemalloc.stop()
+
+        # Pipeline completo, incluindo a leitura da planilha
+        end_to_end = None
+        for _ in range(args.repeat):
+            workbook.clear_cache()
+            start = time.perf_counter()
+            with quiet():
+                pipeline.run_pipeline(incremental=False, jobs=args.jobs, base_dir=work_dir,
+                                      workbook_cache=args.workbook_cache)
+            elapsed = time.perf_counter() - start
+            end_to_end = elapsed if end_to_end is None else min(end_to_end, elapsed)
+
+        output_path = os.path.join(work_dir, "complete_fixed.jdl")
+        return {
+            "label": label,
+            "params": params,
+            "workbook_bytes": os.path.getsize(excel_file_path),
+            "generate_seconds": round(generate_seconds, 4),
+            "stages": {
+                name: {"seconds": round(timings[name], 4), "peak_bytes": peaks[name]}
+                for name in timings
+            },
+            "end_to_end": {
+                "seconds": round(end_to_end, 4),
+                "peak_bytes": max(peaks.values()),
+            },
+            "output_bytes": os.path.getsize(output_path) if os.path.exists(output_path) else 0,
+        }
+    finally:
+        workbook.clear_cache()
+        if args.keep:
+            print(f"[INFO] Arquivos mantidos em {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+def print_result(result):
+    print(f"\n== {result['label']} ({result['params']['entities']} entidades, "
+          f"{result['workbook_bytes'] / 1024:.0f} KB) ==")
+    print(f"{'etapa':<20}{'segundos':>12}{'pico (MB)':>12}")
+    for name, data in result["stages"].items():
+        print(f"{name:<20}{data['seconds']:>12.4f}{data['peak_bytes'] / 1e6:>12.2f}")
+    e2e = result["end_to_end"]
+    print(f"{'END_TO_END':<20}{e2e['seconds']:>12.4f}{e2e['peak_bytes'] / 1e6:>12.2f}")
+
+def compare_reports(old, new):
+    """
+    Imprime, para cada tamanho presente nos dois relatórios, a razão
+    novo/antigo do tempo de cada etapa (< 1.0 = mais rápido).
+    """
+    old_by_label = {r["label"]: r for r in old.get("results", [])}
+    for result in new.get("results", []):
+        previous = old_by_label.get(result["label"])
+        if previous is None:
+            continue
+        print(f"\n== {result['label']}: comparação com o relatório anterior ==")
+        print(f"{'etapa':<20}{'antes':>10}{'agora':>10}{'razão':>10}")
+        rows = list(result["stages"].items()) + [("END_TO_END", result["end_to_end"])]
+        for name, data in rows:
+            before = previous["end_to_end"] if name == "END_TO_END" else previous["stages"].get(name)
+            if not before:
+                continue
+            ratio = data["seconds"] / before["seconds"] if before["seconds"] else float("inf")
+            print(f"{name:<20}{before['seconds']:>10.4f}{data['seconds']:>10.4f}{ratio:>10.2f}")
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Benchmark do gerador de JDL com planilhas sintéticas.")
+    parser.add_argument("--sizes", nargs="+", default=["100", "1k"],
+                        help="número de entidades de cada planilha (ex.: 100 1k 10k)")
+    parser.add_argument("--fields", type=int, default=20, help="campos por entidade")
+    parser.add_argument("--enums", type=int, default=10, help="quantidade de enums")
+    parser.add_argument("--enum-keys", type=int, default=1000, help="chaves por enum")
+    parser.add_argument("--relationships", type=int, default=3, help="relacionamentos por entidade")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="repetições (guarda o melhor tempo)")
+    parser.add_argument("--jobs", type=int, default=1, help="--jobs do pipeline no teste ponta a ponta")
+    parser.add_argument("--output", default="bench_report.json", help="arquivo JSON do relatório")
+    parser.add_argument("--compare", metavar="REPORT", help="relatório JSON anterior para comparação")
+    parser.add_argument("--workbook-cache", action="store_true",
+                        help="usa o cache em disco das abas (mede a leitura com o cache quente)")
+    parser.add_argument("--keep", action="store_true", help="não apaga as planilhas/JDL gerados")
+    return parser
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    workbook.set_disk_cache(args.workbook_cache)
+
+    results = []
+    for label in args.sizes:
+        result = benchmark_size(label, parse_size(label), args)
+        print_result(result)
+        results.append(result)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "max_rss_kb": max_rss_kb(),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[INFO] Relatório gravado em {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare_reports(json.load(f), report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import os
+import random
+from openpyxl import Workbook
+
+APP_CONFIG = {
+    "applicationType": "monolith",
+    "authenticationType": "session",
+    "baseName": "SyntheticApp",
+    "buildTool": "maven",
+    "databaseType": "sql",
+    "languages": "en, pt",
+    "packageName": "com.example.synthetic",
+    "serverPort": "8080",
+}
+
+CAMPOS_HEADER = [
+    "Entity", "Field Name", "Field Type", "Required", "Minlength", "Maxlength",
+    "Pattern", "Unique", "Min", "Max", "Minbytes", "Maxbytes",
+    "Field Annotation(s)", "Field Javadoc/Comment", "Observações/Exemplo",
+]
+
+FIELD_TYPES = ["String", "Integer", "Long", "BigDecimal", "Boolean", "LocalDate", "Instant", "Blob"]
+
+RELATIONSHIP_TYPES = ["one-to-many", "many-to-one", "many-to-many", "one-to-one"]
+
+OPTIONS = [("dto", "mapstruct"), ("service", "serviceImpl"), ("paginate", "pagination"), ("search", "elasticsearch")]
+
+def entity_name(i):
+    return f"Entity{i:05d}"
+
+def enum_name(i):
+    return f"Enum{i:04d}"
+
+def _field_row(rng, entity, index, enums):
+    """
+    Uma linha da aba CAMPOS com uma mistura realista de validações e Javadoc.
+    """
+    if enums and rng.random() < 0.1:
+        field_type = rng.choice(enums)
+    else:
+        field_type = rng.choice(FIELD_TYPES)
+
+    row = [entity, f"field{index:03d}", field_type] + [None] * (len(CAMPOS_HEADER) - 3)
+    row[3] = rng.choice(["yes", "no", None])
+    if field_type == "String":
+        row[4] = rng.choice([None, 1, 2])
+        row[5] = rng.choice([None, 40, 255])
+        row[6] = rng.choice([None, None, "^[A-Z][a-z]+$"])
+        row[7] = rng.choice([None, None, "yes"])
+    elif field_type in ("Integer", "Long", "BigDecimal"):
+        row[8] = rng.choice([None, 0, -10])
+        row[9] = rng.choice([None, 100, 99999])
+    elif field_type == "Blob":
+        row[10] = 1
+        row[11] = 1048576
+    if rng.random() < 0.3:
+        row[12] = "@JsonIgnore"
+    if rng.random() < 0.5:
+        row[13] = f"Campo {index} da entidade {entity}"
+    if rng.random() < 0.2:
+        row[14] = "Exemplo de valor"
+    return row
+
+def generate_workbook(
+    path,
+    entities=100,
+    fields_per_entity=20,
+    enums=10,
+    enum_keys=100,
+    relationships_per_entity=2,
+    options_ratio=0.8,
+    seed=0,
+):
+    """
+    Gera uma planilha sintética em 'path' no mesmo formato lido pelas etapas.
+    Usa o modo write_only do openpyxl para suportar dezenas de milhares de
+    entidades sem montar a planilha inteira em memória. Retorna o
+    dicionário de parâmetros usados (incluído no relatório do benchmark).
+    """
+    rng = random.Random(seed)
+    enum_names = [enum_name(i) for i in range(enums)]
+
+    wb = Workbook(write_only=True)
+
+    ws = wb.create_sheet("APP")
+    ws.append(list(APP_CONFIG))
+    ws.append(list(APP_CONFIG.values()))
+
+    ws = wb.create_sheet("ENTIDADES")
+    ws.append(["Entity", "Alias"])
+    for i in range(entities):
+        ws.append([entity_name(i), f"entity_{i:05d}_alias"])
+
+    ws = wb.create_sheet("CAMPOS")
+    ws.append(CAMPOS_HEADER)
+    for i in range(entities):
+        entity = entity_name(i)
+        for j in range(fields_per_entity):
+            ws.append(_field_row(rng, entity, j, enum_names))
+
+    ws = wb.create_sheet("ENUMS")
+    ws.append(["Enum Name", "Enum Key", "Enum Value (opcional)", "Comentário", "Observações"])
+    for name in enum_names:
+        for k in range(enum_keys):
+            ws.append([
+                name,
+                f"KEY_{k:05d}",
+                f"Value {k}" if k % 2 else None,
+                f"Comentário {k}" if k % 5 == 0 else None,
+                None,
+            ])
+
+    ws = wb.create_sheet("RELACIONAMENTOS")
+    ws.append(["Relationship Type", "Entity From", "Field From", "Entity To", "Field To"])
+    if entities > 1:
+        for i in range(entities):
+            for r in range(relationships_per_entity):
+                target = rng.randrange(entities - 1)
+                target = target + 1 if target >= i else target
+                ws.append([
+                    rng.choice(RELATIONSHIP_TYPES),
+                    entity_name(i),
+                    f"rel{r}",
+                    entity_name(target),
+                    f"back{i}",
+                ])
+
+    ws = wb.create_sheet("OPTIONS")
+    ws.append(["Entity", "Option Type", "Option Value"])
+    for option_type, option_value in OPTIONS:
+        for i in range(entities):
+            if rng.random() < options_ratio:
+                ws.append([entity_name(i), option_type, option_value])
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    wb.save(path)
+
+    return {
+        "entities": entities,
+        "fields_per_entity": fields_per_entity,
+        "enums": enums,
+        "enum_keys": enum_keys,
+        "relationships_per_entity": relationships_per_entity,
+        "options_ratio": options_ratio,
+        "seed": seed,
+    }
@@ -0,0 +1,112 @@
+import os
+import json
+import shutil
+import hashlib
+
+CACHE_DIR_NAME = ".jdl_cache"
+MANIFEST_FILE_NAME = "build_manifest.json"
+
+def file_digest(path):
+    """
+    sha256 do conteúdo do arquivo, ou None se ele não existir.
+    """
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def combine_digests(*parts):
+    """
+    Combina várias strings (digests, nomes) em uma única impressão digital.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+class BuildCache:
+    """
+    Cache do build incremental, guardado em <base_dir>/.jdl_cache:
+
+      - build_manifest.json: para cada etapa, a impressão digital das suas
+        entradas (abas, código, etapas anteriores) e o sha256 de cada
+        arquivo gerado ao final do último build;
+      - fragments/: cópia dos arquivos gerados, usada para restaurar um
+        fragmento apagado/alterado sem precisar rodar a etapa de novo.
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.cache_dir = os.path.join(base_dir, CACHE_DIR_NAME)
+        self.fragments_dir = os.path.join(self.cache_dir, "fragments")
+        self.manifest_path = os.path.join(self.cache_dir, MANIFEST_FILE_NAME)
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def is_fresh(self, stage, fingerprint, outputs):
+        """
+        True se a etapa já foi executada com exatamente estas entradas e todos
+        os seus arquivos de saída estão intactos (ou puderam ser restaurados
+        a partir do cache de fragmentos).
+        """
+        entry = self.manifest.get(stage)
+        if not entry or entry.get("fingerprint") != fingerprint:
+            return False
+
+        recorded = entry.get("outputs", {})
+        for output in outputs:
+            expected = recorded.get(output)
+            if expected is None:
+                return False
+            output_path = os.path.join(self.base_dir, output)
+            if file_digest(output_path) == expected:
+                continue
+            if not self._restore(output, expected):
+                return False
+        return True
+
+    def _restore(self, output, expected):
+        cached_path = os.path.join(self.fragments_dir, output)
+        if file_digest(cached_path) != expected:
+            return False
+        shutil.copyfile(cached_path, os.path.join(self.base_dir, output))
+        print(f"[INFO] Fragmento '{output}' restaurado do cache.")
+        return True
+
+    def record(self, stage, fingerprint, outputs):
+        """
+        Registra a impressão digital da etapa e o estado atual das suas saídas.
+        Deve ser chamado ao final do build, quando os arquivos compartilhados
+        entre etapas (ex.: ENTIDADES.jdl) já estão na versão final.
+        """
+        os.makedirs(self.fragments_dir, exist_ok=True)
+        hashes = {}
+        for output in outputs:
+            output_path = os.path.join(self.base_dir, output)
+            digest = file_digest(output_path)
+            if digest is None:
+                # Etapa não gerou a saída (ex.: erro reportado): não entra no cache
+                self.manifest.pop(stage, None)
+                return
+            hashes[output] = digest
+            shutil.copyfile(output_path, os.path.join(self.fragments_dir, output))
+        self.manifest[stage] = {"fingerprint": fingerprint, "outputs": hashes}
+
+    def save(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+
+    def clear(self):
+        self.manifest = {}
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
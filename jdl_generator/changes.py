@@ -0,0 +1,138 @@
+"""
+Manifesto de alterações entre dois builds: compara o modelo atual com o do
+build anterior (guardado em .jdl_cache/model.json) e lista as entidades,
+enums, relacionamentos e opções adicionados, alterados e removidos.
+
+Opcionalmente gera também um changes.jdl mínimo, só com as entidades
+afetadas e seus vizinhos de relacionamento, para que a regeneração no
+JHipster seja proporcional à alteração.
+"""
+import os
+import json
+from build_cache import CACHE_DIR_NAME
+from outputs import write_if_changed
+from graph import render_subset_jdl
+from jdl_model import (
+    model_to_dict, model_from_dict, entity_to_dict, enum_to_dict,
+    relationship_to_dict, option_to_dict,
+)
+
+SNAPSHOT_FILE_NAME = "model.json"
+MANIFEST_FILE_NAME = "changes.json"
+CHANGES_JDL_FILE_NAME = "changes.jdl"
+
+def snapshot_path(base_dir):
+    return os.path.join(base_dir, CACHE_DIR_NAME, SNAPSHOT_FILE_NAME)
+
+def load_snapshot(base_dir):
+    """
+    Modelo do build anterior, ou None se ainda não houver um.
+    """
+    try:
+        with open(snapshot_path(base_dir), "r", encoding="utf-8") as f:
+            return model_from_dict(json.load(f))
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def save_snapshot(base_dir, model):
+    os.makedirs(os.path.dirname(snapshot_path(base_dir)), exist_ok=True)
+    write_if_changed(snapshot_path(base_dir), json.dumps(model_to_dict(model), ensure_ascii=False))
+
+def _diff_named(old_items, new_items, to_dict):
+    """
+    Compara dois dicts { nome: objeto } e devolve (adicionados, alterados, removidos).
+    """
+    added = [name for name in new_items if name not in old_items]
+    removed = [name for name in old_items if name not in new_items]
+    changed = [
+        name for name in new_items
+        if name in old_items and to_dict(new_items[name]) != to_dict(old_items[name])
+    ]
+    return added, changed, removed
+
+def _diff_list(old_items, new_items, to_dict):
+    """
+    Compara duas listas (relacionamentos, opções) pelo conteúdo de cada item.
+    """
+    old_keys = [json.dumps(to_dict(item), sort_keys=True) for item in old_items]
+    new_keys = [json.dumps(to_dict(item), sort_keys=True) for item in new_items]
+    old_set, new_set = set(old_keys), set(new_keys)
+    added = [json.loads(k) for k in new_keys if k not in old_set]
+    removed = [json.loads(k) for k in old_keys if k not in new_set]
+    return added, removed
+
+def diff_models(old, new):
+    """
+    Manifesto das diferenças entre o modelo 'old' (None = primeiro build) e 'new'.
+
+    'affected_entities' são as entidades atuais que precisam ser regeradas:
+    adicionadas ou alteradas, com campos cujo tipo é um enum adicionado ou
+    alterado, que aparecem em um relacionamento adicionado/removido ou que
+    tiveram opções adicionadas/removidas.
+    """
+    if old is None:
+        from jdl_model import JdlModel
+        old = JdlModel()
+
+    ent_added, ent_changed, ent_removed = _diff_named(old.entities, new.entities, entity_to_dict)
+    enum_added, enum_changed, enum_removed = _diff_named(old.enums, new.enums, enum_to_dict)
+    rel_added, rel_removed = _diff_list(old.relationships, new.relationships, relationship_to_dict)
+    opt_added, opt_removed = _diff_list(old.options, new.options, option_to_dict)
+
+    affected = set(ent_added) | set(ent_changed)
+    touched_enums = set(enum_added) | set(enum_changed) | set(enum_removed)
+    for name, entity in new.entities.items():
+        if any(f.type in touched_enums for f in entity.fields):
+            affected.add(name)
+    for rel in rel_added + rel_removed:
+        affected.update((rel["entity_from"], rel["entity_to"]))
+    for opt in opt_added + opt_removed:
+        affected.add(opt["entity"])
+
+    return {
+        "entities": {"added": ent_added, "changed": ent_changed, "removed": ent_removed},
+        "enums": {"added": enum_added, "changed": enum_changed, "removed": enum_removed},
+        "relationships": {"added": rel_added, "removed": rel_removed},
+        "options": {"added": opt_added, "removed": opt_removed},
+        # Ordem do modelo; entidades removidas não existem mais para regerar
+        "affected_entities": [name for name in new.entities if name in affected],
+    }
+
+def with_neighbours(model, entity_names):
+    """
+    'entity_names' mais as entidades ligadas a elas por algum relacionamento,
+    para que o JDL mínimo não referencie entidades que não declara.
+    """
+    targets = set(entity_names)
+    names = set(entity_names)
+    for rel in model.relationships:
+        if rel.entity_from in targets or rel.entity_to in targets:
+            names.update((rel.entity_from, rel.entity_to))
+    return [name for name in model.entities if name in names]
+
+def write_changes(base_dir, model, write_jdl=False):
+    """
+    Grava changes.json (e, com write_jdl, changes.jdl) comparando 'model' com
+    o modelo do build anterior e, em seguida, guarda 'model' como referência
+    para o próximo build. Retorna o manifesto.
+    """
+    previous = load_snapshot(base_dir)
+    manifest = diff_models(previous, model)
+    manifest = {"previous_build": previous is not None, **manifest}
+
+    if write_jdl:
+        entities = with_neighbours(model, manifest["affected_entities"])
+        manifest["changes_jdl"] = {"file": CHANGES_JDL_FILE_NAME, "entities": entities}
+        write_if_changed(os.path.join(base_dir, CHANGES_JDL_FILE_NAME),
+                         render_subset_jdl(model, entities))
+
+    write_if_changed(os.path.join(base_dir, MANIFEST_FILE_NAME),
+                     json.dumps(manifest, indent=2, ensure_ascii=False) + "\n")
+    save_snapshot(base_dir, model)
+
+    print(f"[INFO] Alterações desde o último build: "
+          f"{len(manifest['entities']['added'])} entidade(s) adicionada(s), "
+          f"{len(manifest['entities']['changed'])} alterada(s), "
+          f"{len(manifest['entities']['removed'])} removida(s); "
+          f"{len(manifest['affected_entities'])} afetada(s) -> {MANIFEST_FILE_NAME}")
+    return manifest
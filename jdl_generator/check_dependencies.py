@@ -1,43 +1,104 @@
 import os
-import subprocess
+import re
 import sys
-import importlib
+import json
+import site
+import hashlib
 
-def check_and_install_dependencies():
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Once every requirement is satisfied, this stamp records the interpreter and
+# requirements it was checked against; later runs skip the check entirely.
+STAMP_PATH = os.path.join(BASE_DIR, ".jdl_cache", "dependencies.stamp")
+
+_REQUIREMENT = re.compile(r"^\s*([A-Za-z0-9_.\-]+)\s*(?:(>=|==)\s*([0-9][0-9A-Za-z.]*))?")
+
+def parse_version(version):
+    """'2.1.4' -> (2, 1, 4); pre-release/local suffixes are ignored."""
+    parts = []
+    for part in version.split("."):
+        digits = re.match(r"\d+", part)
+        if not digits:
+            break
+        parts.append(int(digits.group()))
+    return tuple(parts)
+
+def is_satisfied(requirement):
+    """
+    True if the installed distribution satisfies 'requirement' (name, name>=x
+    or name==x). Uses the package metadata only, so nothing is imported.
+    """
+    match = _REQUIREMENT.match(requirement)
+    if not match:
+        return True
+    name, operator, wanted = match.groups()
+    # Imported here: importlib.metadata is slow to import and the stamp
+    # usually makes the check unnecessary
+    from importlib import metadata
+    try:
+        installed = metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return False
+    if operator == ">=":
+        return parse_version(installed) >= parse_version(wanted)
+    if operator == "==":
+        return parse_version(installed) == parse_version(wanted)
+    return True
+
+def stamp_key(requirements):
+    """
+    Interpreter, requirements and the mtime of each site-packages directory,
+    which changes whenever a package is installed or removed there.
+    """
+    site_dirs = site.getsitepackages() + [site.getusersitepackages()]
+    mtimes = [str(os.stat(d).st_mtime_ns) for d in site_dirs if os.path.isdir(d)]
+    raw = "\0".join([sys.executable, sys.version, *requirements, *mtimes])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+def read_stamp():
+    try:
+        with open(STAMP_PATH, "r", encoding="utf-8") as f:
+            return json.load(f).get("key")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def write_stamp(key):
+    os.makedirs(os.path.dirname(STAMP_PATH), exist_ok=True)
+    with open(STAMP_PATH, "w", encoding="utf-8") as f:
+        json.dump({"key": key, "python": sys.executable}, f)
+
+def check_and_install_dependencies(force=False):
     """Check if required packages are installed and install them if needed."""
-    requirements_path = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), 
-        "requirements.txt"
-    )
-    
+    requirements_path = os.path.join(BASE_DIR, "requirements.txt")
+
     if not os.path.exists(requirements_path):
         print("Creating requirements.txt file...")
         with open(requirements_path, "w") as f:
             f.write("pandas>=1.3.0\nopenpyxl>=3.0.0\n")
-    
-    # Read requirements file
+
+    # Read requirements file, skipping empty lines and comments
     with open(requirements_path, "r") as f:
-        requirements = [line.strip() for line in f if line.strip()]
-    
+        requirements = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+    key = stamp_key(requirements)
+    if not force and read_stamp() == key:
+        print("All required dependencies are already installed (cached check).\n")
+        return
+
     # Check which packages need to be installed
     missing_packages = []
     for requirement in requirements:
-        # Skip empty lines and comments
-        if not requirement or requirement.startswith('#'):
-            continue
-        
-        # Parse requirement name (without version)
-        package_name = requirement.split('>=')[0].split('==')[0].split('<')[0].strip()
-        
-        try:
-            importlib.import_module(package_name)
+        match = _REQUIREMENT.match(requirement)
+        package_name = match.group(1) if match else requirement
+        if is_satisfied(requirement):
             print(f"✓ {package_name} is already installed")
-        except ImportError:
+        else:
             missing_packages.append(requirement)
             print(f"✗ {package_name} needs to be installed")
-    
+
     # Install missing packages
     if missing_packages:
+        import subprocess
         print("\nInstalling missing dependencies...")
         python_executable = sys.executable
         subprocess.check_call([
@@ -46,7 +107,8 @@ def check_and_install_dependencies():
         print("All dependencies installed successfully!\n")
     else:
         print("All required dependencies are already installed.\n")
+    write_stamp(key)
 
 if __name__ == "__main__":
     print("Checking dependencies...")
-    check_and_install_dependencies()
+    check_and_install_dependencies(force="--force" in sys.argv[1:])
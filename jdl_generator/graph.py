@@ -0,0 +1,167 @@
+"""
+Índice de dependências entre entidades, montado a partir do modelo
+(relacionamentos da aba RELACIONAMENTOS e tipos dos campos da aba CAMPOS,
+inclusive campos cujo tipo é um enum), e extração de um JDL autocontido com
+um conjunto de entidades raiz e tudo de que elas dependem.
+
+Uso:
+    python graph.py Pedido Cliente -o subsets/pedidos.jdl
+    python graph.py Pedido --incoming --list
+
+O JDL extraído não pode ser gravado na pasta dos fragmentos (a dos scripts
+ou a da planilha): JOIN_JDLS concatenaria ali todo *.jdl no complete.jdl,
+duplicando as entidades.
+"""
+import os
+import sys
+import argparse
+from collections import deque
+from jdl_model import subset_model
+
+class ModelGraph:
+    """
+    Listas de adjacência do modelo:
+      - depends_on[A]:  entidades para as quais A tem um relacionamento (A -> B);
+      - referenced_by[B]: o inverso (quem aponta para B);
+      - enums_of[A]:    enums usados como tipo de campo por A.
+    Entidades fora do modelo (ex.: User do JHipster) não entram no grafo; os
+    relacionamentos com elas são mantidos por subset_model.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.depends_on = {name: [] for name in model.entities}
+        self.referenced_by = {name: [] for name in model.entities}
+        self.enums_of = {name: [] for name in model.entities}
+
+        for rel in model.relationships:
+            if rel.entity_from in self.depends_on and rel.entity_to in self.depends_on:
+                self.depends_on[rel.entity_from].append(rel.entity_to)
+                self.referenced_by[rel.entity_to].append(rel.entity_from)
+
+        for name, entity in model.entities.items():
+            seen = set()
+            for field in entity.fields:
+                if field.type in model.enums and field.type not in seen:
+                    seen.add(field.type)
+                    self.enums_of[name].append(field.type)
+
+    def closure(self, roots, incoming=False):
+        """
+        Entidades alcançáveis a partir de 'roots' (busca em largura, O(V + E)).
+        Com incoming=True, as arestas são seguidas nos dois sentidos, trazendo
+        também quem referencia as entidades do conjunto.
+        Retorna as entidades na ordem do modelo.
+        """
+        unknown = [r for r in roots if r not in self.depends_on]
+        if unknown:
+            raise KeyError(f"Entidade(s) não encontrada(s) no modelo: {', '.join(unknown)}")
+
+        reached = set(roots)
+        queue = deque(roots)
+        while queue:
+            name = queue.popleft()
+            neighbours = self.depends_on[name]
+            if incoming:
+                neighbours = neighbours + self.referenced_by[name]
+            for other in neighbours:
+                if other not in reached:
+                    reached.add(other)
+                    queue.append(other)
+        return [name for name in self.model.entities if name in reached]
+
+    def enums_for(self, entity_names):
+        enums = {enum for name in entity_names for enum in self.enums_of[name]}
+        return [name for name in self.model.enums if name in enums]
+
+def load_model(excel_file_path, application=False):
+    """
+    Monta o modelo completo a partir da planilha (ver api.build_model), sem
+    gravar nenhum arquivo. Com application=True, inclui os parâmetros do
+    bloco application da aba APP.
+    """
+    from api import build_model
+
+    return build_model(excel_file_path, application=application)
+
+def render_subset_jdl(model, entity_names, application=True):
+    """
+    JDL autocontido com as entidades informadas, os enums que elas usam, os
+    relacionamentos e opções entre elas (ou com entidades de fora do modelo,
+    como User) e, com application=True, o bloco application do modelo, se
+    houver. Sai no mesmo formato de complete_fixed.jdl (ver api.render_jdl).
+    """
+    from api import render_jdl
+
+    subset = subset_model(model, entity_names)
+    if not application:
+        subset.application = None
+    return "".join(render_jdl(subset))
+
+def joined_dirs(excel_file_path):
+    """
+    Pastas cujos *.jdl são concatenados por JOIN_JDLS: a dos scripts e a
+    da planilha (a pasta base do pipeline, ver pipeline.run_pipeline).
+    """
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    return {base_dir, os.path.dirname(os.path.abspath(excel_file_path))}
+
+def main(argv=None):
+    from workbook import EXCEL_FILE_NAME
+    from pipeline import load_stage
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(
+        description="Gera um JDL autocontido com as entidades raiz e tudo de que elas dependem."
+    )
+    parser.add_argument("roots", nargs="+", help="entidades raiz (ex.: Pedido Cliente)")
+    parser.add_argument("--workbook", default=os.path.join(base_dir, EXCEL_FILE_NAME),
+                        help="planilha de configuração (padrão: a da pasta dos scripts)")
+    parser.add_argument("--incoming", action="store_true",
+                        help="inclui também as entidades que referenciam o conjunto")
+    parser.add_argument("--no-app", action="store_true", help="não inclui o bloco application")
+    parser.add_argument("--list", action="store_true", help="só lista as entidades e enums incluídos")
+    parser.add_argument("-o", "--output",
+                        help="arquivo de saída, fora da pasta dos fragmentos (ex.: subsets/pedidos.jdl; "
+                             "padrão: saída padrão)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.workbook):
+        print(f"[ERRO] Arquivo de planilha '{args.workbook}' não encontrado.", file=sys.stderr)
+        return 1
+    output_dir = os.path.dirname(os.path.abspath(args.output)) if args.output else None
+    if output_dir in joined_dirs(args.workbook) and args.output.endswith(".jdl"):
+        print(f"[ERRO] '{args.output}' está na pasta dos fragmentos e entraria no complete.jdl; "
+              f"grave em outra pasta (ex.: subsets/{os.path.basename(args.output)}).", file=sys.stderr)
+        return 1
+
+    model = load_model(args.workbook)
+    if not args.no_app:
+        try:
+            load_stage("APP").populate(model, args.workbook)
+        except ValueError as e:
+            print(f"[AVISO] JDL sem o bloco application: {str(e)}", file=sys.stderr)
+    graph = ModelGraph(model)
+    try:
+        entities = graph.closure(args.roots, incoming=args.incoming)
+    except KeyError as e:
+        print(f"[ERRO] {e.args[0]}", file=sys.stderr)
+        return 1
+
+    if args.list:
+        print("Entidades:", ", ".join(entities))
+        print("Enums:", ", ".join(graph.enums_for(entities)))
+        return 0
+
+    content = render_subset_jdl(model, entities)
+    if args.output:
+        from outputs import write_if_changed
+        os.makedirs(output_dir, exist_ok=True)
+        write_if_changed(args.output, content)
+        print(f"[INFO] {len(entities)} entidade(s) gravada(s) em {args.output}", file=sys.stderr)
+    else:
+        sys.stdout.write(content)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
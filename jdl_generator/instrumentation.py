@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import time
+import threading
+import contextlib
+
+# Etapa em execução na thread atual (com --jobs, cada etapa roda na sua thread)
+_local = threading.local()
+_lock = threading.Lock()
+
+# Relatório da execução em andamento (ver start_run)
+_report = None
+
+def peak_rss_kb():
+    """
+    Pico de memória residente (RSS) do processo até agora, em KB, ou None
+    se a plataforma não informar (ex.: Windows, sem o módulo 'resource').
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS informa em bytes, Linux em KB
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+class StageMetrics:
+    """
+    Métricas de uma etapa: tempo de execução, linhas lidas/ignoradas por aba,
+    bytes gravados por arquivo e o pico de RSS do processo ao final da etapa.
+    """
+    __slots__ = ("stage", "status", "started_at", "seconds", "rows_read",
+                 "rows_skipped", "bytes_written", "peak_rss_kb", "rss_growth_kb", "error")
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.status = "ok"
+        self.started_at = None
+        self.seconds = None
+        self.rows_read = {}
+        self.rows_skipped = {}
+        self.bytes_written = {}
+        self.peak_rss_kb = None
+        self.rss_growth_kb = None
+        self.error = None
+
+    def to_dict(self):
+        return {
+            "stage": self.stage,
+            "status": self.status,
+            "started_at": self.started_at,
+            "seconds": self.seconds,
+            "rows_read": self.rows_read,
+            "rows_skipped": self.rows_skipped,
+            "bytes_written": self.bytes_written,
+            "peak_rss_kb": self.peak_rss_kb,
+            "rss_growth_kb": self.rss_growth_kb,
+            "error": self.error,
+        }
+
+class RunReport:
+    """
+    Relatório de uma execução do pipeline. write() grava JSON (um único
+    documento) ou, se o arquivo terminar em '.ndjson', um registro por linha:
+    um por etapa seguido de um registro "run" com o resumo.
+    """
+
+    def __init__(self, base_dir):
+        self.base_dir = base_dir
+        self.started_at = time.time()
+        self.seconds = None
+        self.status = "running"
+        self.stages = []
+
+    def summary(self):
+        import socket
+        return {
+            "record": "run",
+            "base_dir": self.base_dir,
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "python": sys.version.split()[0],
+            "started_at": self.started_at,
+            "seconds": self.seconds,
+            "status": self.status,
+            "peak_rss_kb": peak_rss_kb(),
+        }
+
+    def to_dict(self):
+        report = self.summary()
+        report["stages"] = [metrics.to_dict() for metrics in self.stages]
+        return report
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            if path.endswith(".ndjson"):
+                for metrics in self.stages:
+                    f.write(json.dumps(dict(record="stage", **metrics.to_dict()), ensure_ascii=False) + "\n")
+                f.write(json.dumps(self.summary(), ensure_ascii=False) + "\n")
+            else:
+                json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+def start_run(base_dir):
+    """
+    Inicia um novo relatório; as etapas executadas dentro de stage() a partir
+    daqui passam a ser registradas nele.
+    """
+    global _report
+    _report = RunReport(base_dir)
+    return _report
+
+def finish_run(status="ok"):
+    """
+    Encerra o relatório atual e o devolve (None se start_run não foi chamado).
+    """
+    global _report
+    report, _report = _report, None
+    if report is not None:
+        report.seconds = round(time.time() - report.started_at, 6)
+        report.status = status
+    return report
+
+def current_stage():
+    """
+    Métricas da etapa em execução na thread atual, ou None fora de uma etapa.
+    """
+    return getattr(_local, "stage", None)
+
+@contextlib.contextmanager
+def stage(name):
+    """
+    Mede a etapa 'name' executada dentro do bloco with. Exceções são
+    registradas (status "error") e propagadas normalmente.
+    """
+    metrics = StageMetrics(name)
+    previous = current_stage()
+    _local.stage = metrics
+    rss_before = peak_rss_kb()
+    metrics.started_at = time.time()
+    start = time.perf_counter()
+    try:
+        yield metrics
+    except BaseException as e:
+        metrics.status = "error"
+        metrics.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        metrics.seconds = round(time.perf_counter() - start, 6)
+        metrics.peak_rss_kb = peak_rss_kb()
+        if rss_before is not None:
+            metrics.rss_growth_kb = metrics.peak_rss_kb - rss_before
+        _local.stage = previous
+        with _lock:
+            if _report is not None:
+                _report.stages.append(metrics)
+
+def stage_failed(message):
+    """
+    Reporta uma falha da etapa atual: mostra "[ERRO] <message>" e, dentro do
+    pipeline, marca a etapa com status "error", para que ela seja tratada
+    como falha (ver pipeline.run_stage) em vez de concluída.
+    """
+    print(f"[ERRO] {message}")
+    metrics = current_stage()
+    if metrics is not None:
+        metrics.status = "error"
+        metrics.error = message
+
+def rows_read(sheet, count):
+    """
+    Soma 'count' linhas lidas da aba 'sheet' à etapa atual.
+    """
+    metrics = current_stage()
+    if metrics is not None and count:
+        metrics.rows_read[sheet] = metrics.rows_read.get(sheet, 0) + count
+
+def rows_skipped(sheet, count=1):
+    """
+    Soma 'count' linhas da aba 'sheet' que a etapa atual descartou
+    (ex.: sem entidade ou sem nome de campo).
+    """
+    metrics = current_stage()
+    if metrics is not None and count:
+        metrics.rows_skipped[sheet] = metrics.rows_skipped.get(sheet, 0) + count
+
+def bytes_written(path):
+    """
+    Registra o tamanho do arquivo 'path' recém-gravado pela etapa atual.
+    """
+    metrics = current_stage()
+    if metrics is not None and os.path.exists(path):
+        metrics.bytes_written[os.path.basename(path)] = os.path.getsize(path)
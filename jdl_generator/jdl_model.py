@@ -0,0 +1,427 @@
+"""
+Modelo em memória do JDL (entidades, campos, enums, relacionamentos e opções)
+e o serializador único que gera o texto JDL a partir dele.
+
+As etapas ENTIDADES, CAMPOS, ENUMS, RELACIONAMENTOS e OPTIONS preenchem um
+JdlModel compartilhado; nenhuma delas precisa reler/alterar via regex o
+arquivo gerado pela etapa anterior.
+"""
+
+class Validation:
+    """
+    Uma validação de campo JDL, ex.: required, minlength(2), pattern(/^[A-Z]/).
+    'value' é None para validações sem argumento (required, unique).
+    """
+    __slots__ = ("name", "value")
+
+    def __init__(self, name, value=None):
+        self.name = name
+        self.value = value
+
+    def __repr__(self):
+        return f"Validation({self.name!r}, {self.value!r})"
+
+class Field:
+    __slots__ = ("name", "type", "validations", "annotation", "comment", "example")
+
+    def __init__(self, name, type, validations=None, annotation="", comment="", example=""):
+        self.name = name
+        self.type = type
+        self.validations = validations if validations is not None else []
+        self.annotation = annotation
+        self.comment = comment
+        self.example = example
+
+    def __repr__(self):
+        return f"Field({self.name!r}, {self.type!r})"
+
+class Entity:
+    __slots__ = ("name", "alias", "fields")
+
+    def __init__(self, name, alias, fields=None):
+        self.name = name
+        self.alias = alias
+        self.fields = fields if fields is not None else []
+
+    def __repr__(self):
+        return f"Entity({self.name!r}, {self.alias!r})"
+
+class EnumItem:
+    __slots__ = ("key", "value", "comment", "obs")
+
+    def __init__(self, key, value="", comment="", obs=""):
+        self.key = key
+        self.value = value
+        self.comment = comment
+        self.obs = obs
+
+    def __repr__(self):
+        return f"EnumItem({self.key!r}, {self.value!r})"
+
+class Enum:
+    __slots__ = ("name", "items")
+
+    def __init__(self, name, items=None):
+        self.name = name
+        self.items = items if items is not None else []
+
+    def __repr__(self):
+        return f"Enum({self.name!r})"
+
+class Relationship:
+    """
+    Um relacionamento JDL. 'rel_type' já está no formato do JDL (ex.: OneToMany).
+    'required_from'/'required_to' marcam o campo injetado de cada lado como
+    required; 'built_in_entity' gera "with builtInEntity" (ex.: para User).
+    """
+    __slots__ = ("rel_type", "entity_from", "field_from", "entity_to", "field_to",
+                 "required_from", "required_to", "built_in_entity")
+
+    def __init__(self, rel_type, entity_from, field_from, entity_to, field_to,
+                 required_from=False, required_to=False, built_in_entity=False):
+        self.rel_type = rel_type
+        self.entity_from = entity_from
+        self.field_from = field_from
+        self.entity_to = entity_to
+        self.field_to = field_to
+        self.required_from = required_from
+        self.required_to = required_to
+        self.built_in_entity = built_in_entity
+
+    def __repr__(self):
+        return f"Relationship({self.rel_type!r}, {self.entity_from!r}, {self.entity_to!r})"
+
+class Option:
+    """
+    Uma opção JDL aplicada a uma entidade, ex.: dto Foo with mapstruct.
+    """
+    __slots__ = ("option_type", "entity", "value")
+
+    def __init__(self, option_type, entity, value=""):
+        self.option_type = option_type
+        self.entity = entity
+        self.value = value
+
+    def __repr__(self):
+        return f"Option({self.option_type!r}, {self.entity!r}, {self.value!r})"
+
+class JdlModel:
+    """
+    Modelo completo. Entidades e enums ficam em dicts indexados pelo nome,
+    preservando a ordem em que aparecem na planilha.
+    """
+    __slots__ = ("entities", "enums", "relationships", "options", "application")
+
+    def __init__(self):
+        self.entities = {}
+        self.enums = {}
+        self.relationships = []
+        self.options = []
+        # Parâmetros do bloco application (aba APP, ver APP.populate), ou
+        # None se a aba não foi lida
+        self.application = None
+
+    def add_entity(self, name, alias):
+        # Entidades repetidas na planilha são consideradas uma só
+        entity = self.entities.get(name)
+        if entity is None:
+            entity = Entity(name, alias)
+            self.entities[name] = entity
+        return entity
+
+    def add_field(self, entity_name, field):
+        """
+        Adiciona o campo à entidade. Campos de entidades que não existem no
+        modelo são ignorados (retorna False), como no fluxo baseado em arquivo.
+        """
+        entity = self.entities.get(entity_name)
+        if entity is None:
+            return False
+        entity.fields.append(field)
+        return True
+
+    def add_enum_item(self, enum_name, item):
+        enum = self.enums.get(enum_name)
+        if enum is None:
+            enum = Enum(enum_name)
+            self.enums[enum_name] = enum
+        enum.items.append(item)
+        return enum
+
+def subset_model(model, entity_names):
+    """
+    Novo JdlModel só com as entidades de 'entity_names' (na ordem do modelo),
+    os enums usados como tipo pelos seus campos, os relacionamentos entre elas
+    ou com entidades de fora do modelo (ex.: User do JHipster, com
+    builtInEntity) e as opções dessas entidades. Os objetos são compartilhados
+    com 'model', não copiados.
+    """
+    names = set(entity_names)
+    # Pontas aceitas: entidades do conjunto ou que o modelo não declara
+    allowed = lambda name: name in names or name not in model.entities
+    subset = JdlModel()
+    for name, entity in model.entities.items():
+        if name in names:
+            subset.entities[name] = entity
+
+    used_types = {f.type for e in subset.entities.values() for f in e.fields}
+    for name, enum in model.enums.items():
+        if name in used_types:
+            subset.enums[name] = enum
+
+    subset.relationships = [
+        rel for rel in model.relationships
+        if (rel.entity_from in names or rel.entity_to in names)
+        and allowed(rel.entity_from) and allowed(rel.entity_to)
+    ]
+    subset.options = [opt for opt in model.options if opt.entity in names]
+    subset.application = model.application
+    return subset
+
+# ---------------------------------------------------------------------------
+# Conversão para dict (JSON), usada para guardar o modelo entre builds
+# ---------------------------------------------------------------------------
+
+def entity_to_dict(entity):
+    return {
+        "name": entity.name,
+        "alias": entity.alias,
+        "fields": [
+            {
+                "name": f.name,
+                "type": f.type,
+                "validations": [[v.name, v.value] for v in f.validations],
+                "annotation": f.annotation,
+                "comment": f.comment,
+                "example": f.example,
+            }
+            for f in entity.fields
+        ],
+    }
+
+def enum_to_dict(enum):
+    return {
+        "name": enum.name,
+        "items": [
+            {"key": it.key, "value": it.value, "comment": it.comment, "obs": it.obs}
+            for it in enum.items
+        ],
+    }
+
+def relationship_to_dict(rel):
+    return {
+        "rel_type": rel.rel_type,
+        "entity_from": rel.entity_from,
+        "field_from": rel.field_from,
+        "entity_to": rel.entity_to,
+        "field_to": rel.field_to,
+        "required_from": rel.required_from,
+        "required_to": rel.required_to,
+        "built_in_entity": rel.built_in_entity,
+    }
+
+def option_to_dict(option):
+    return {"option_type": option.option_type, "entity": option.entity, "value": option.value}
+
+def model_to_dict(model):
+    return {
+        "entities": [entity_to_dict(e) for e in model.entities.values()],
+        "enums": [enum_to_dict(e) for e in model.enums.values()],
+        "relationships": [relationship_to_dict(r) for r in model.relationships],
+        "options": [option_to_dict(o) for o in model.options],
+    }
+
+def model_from_dict(data):
+    """
+    Inverso de model_to_dict().
+    """
+    model = JdlModel()
+    for e in data.get("entities", []):
+        entity = model.add_entity(e["name"], e["alias"])
+        for f in e["fields"]:
+            validations = [Validation(name, value) for name, value in f["validations"]]
+            entity.fields.append(Field(f["name"], f["type"], validations,
+                                       annotation=f["annotation"], comment=f["comment"],
+                                       example=f["example"]))
+    for e in data.get("enums", []):
+        for it in e["items"]:
+            model.add_enum_item(e["name"], EnumItem(it["key"], it["value"], it["comment"], it["obs"]))
+    model.relationships = [Relationship(**r) for r in data.get("relationships", [])]
+    model.options = [Option(**o) for o in data.get("options", [])]
+    return model
+
+# ---------------------------------------------------------------------------
+# Serializador JDL
+# ---------------------------------------------------------------------------
+
+ENTITIES_HEADER = (
+    "// ENTIDADES.jdl\n"
+    "// Gerado automaticamente. Este arquivo contém apenas as entidades básicas.\n"
+    "// Os campos e validações serão posteriormente adicionados via CAMPOS.py.\n\n"
+)
+
+def render_validation(validation):
+    if validation.value is None:
+        return validation.name
+    return f"{validation.name}({validation.value})"
+
+def render_field(field):
+    """
+    Gera o Javadoc (se houver) e a linha do campo, ex.:
+        name String required minlength(2) maxlength(40)
+    """
+    field_line = f"{field.name} {field.type}"
+    if field.validations:
+        field_line += " " + " ".join(render_validation(v) for v in field.validations)
+
+    comment_lines = []
+    if field.annotation:
+        comment_lines.append(f"Annotations: {field.annotation}")
+    if field.comment:
+        comment_lines.append(f"Comment: {field.comment}")
+    if field.example:
+        comment_lines.append(f"Example: {field.example}")
+
+    if not comment_lines:
+        return f"  {field_line}"
+
+    lines = ["  /**"]
+    for c_line in comment_lines:
+        lines.append("   * " + c_line.replace('"', '\\"'))
+    lines.append("   */")
+    lines.append(f"  {field_line}")
+    return "\n".join(lines)
+
+def render_entity(entity):
+    first_line = f"entity {entity.name} ({entity.alias})" + "{"
+    if not entity.fields:
+        return first_line + "\n}"
+    fields_str = "\n".join(render_field(f) for f in entity.fields)
+    return f"{first_line}\n{fields_str}\n}}"
+
+def render_enum(enum):
+    """
+    Constrói o bloco textual do enum no estilo JDL, sem vírgulas, e com comentários JavaDoc.
+    Exemplo:
+
+        enum Country {
+          /**
+           * Comentário e observações
+           */
+          BELGIUM ("Belgium")
+        }
+    """
+    lines = [f"enum {enum.name} {{"]
+    for it in enum.items:
+        if it.comment or it.obs:
+            lines.append("  /**")
+            if it.comment:
+                lines.append(f"   * {it.comment}")
+            if it.obs:
+                lines.append(f"   * {it.obs}")
+            lines.append("   */")
+        if it.value:
+            lines.append(f"  {it.key} (\"{it.value}\")")
+        else:
+            lines.append(f"  {it.key}")
+    lines.append("}")
+    return "\n".join(lines)
+
+def iter_render_entities(model):
+    """
+    Gera, pedaço a pedaço, o conteúdo do arquivo ENTIDADES.jdl: cabeçalho,
+    uma entidade (com campos) por vez e depois os enums.
+    """
+    yield ENTITIES_HEADER
+    for entity in model.entities.values():
+        yield render_entity(entity) + "\n\n"
+    for enum in model.enums.values():
+        yield "\n\n" + render_enum(enum)
+
+def render_entities(model):
+    """
+    Conteúdo do arquivo ENTIDADES.jdl: cabeçalho, entidades (com campos) e enums.
+    """
+    return "".join(iter_render_entities(model))
+
+def _relationship_side(entity, field, required):
+    # Sem campo injetado, o lado é só o nome da entidade (ex.: "to Owner");
+    # 'required' só existe dentro das chaves do campo (VALIDACAO avisa)
+    if not field:
+        return entity
+    return f"{entity}{{{field} required}}" if required else f"{entity}{{{field}}}"
+
+def render_relationship(rel):
+    """
+    Linha do relacionamento dentro do bloco do seu tipo, ex.:
+        Car{owner(name) required} to Owner{car}
+        Order{user(login)} to User with builtInEntity
+    """
+    line = (f"{_relationship_side(rel.entity_from, rel.field_from, rel.required_from)} to "
+            f"{_relationship_side(rel.entity_to, rel.field_to, rel.required_to)}")
+    if rel.built_in_entity:
+        line += " with builtInEntity"
+    return line
+
+def iter_render_relationships(model):
+    """
+    Gera, pedaço a pedaço, um bloco "relationship Tipo { ... }" por tipo de
+    relacionamento (na ordem em que cada tipo aparece pela primeira vez), com
+    todas as linhas daquele tipo. Linear no número de relacionamentos.
+    """
+    groups = {}
+    for rel in model.relationships:
+        groups.setdefault(rel.rel_type, []).append(rel)
+    for rel_type, rels in groups.items():
+        yield f"relationship {rel_type} {{\n"
+        for rel in rels:
+            yield f"    {render_relationship(rel)}\n"
+        yield "}\n\n"
+
+def render_relationships(model):
+    return "".join(iter_render_relationships(model))
+
+def render_option(option):
+    if option.value:
+        return f"{option.option_type} {option.entity} with {option.value}\n"
+    return f"{option.option_type} {option.entity}\n"
+
+def iter_render_options(model):
+    """
+    Gera uma linha por (tipo de opção, valor), com todas as entidades que a
+    usam, na ordem em que cada par aparece pela primeira vez:
+      - "dto * with mapstruct except A, B" quando a opção vale para a maior
+        parte das entidades do modelo (lista de exceções menor que a de
+        entidades);
+      - "paginate A, B, C with pagination" caso contrário.
+    Entidades que não existem no modelo nunca entram no '*' e são listadas
+    explicitamente. Linhas repetidas na planilha aparecem uma única vez.
+
+    Cada grupo custa O(entidades do grupo): as entidades do modelo só são
+    percorridas para listar as exceções do '*', e nesse caso o modelo tem
+    menos que o dobro das entidades do grupo.
+    """
+    groups = {}
+    for opt in model.options:
+        groups.setdefault((opt.option_type, opt.value), {})[opt.entity] = None
+
+    total = len(model.entities)
+    for (option_type, value), entities in groups.items():
+        suffix = f" with {value}" if value else ""
+        known = sum(1 for name in entities if name in model.entities)
+
+        if known and total - known < known:
+            line = f"{option_type} *{suffix}"
+            excluded = [name for name in model.entities if name not in entities]
+            if excluded:
+                line += " except " + ", ".join(excluded)
+            yield line + "\n"
+            listed = [name for name in entities if name not in model.entities]
+        else:
+            listed = list(entities)
+
+        if listed:
+            yield f"{option_type} {', '.join(listed)}{suffix}\n"
+
+def render_options(model):
+    return "".join(iter_render_options(model))
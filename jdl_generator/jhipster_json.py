@@ -0,0 +1,247 @@
+"""
+Backend opcional que grava os descritores .jhipster/<Entidade>.json do
+JHipster direto a partir do modelo (campos, validações, enums,
+relacionamentos e opções), sem precisar que o import-jdl reinterprete o
+complete_fixed.jdl.
+
+Uso:
+    python jhipster_json.py [--output-dir PASTA] [--jobs N]
+ou, no pipeline, main.py --jhipster-json.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from outputs import write_if_changed
+
+JHIPSTER_DIR_NAME = ".jhipster"
+
+# Tipos JDL de blob -> (fieldType, fieldTypeBlobContent) no JSON
+BLOB_TYPES = {
+    "Blob": ("byte[]", "any"),
+    "AnyBlob": ("byte[]", "any"),
+    "ImageBlob": ("byte[]", "image"),
+    "TextBlob": ("byte[]", "text"),
+}
+
+RELATIONSHIP_TYPES = {
+    "OneToMany": "one-to-many",
+    "ManyToOne": "many-to-one",
+    "ManyToMany": "many-to-many",
+    "OneToOne": "one-to-one",
+}
+
+# Tipo visto do outro lado de um relacionamento bidirecional
+INVERSE_TYPES = {
+    "one-to-many": "many-to-one",
+    "many-to-one": "one-to-many",
+    "many-to-many": "many-to-many",
+    "one-to-one": "one-to-one",
+}
+
+# Opção JDL -> chave do JSON. Opções sem valor viram true.
+OPTION_KEYS = {
+    "dto": "dto",
+    "service": "service",
+    "paginate": "pagination",
+    "search": "searchEngine",
+    "microservice": "microserviceName",
+    "clientRootFolder": "clientRootFolder",
+    "angularSuffix": "angularJSSuffix",
+    "filter": "jpaMetamodelFiltering",
+    "readOnly": "readOnly",
+    "skipClient": "skipClient",
+    "skipServer": "skipServer",
+    "embedded": "embedded",
+}
+
+CHANGELOG_DATE_FORMAT = "%Y%m%d%H%M%S"
+
+def lower_first(name):
+    return name[:1].lower() + name[1:]
+
+def split_injected_field(field):
+    """
+    'owner(name)' -> ('owner', 'name'); 'owner' -> ('owner', None).
+    """
+    if "(" in field and field.endswith(")"):
+        name, display = field[:-1].split("(", 1)
+        return name.strip(), display.strip() or None
+    return field.strip(), None
+
+def field_javadoc(field):
+    lines = []
+    if field.annotation:
+        lines.append(f"Annotations: {field.annotation}")
+    if field.comment:
+        lines.append(f"Comment: {field.comment}")
+    if field.example:
+        lines.append(f"Example: {field.example}")
+    return "\n".join(lines)
+
+def field_descriptor(field, enums):
+    descriptor = {"fieldName": field.name, "fieldType": field.type}
+    if field.type in BLOB_TYPES:
+        descriptor["fieldType"], descriptor["fieldTypeBlobContent"] = BLOB_TYPES[field.type]
+
+    enum = enums.get(field.type)
+    if enum is not None:
+        descriptor["fieldValues"] = ",".join(
+            f"{it.key} ({it.value})" if it.value else it.key for it in enum.items
+        )
+        docs = {it.key: "\n".join(filter(None, (it.comment, it.obs))) for it in enum.items}
+        docs = {key: doc for key, doc in docs.items() if doc}
+        if docs:
+            descriptor["fieldValuesJavadoc"] = docs
+
+    if field.validations:
+        descriptor["fieldValidateRules"] = [v.name for v in field.validations]
+    for validation in field.validations:
+        if validation.value is not None:
+            value = validation.value
+            if validation.name == "pattern" and len(value) >= 2 and value[0] == value[-1] == "/":
+                # Só os delimitadores do JDL; barras da própria regex (ex.: ^a/$) ficam
+                value = value[1:-1]
+            descriptor[f"fieldValidateRules{validation.name.capitalize()}"] = value
+
+    javadoc = field_javadoc(field)
+    if javadoc:
+        descriptor["javadoc"] = javadoc
+    return descriptor
+
+def relationship_descriptors(model):
+    """
+    { entidade: [descritores de relacionamento] } para as duas pontas de cada
+    relacionamento. O lado 'to' só recebe um descritor quando o relacionamento
+    é bidirecional (tem campo injetado no lado 'to').
+    """
+    descriptors = {name: [] for name in model.entities}
+    for rel in model.relationships:
+        rel_type = RELATIONSHIP_TYPES.get(rel.rel_type, rel.rel_type)
+        from_name, from_display = split_injected_field(rel.field_from or lower_first(rel.entity_to))
+        to_name, to_display = split_injected_field(rel.field_to) if rel.field_to else (None, None)
+
+        if rel.entity_from in descriptors:
+            descriptor = {
+                "relationshipName": from_name,
+                "otherEntityName": lower_first(rel.entity_to),
+                "relationshipType": rel_type,
+                "relationshipSide": "left",
+            }
+            if from_display:
+                descriptor["otherEntityField"] = from_display
+            if to_name:
+                descriptor["otherEntityRelationshipName"] = to_name
+            if rel.required_from:
+                descriptor["relationshipValidateRules"] = "required"
+            if rel.built_in_entity:
+                descriptor["relationshipWithBuiltInEntity"] = True
+            descriptors[rel.entity_from].append(descriptor)
+
+        if to_name and rel.entity_to in descriptors:
+            descriptor = {
+                "relationshipName": to_name,
+                "otherEntityName": lower_first(rel.entity_from),
+                "relationshipType": INVERSE_TYPES.get(rel_type, rel_type),
+                "relationshipSide": "right",
+                "otherEntityRelationshipName": from_name,
+            }
+            if to_display:
+                descriptor["otherEntityField"] = to_display
+            if rel.required_to:
+                descriptor["relationshipValidateRules"] = "required"
+            descriptors[rel.entity_to].append(descriptor)
+    return descriptors
+
+def option_values(model):
+    """
+    { entidade: { chave_json: valor } } a partir das opções do modelo.
+    """
+    values = {name: {} for name in model.entities}
+    for opt in model.options:
+        if opt.entity not in values:
+            continue
+        key = OPTION_KEYS.get(opt.option_type, opt.option_type)
+        values[opt.entity][key] = opt.value if opt.value else True
+    return values
+
+def read_changelog_date(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("changelogDate")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def entity_descriptor(entity, model, relationships, options, changelog_date):
+    descriptor = {
+        "changelogDate": changelog_date,
+        "fields": [field_descriptor(f, model.enums) for f in entity.fields],
+        "name": entity.name,
+        "relationships": relationships,
+    }
+    if entity.alias and entity.alias.lower() != "nan":
+        descriptor["entityTableName"] = entity.alias
+    descriptor.update(options)
+    return descriptor
+
+def write_entity_descriptors(model, output_dir, jobs=None):
+    """
+    Grava um <Entidade>.json por entidade em 'output_dir', em paralelo, cada
+    um só se o conteúdo mudou. O changelogDate de arquivos já existentes é
+    mantido (o JHipster o usa para nomear os changelogs do Liquibase);
+    entidades novas recebem datas sequenciais a partir de agora.
+    Retorna o número de arquivos (re)escritos.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    relationships = relationship_descriptors(model)
+    options = option_values(model)
+
+    paths = {name: os.path.join(output_dir, f"{name}.json") for name in model.entities}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        dates = dict(zip(paths, executor.map(read_changelog_date, paths.values())))
+
+    next_date = time.time()
+    for name in model.entities:
+        if not dates[name]:
+            dates[name] = time.strftime(CHANGELOG_DATE_FORMAT, time.gmtime(next_date))
+            next_date += 1
+
+    def write(name):
+        descriptor = entity_descriptor(model.entities[name], model, relationships[name],
+                                       options[name], dates[name])
+        return write_if_changed(paths[name], json.dumps(descriptor, indent=2, ensure_ascii=False) + "\n")
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        written = sum(executor.map(write, model.entities))
+
+    stale = [f for f in os.listdir(output_dir)
+             if f.endswith(".json") and f[:-len(".json")] not in model.entities]
+    if stale:
+        print(f"[AVISO] Descritores sem entidade correspondente no modelo: {', '.join(sorted(stale))}")
+    print(f"[INFO] {len(paths)} descritor(es) em {output_dir}, {written} atualizado(s).")
+    return written
+
+def main(argv=None):
+    from workbook import EXCEL_FILE_NAME
+    from graph import load_model
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Grava os descritores .jhipster/*.json a partir da planilha.")
+    parser.add_argument("--workbook", default=os.path.join(base_dir, EXCEL_FILE_NAME),
+                        help="planilha de configuração (padrão: a da pasta dos scripts)")
+    parser.add_argument("--output-dir", help="pasta de saída (padrão: .jhipster ao lado da planilha)")
+    parser.add_argument("--jobs", "-j", type=int, default=None, metavar="N",
+                        help="arquivos gravados em paralelo (padrão: automático)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.workbook):
+        print(f"[ERRO] Arquivo de planilha '{args.workbook}' não encontrado.", file=sys.stderr)
+        return 1
+    output_dir = args.output_dir or os.path.join(os.path.dirname(os.path.abspath(args.workbook)), JHIPSTER_DIR_NAME)
+    write_entity_descriptors(load_model(args.workbook), output_dir, args.jobs)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+import os
+import threading
+import contextlib
+from build_cache import file_digest
+
+def _temp_path(path):
+    # Na mesma pasta do destino, para que os.replace seja uma troca atômica
+    directory, name = os.path.split(os.path.abspath(path))
+    return os.path.join(directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+def _same_content(path_a, path_b):
+    try:
+        if os.path.getsize(path_a) != os.path.getsize(path_b):
+            return False
+    except OSError:
+        return False
+    return file_digest(path_a) == file_digest(path_b)
+
+def replace_if_changed(tmp_path, path):
+    """
+    Move 'tmp_path' para 'path' (os.replace, atômico) se o conteúdo for
+    diferente do arquivo atual; caso contrário, apaga 'tmp_path' e mantém o
+    arquivo existente intacto, com o mesmo mtime. Retorna True se 'path'
+    foi substituído.
+    """
+    if _same_content(tmp_path, path):
+        os.remove(tmp_path)
+        return False
+    os.replace(tmp_path, path)
+    return True
+
+@contextlib.contextmanager
+def atomic_output(path, mode="w", **open_kwargs):
+    """
+    Abre um arquivo temporário ao lado de 'path' para escrita; ao final do
+    bloco with, ele só substitui 'path' se o conteúdo mudou (ver
+    replace_if_changed). Se o bloco falhar, o temporário é apagado e 'path'
+    não é alterado. Quem lê o arquivo nunca vê uma versão pela metade.
+    """
+    tmp_path = _temp_path(path)
+    try:
+        with open(tmp_path, mode, **open_kwargs) as f:
+            yield f
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    replace_if_changed(tmp_path, path)
+
+def write_if_changed(path, content, encoding="utf-8"):
+    """
+    Grava o texto 'content' em 'path' apenas se ele for diferente do conteúdo
+    atual do arquivo. Retorna True se o arquivo foi (re)escrito.
+    """
+    tmp_path = _temp_path(path)
+    try:
+        with open(tmp_path, "w", encoding=encoding) as f:
+            f.write(content)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+    return replace_if_changed(tmp_path, path)
@@ -0,0 +1,544 @@
+import os
+import re
+import sys
+import argparse
+import functools
+import threading
+import contextlib
+import importlib
+import traceback
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Ordem de execução das etapas. Cada etapa é um módulo desta pasta que
+# expõe uma função main() sem argumentos obrigatórios.
+STAGES = [
+    "VALIDACAO",
+    "APP",
+    "ENTIDADES",
+    "CAMPOS",
+    "ENUMS",
+    "RELACIONAMENTOS",
+    "OPTIONS",
+    "JOIN_JDLS",
+    "FIX_COMPLETE_JDL",
+]
+
+# Etapas que preenchem o JdlModel compartilhado (recebem main(model=...))
+MODEL_STAGES = {"ENTIDADES", "CAMPOS", "ENUMS", "RELACIONAMENTOS", "OPTIONS"}
+
+# Entradas e saídas de cada etapa, usadas pelo build incremental:
+#   - sheets:  abas da planilha lidas pela etapa
+#   - deps:    etapas que precisam rodar antes (para etapas do modelo, a
+#              etapa depende também do que as anteriores colocaram no modelo)
+#   - outputs: arquivos gerados (relativos à pasta base)
+STAGE_INFO = {
+    "VALIDACAO":        {"sheets": ["ENTIDADES", "CAMPOS", "ENUMS", "RELACIONAMENTOS", "OPTIONS"],
+                         "deps": [], "outputs": ["VALIDACAO.json"]},
+    "APP":              {"sheets": ["APP"],             "deps": [],            "outputs": ["APP.jdl"]},
+    "ENTIDADES":        {"sheets": ["ENTIDADES"],       "deps": [],            "outputs": ["ENTIDADES.jdl"]},
+    "CAMPOS":           {"sheets": ["CAMPOS"],          "deps": ["ENTIDADES"], "outputs": ["ENTIDADES.jdl"]},
+    "ENUMS":            {"sheets": ["ENUMS"],           "deps": ["CAMPOS"],    "outputs": ["ENTIDADES.jdl"]},
+    "RELACIONAMENTOS":  {"sheets": ["RELACIONAMENTOS"], "deps": [],            "outputs": ["RELACIONAMENTOS.jdl"]},
+    "OPTIONS":          {"sheets": ["OPTIONS"],         "deps": ["ENTIDADES"], "outputs": ["OPTIONS.jdl"]},
+    "JOIN_JDLS":        {"sheets": [], "deps": ["APP", "ENUMS", "RELACIONAMENTOS", "OPTIONS"], "outputs": ["complete.jdl"]},
+    "FIX_COMPLETE_JDL": {"sheets": [], "deps": ["JOIN_JDLS"], "outputs": ["complete_fixed.jdl"]},
+}
+
+# "import x", "import x, y" e "from x import ...", inclusive os feitos dentro
+# de funções (workbook importa sources, workbook_cache, ... sob demanda)
+_IMPORT = re.compile(r"^[ \t]*(?:from[ \t]+(\w+)[ \t]+import\b|import[ \t]+(\w+(?:[ \t]*,[ \t]*\w+)*))", re.MULTILINE)
+
+class StageError(RuntimeError):
+    """
+    Etapa que reportou uma falha (ver instrumentation.stage_failed) em vez de
+    levantar uma exceção; interrompe o pipeline como uma exceção da etapa.
+    """
+
+def load_stage(name):
+    """
+    Importa o módulo da etapa (ex.: 'CAMPOS' -> CAMPOS.py) no processo atual.
+    Os módulos ficam em cache em sys.modules, então pandas/openpyxl são
+    importados uma única vez para toda a execução.
+    """
+    if BASE_DIR not in sys.path:
+        sys.path.insert(0, BASE_DIR)
+    return importlib.import_module(name)
+
+def run_stage(name, model=None, base_dir=None, write_outputs=True, **options):
+    """
+    Executa a função main() de uma etapa. As etapas de MODEL_STAGES recebem o
+    JdlModel compartilhado da execução; 'base_dir' é a pasta da planilha e dos
+    arquivos gerados (padrão: a pasta dos scripts). Em caso de falha, reporta o erro
+    com o nome do script e propaga a exceção, interrompendo o pipeline
+    (mesmo comportamento do subprocess.run(..., check=True) anterior).
+
+    Com write_outputs=False, uma etapa do modelo apenas preenche o modelo
+    (populate), sem gravar o arquivo que uma etapa seguinte vai regravar.
+    'options' são repassadas ao main() da etapa (ex.: strict=True para VALIDACAO).
+
+    Uma etapa que reporta a falha com instrumentation.stage_failed (e retorna
+    normalmente) gera StageError.
+    """
+    import instrumentation
+    from workbook import workbook_path
+
+    script_path = os.path.join(BASE_DIR, f"{name}.py")
+    print(f"Running {script_path} ...")
+    try:
+        module = load_stage(name)
+        excel_file_path = workbook_path(base_dir or BASE_DIR)
+        if name in MODEL_STAGES and not write_outputs and os.path.exists(excel_file_path):
+            module.populate(model, excel_file_path)
+        elif name in MODEL_STAGES:
+            module.main(model=model, base_dir=base_dir)
+        else:
+            module.main(base_dir=base_dir, **options)
+    except Exception as e:
+        print(f"[ERRO] Falha ao executar '{name}.py': {str(e)}")
+        traceback.print_exc()
+        raise
+    metrics = instrumentation.current_stage()
+    if metrics is not None and metrics.error:
+        raise StageError(f"'{name}.py': {metrics.error}")
+    print(f"Finished {script_path}\n")
+
+def superseded_by(name, names):
+    """
+    Etapa de 'names' que depende (direta ou indiretamente) de 'name' e regrava
+    as mesmas saídas, ou None. Ex.: ENTIDADES.jdl é gravado por ENTIDADES,
+    CAMPOS e ENUMS; quando ENUMS roda, as versões intermediárias são
+    dispensáveis.
+    """
+    outputs = set(STAGE_INFO[name]["outputs"])
+    for other in names:
+        if other == name or other not in MODEL_STAGES:
+            continue
+        if not outputs & set(STAGE_INFO[other]["outputs"]):
+            continue
+        deps = list(STAGE_INFO[other]["deps"])
+        while deps:
+            dep = deps.pop()
+            if dep == name:
+                return other
+            deps.extend(STAGE_INFO[dep]["deps"])
+    return None
+
+def stage_inputs(name, base_dir=BASE_DIR):
+    """
+    Arquivos lidos pela etapa (além da planilha). JOIN_JDLS lê todos os
+    fragmentos .jdl da pasta; FIX_COMPLETE_JDL lê complete.jdl.
+    """
+    if name == "JOIN_JDLS":
+        return load_stage("JOIN_JDLS").list_jdl_files(base_dir)
+    if name == "FIX_COMPLETE_JDL":
+        return ["complete.jdl"]
+    return []
+
+@functools.lru_cache(maxsize=None)
+def local_imports(module_name):
+    """
+    Módulos desta pasta importados por 'module_name' (ex.: 'CAMPOS' ->
+    ('instrumentation', 'outputs', 'workbook', 'jdl_model', 'ENTIDADES')).
+    """
+    try:
+        with open(os.path.join(BASE_DIR, f"{module_name}.py"), "r", encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return ()
+    names = []
+    for from_name, import_names in _IMPORT.findall(text):
+        for name in [from_name] if from_name else import_names.split(","):
+            name = name.strip()
+            if name not in names and name != module_name and os.path.exists(os.path.join(BASE_DIR, f"{name}.py")):
+                names.append(name)
+    return tuple(names)
+
+def stage_code_files(name):
+    """
+    Arquivos .py dos quais a saída da etapa depende: o módulo da etapa e,
+    transitivamente, os módulos desta pasta que ele importa (leitura das
+    abas, fontes em pasta, cache das abas, modelo, gravação, ...). Alterar
+    qualquer um deles invalida o cache da etapa.
+    """
+    modules = [name]
+    pending = [name]
+    while pending:
+        for dep in local_imports(pending.pop()):
+            if dep not in modules:
+                modules.append(dep)
+                pending.append(dep)
+    return [f"{module}.py" for module in modules]
+
+def stage_fingerprint(name, excel_file_path, fingerprints, base_dir=BASE_DIR):
+    """
+    Impressão digital de tudo o que influencia a saída da etapa: o código,
+    o conteúdo das abas que ela lê, os arquivos de entrada e, para as etapas
+    do modelo, as impressões digitais das etapas das quais ela depende.
+    """
+    from build_cache import file_digest, combine_digests
+    from workbook import sheet_digest
+
+    info = STAGE_INFO[name]
+    parts = [name]
+    for code_file in stage_code_files(name):
+        parts.append(file_digest(os.path.join(BASE_DIR, code_file)))
+    for sheet in info["sheets"]:
+        parts.append(sheet_digest(excel_file_path, sheet))
+    if name in MODEL_STAGES:
+        for dep in info["deps"]:
+            parts.append(fingerprints.get(dep))
+    for input_file in stage_inputs(name, base_dir):
+        parts.append(input_file)
+        parts.append(file_digest(os.path.join(base_dir, input_file)))
+    return combine_digests(*parts)
+
+# Abas que podem ser lidas em modo streaming com --streaming: o ganho é não
+# materializar o DataFrame da aba. Os Field montados ficam todos no JdlModel,
+# que ENUMS, OPTIONS, VALIDACAO e as saídas de --changes/--jhipster-json usam inteiro.
+STREAMING_SHEETS = ["CAMPOS"]
+
+def parse_stages(value):
+    """
+    'JOIN_JDLS,FIX_COMPLETE_JDL' -> lista de etapas na ordem de STAGES.
+    """
+    names = [name.strip().upper() for name in value.split(",") if name.strip()]
+    unknown = [name for name in names if name not in STAGES]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(
+            f"etapa(s) desconhecida(s): {', '.join(unknown) or value} (opções: {', '.join(STAGES)})")
+    return [name for name in STAGES if name in names]
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Gera o JDL completo a partir da planilha de configuração.")
+    parser.add_argument(
+        "--source", metavar="CAMINHO",
+        help="planilha .xlsx ou pasta com um arquivo por aba (APP.csv, CAMPOS.parquet, "
+             "ENUMS.jsonl, ...) no lugar de TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx"
+    )
+    parser.add_argument(
+        "--stages", type=parse_stages, metavar="ETAPA[,ETAPA...]",
+        help="executa só as etapas informadas (ex.: JOIN_JDLS,FIX_COMPLETE_JDL para "
+             "remontar o complete_fixed.jdl a partir dos fragmentos, sem ler a planilha)"
+    )
+    parser.add_argument(
+        "--streaming", action="store_true",
+        help="lê a aba CAMPOS linha a linha (openpyxl read_only), sem materializar o DataFrame "
+             "da aba; todos os campos continuam no modelo em memória"
+    )
+    parser.add_argument(
+        "--jobs", "-j", type=int, default=1, metavar="N",
+        help="executa até N etapas independentes ao mesmo tempo (padrão: 1, sequencial)"
+    )
+    parser.add_argument(
+        "--full", action="store_true",
+        help="ignora o cache do build incremental e executa todas as etapas"
+    )
+    parser.add_argument(
+        "--clean", action="store_true",
+        help="apaga os arquivos .jdl e o cache antes de gerar tudo novamente"
+    )
+    parser.add_argument(
+        "--report", metavar="ARQUIVO",
+        help="grava as métricas de cada etapa (tempo, linhas lidas/ignoradas por aba, "
+             "bytes gravados, pico de RSS) em JSON, ou NDJSON se terminar em .ndjson"
+    )
+    parser.add_argument(
+        "--changes", action="store_true",
+        help="compara o modelo com o do build anterior e grava changes.json "
+             "(entidades, enums, relacionamentos e opções adicionados/alterados/removidos)"
+    )
+    parser.add_argument(
+        "--changes-jdl", action="store_true",
+        help="como --changes, e grava também changes.jdl só com as entidades afetadas "
+             "e seus vizinhos de relacionamento"
+    )
+    parser.add_argument(
+        "--strict", action="store_true",
+        help="interrompe a geração se a validação da planilha (VALIDACAO) encontrar erros"
+    )
+    parser.add_argument(
+        "--jhipster-json", action="store_true",
+        help="grava também os descritores .jhipster/<Entidade>.json direto a partir do modelo"
+    )
+    parser.add_argument(
+        "--no-workbook-cache", action="store_true",
+        help="sempre lê o .xlsx, sem usar o cache em disco das abas (.jdl_cache/workbooks, "
+             "só existe com pyarrow instalado)"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="executa cada etapa sob cProfile e tracemalloc (em sequência), grava "
+             ".prof e as maiores alocações em .jdl_profile/ e mostra as funções mais lentas"
+    )
+    parser.add_argument(
+        "--profile-top", type=int, default=20, metavar="N",
+        help="quantidade de funções/alocações listadas com --profile (padrão: 20)"
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="fica observando a planilha e regera o JDL a cada salvamento, "
+             "relendo só as abas alteradas (Ctrl+C para sair)"
+    )
+    parser.add_argument(
+        "--watch-interval", type=float, default=0.05, metavar="SEGUNDOS",
+        help="intervalo entre as verificações da planilha com --watch (padrão: 0.05)"
+    )
+    return parser
+
+def pipeline_options(args):
+    """
+    Argumentos de run_pipeline() a partir das opções da linha de comando.
+    """
+    return dict(stages=args.stages, streaming=args.streaming, incremental=not args.full, jobs=args.jobs,
+                report_path=args.report, profile=args.profile, profile_top=args.profile_top,
+                workbook_cache=not args.no_workbook_cache, changes=args.changes,
+                changes_jdl=args.changes_jdl, jhipster_json=args.jhipster_json,
+                strict=args.strict, excel_file_path=args.source)
+
+def main(argv=None):
+    """
+    Linha de comando do gerador (também usada por main.py e run_all.py).
+    """
+    args = build_arg_parser().parse_args(argv)
+
+    # 1) Com --clean, remove todos os arquivos .jdl (e o cache) antes de iniciar.
+    #    Sem --clean, só as etapas cujas entradas mudaram são executadas.
+    if args.clean:
+        clean_outputs()
+
+    # 2) Executa todas as etapas no mesmo processo (sem um interpretador por script).
+    #    Com --watch, o processo continua aberto e regera a cada salvamento.
+    if args.watch:
+        from watch import watch
+        watch(interval=args.watch_interval, **pipeline_options(args))
+        return
+    try:
+        run_pipeline(**pipeline_options(args))
+    except StageError as e:
+        print(f"[ERRO] Build interrompido: {e}")
+        sys.exit(1)
+
+def remove_outputs(name, base_dir=BASE_DIR):
+    """
+    Apaga os arquivos declarados em STAGE_INFO[name]["outputs"].
+    """
+    for output in STAGE_INFO[name]["outputs"]:
+        try:
+            os.remove(os.path.join(base_dir, output))
+        except FileNotFoundError:
+            pass
+
+def clean_outputs(base_dir=BASE_DIR):
+    """
+    Remove todos os arquivos .jdl da pasta e o cache do build incremental.
+    """
+    from build_cache import BuildCache
+
+    for filename in os.listdir(base_dir):
+        if filename.lower().endswith(".jdl"):
+            file_path = os.path.join(base_dir, filename)
+            os.remove(file_path)
+            print(f"[INFO] Removido arquivo: {file_path}")
+    BuildCache(base_dir).clear()
+
+def run_dag(names, execute, jobs):
+    """
+    Executa as etapas respeitando STAGE_INFO[...]["deps"], com até 'jobs'
+    etapas em paralelo (threads). Etapas prontas são disparadas na ordem de
+    STAGES, então a saída não depende do escalonamento. Se uma etapa falhar,
+    nenhuma outra é iniciada e a exceção é propagada após as que já estavam
+    em execução terminarem.
+    """
+    from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+    selected = set(names)
+    pending = list(names)
+    done = set()
+    running = {}
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while pending or running:
+            for name in list(pending):
+                deps = [d for d in STAGE_INFO[name]["deps"] if d in selected]
+                if all(d in done for d in deps):
+                    pending.remove(name)
+                    running[executor.submit(execute, name)] = name
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    pending.clear()
+                    wait(running)
+                    raise error
+                done.add(name)
+
+def run_pipeline(stages=None, streaming=False, incremental=True, jobs=1, base_dir=BASE_DIR,
+                 report_path=None, profile=False, profile_top=20, workbook_cache=True,
+                 changes=False, changes_jdl=False, jhipster_json=False, strict=False,
+                 excel_file_path=None):
+    """
+    Executa as etapas dentro do mesmo interpretador: em ordem, ou com
+    jobs > 1, as etapas independentes (APP, a cadeia ENTIDADES -> CAMPOS ->
+    ENUMS, RELACIONAMENTOS e OPTIONS, que só aguarda ENTIDADES) em paralelo,
+    com JOIN_JDLS aguardando todas elas.
+
+    Com incremental=True, cada etapa só é executada se alguma das suas
+    entradas mudou desde o último build (ver stage_fingerprint); caso
+    contrário, os fragmentos gerados anteriormente são reaproveitados.
+
+    Com 'report_path', as métricas de cada etapa (ver instrumentation) são
+    gravadas nesse arquivo ao final, inclusive se alguma etapa falhar.
+
+    Com streaming=True, as abas de STREAMING_SHEETS são lidas linha a linha,
+    sem materializar o DataFrame; o modelo continua com todos os campos.
+
+    Com workbook_cache=False, a planilha é sempre lida do .xlsx, sem o
+    cache em disco das abas.
+
+    Com changes=True (ou changes_jdl=True), ao final o modelo é comparado
+    com o do build anterior (ver changes.write_changes).
+
+    Com strict=True, erros encontrados pela etapa VALIDACAO interrompem o
+    pipeline (e a validação nunca é pulada pelo cache).
+
+    Com jhipster_json=True, ao final os descritores .jhipster/*.json são
+    gravados a partir do modelo (ver jhipster_json).
+
+    Com 'excel_file_path', as etapas leem essa planilha (ou pasta de
+    arquivos por aba, ver sources) em vez da
+    TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx de 'base_dir' (ver batch).
+
+    Com profile=True, cada etapa executada é perfilada (ver profiling); as
+    etapas rodam em sequência, já que cProfile e tracemalloc não separam
+    etapas executadas ao mesmo tempo.
+    """
+    import workbook
+    import instrumentation
+    from build_cache import BuildCache
+    from jdl_model import JdlModel
+
+    workbook.set_disk_cache(workbook_cache)
+    if streaming:
+        workbook.enable_streaming(*STREAMING_SHEETS)
+
+    if excel_file_path is not None:
+        workbook.set_workbook_path(base_dir, excel_file_path)
+    excel_file_path = workbook.workbook_path(base_dir)
+    cache = None
+    if incremental and os.path.exists(excel_file_path):
+        cache = BuildCache(base_dir)
+
+    profile_dir = None
+    if profile:
+        import profiling
+        profile_dir = os.path.join(base_dir, profiling.PROFILE_DIR_NAME)
+        # Perfis de um build anterior não podem passar por perfis desta execução
+        profiling.clear_profiles(profile_dir)
+        if jobs > 1:
+            print("[AVISO] --profile executa as etapas em sequência; ignorando --jobs.")
+            jobs = 1
+
+    model = JdlModel()
+    fingerprints = {}
+    populated = set()
+    # Etapas executadas ou puladas sem erro; só elas entram no cache
+    completed = set()
+    # Etapas efetivamente executadas (não puladas pelo cache), na ordem
+    profiled = []
+    # Com --jobs, etapas que dependem da mesma etapa pulada (CAMPOS e OPTIONS,
+    # de ENTIDADES) não podem preenchê-la duas vezes no modelo
+    populated_lock = threading.RLock()
+
+    def ensure_model_deps(name):
+        # Etapas do modelo puladas pelo cache ainda precisam preencher o modelo
+        # se uma etapa seguinte (ex.: CAMPOS depois de ENTIDADES) for executada
+        with populated_lock:
+            for dep in STAGE_INFO[name]["deps"]:
+                if dep in MODEL_STAGES and dep not in populated:
+                    ensure_model_deps(dep)
+                    load_stage(dep).populate(model, excel_file_path)
+                    populated.add(dep)
+
+    def execute(name):
+        with instrumentation.stage(name) as metrics:
+            if cache is not None:
+                fingerprints[name] = stage_fingerprint(name, excel_file_path, fingerprints, base_dir)
+                if not (strict and name == "VALIDACAO") and cache.is_fresh(name, fingerprints[name], STAGE_INFO[name]["outputs"]):
+                    metrics.status = "cached"
+                    print(f"Skipping {os.path.join(BASE_DIR, name + '.py')} (sem alterações desde o último build)\n")
+                    with populated_lock:
+                        completed.add(name)
+                    return
+
+            if profile:
+                profiled.append(name)
+            try:
+                with (profiling.profile_stage(name, profile_dir, profile_top) if profile
+                      else contextlib.nullcontext()):
+                    if name in MODEL_STAGES:
+                        ensure_model_deps(name)
+                    # Só a última etapa do modelo grava ENTIDADES.jdl, para que o
+                    # arquivo não passe por versões intermediárias (e novos mtimes)
+                    options = {"strict": strict} if name == "VALIDACAO" else {}
+                    run_stage(name, model, base_dir, write_outputs=superseded_by(name, names) is None, **options)
+            except Exception:
+                # Saídas de um build anterior não podem passar por resultado
+                # desta execução (JOIN_JDLS as concatenaria, o cache as
+                # registraria com a nova impressão digital)
+                remove_outputs(name, base_dir)
+                raise
+            with populated_lock:
+                populated.add(name)
+                completed.add(name)
+
+    names = stages or STAGES
+    instrumentation.start_run(base_dir)
+    status = "error"
+    try:
+        if jobs > 1:
+            run_dag(names, execute, jobs)
+        else:
+            for name in names:
+                execute(name)
+        if changes or changes_jdl or jhipster_json:
+            # Estas saídas precisam do modelo completo, inclusive das etapas puladas pelo cache
+            for name in STAGES:
+                if name in MODEL_STAGES and name not in populated:
+                    load_stage(name).populate(model, excel_file_path)
+                    populated.add(name)
+        if changes_jdl and model.application is None:
+            # O bloco application de changes.jdl vem da aba APP, não de APP.jdl
+            try:
+                load_stage("APP").populate(model, excel_file_path)
+            except ValueError as e:
+                print(f"[AVISO] changes.jdl sem o bloco application: {str(e)}")
+        if changes or changes_jdl:
+            import changes as change_manifest
+            change_manifest.write_changes(base_dir, model, write_jdl=changes_jdl)
+        if jhipster_json:
+            import jhipster_json as descriptors
+            descriptors.write_entity_descriptors(model, os.path.join(base_dir, descriptors.JHIPSTER_DIR_NAME))
+        status = "ok"
+    finally:
+        report = instrumentation.finish_run(status)
+        if report_path:
+            report.write(report_path)
+            print(f"[INFO] Relatório de execução gravado em {report_path}")
+        if cache is not None:
+            # Com uma falha, as etapas concluídas antes dela continuam no
+            # cache; a que falhou (e as seguintes) rodam de novo no próximo build
+            for name in names:
+                if name in completed:
+                    cache.record(name, fingerprints[name], STAGE_INFO[name]["outputs"])
+            cache.save()
+
+    if profile:
+        profiling.print_hotspots(profile_dir, profiled, profile_top)
+
+    print("All scripts executed successfully!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+import os
+import pstats
+import cProfile
+import shutil
+import linecache
+import tracemalloc
+import contextlib
+
+PROFILE_DIR_NAME = ".jdl_profile"
+
+@contextlib.contextmanager
+def profile_stage(name, profile_dir, top=20):
+    """
+    Executa o bloco with sob cProfile e tracemalloc e grava, em 'profile_dir':
+      - <name>.prof:      estatísticas do cProfile (abrir com pstats/snakeviz);
+      - <name>.alloc.txt: as 'top' linhas de código que mais alocaram memória
+                          durante a etapa e o pico de memória alocada.
+    Os perfis são por thread/processo: use apenas com as etapas em sequência.
+    """
+    os.makedirs(profile_dir, exist_ok=True)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    before = tracemalloc.take_snapshot()
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        if started_tracing:
+            tracemalloc.stop()
+
+        profiler.dump_stats(os.path.join(profile_dir, f"{name}.prof"))
+        write_allocations(name, after.compare_to(before, "lineno"), peak,
+                          os.path.join(profile_dir, f"{name}.alloc.txt"), top)
+
+def clear_profiles(profile_dir):
+    """
+    Remove os perfis de execuções anteriores, para que 'profile_dir' só
+    tenha os das etapas executadas agora (as puladas pelo cache não têm perfil).
+    """
+    shutil.rmtree(profile_dir, ignore_errors=True)
+
+def _is_profiler_frame(stat):
+    filename = stat.traceback[0].filename
+    return filename == __file__ or filename == tracemalloc.__file__
+
+def write_allocations(name, diffs, peak, path, top):
+    """
+    Grava as 'top' linhas com maior crescimento de memória durante a etapa.
+    """
+    diffs = [d for d in diffs if d.size_diff > 0 and not _is_profiler_frame(d)][:top]
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"# {name}: pico de memória alocada {peak / 1e6:.2f} MB\n")
+        f.write(f"# top {len(diffs)} linhas por memória alocada (e ainda viva) ao final da etapa\n\n")
+        for d in diffs:
+            frame = d.traceback[0]
+            source = linecache.getline(frame.filename, frame.lineno).strip()
+            f.write(f"{d.size_diff / 1024:10.1f} KB {d.count_diff:8d} blocos  "
+                    f"{frame.filename}:{frame.lineno}\n")
+            if source:
+                f.write(f"{'':32}{source}\n")
+
+def hotspots(profile_dir, stages, top=20):
+    """
+    Junta os .prof das etapas e devolve as 'top' funções com maior tempo
+    próprio (tottime), como tuplas (etapa, função, chamadas, tottime, cumtime).
+    """
+    rows = []
+    for name in stages:
+        prof_path = os.path.join(profile_dir, f"{name}.prof")
+        if not os.path.exists(prof_path):
+            continue
+        stats = pstats.Stats(prof_path)
+        for (filename, lineno, func), (_, ncalls, tottime, cumtime, _) in stats.stats.items():
+            if filename == "~":
+                location = func  # funções embutidas, ex.: <built-in method ...>
+            else:
+                location = f"{os.path.basename(filename)}:{lineno}({func})"
+            rows.append((name, location, ncalls, tottime, cumtime))
+    rows.sort(key=lambda row: row[3], reverse=True)
+    return rows[:top]
+
+def print_hotspots(profile_dir, stages, top=20):
+    rows = hotspots(profile_dir, stages, top)
+    if not rows:
+        return
+    print(f"\n[INFO] Top {len(rows)} funções por tempo próprio (perfis em {profile_dir}):")
+    print(f"{'etapa':<18}{'tottime':>10}{'cumtime':>10}{'chamadas':>10}  função")
+    for name, location, ncalls, tottime, cumtime in rows:
+        print(f"{name:<18}{tottime:>10.4f}{cumtime:>10.4f}{ncalls:>10}  {location}")
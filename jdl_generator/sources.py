@@ -0,0 +1,179 @@
+"""
+Fontes de abas além do .xlsx: uma pasta com um arquivo por aba, com o
+nome da aba e o formato indicado pela extensão, por exemplo:
+
+    catalogo/
+        APP.csv
+        ENTIDADES.csv
+        CAMPOS.parquet
+        ENUMS.jsonl
+        RELACIONAMENTOS.csv
+        OPTIONS.csv
+
+Formatos aceitos: .csv (UTF-8, primeira linha = cabeçalho), .jsonl/.ndjson
+(um objeto JSON por linha) e .parquet (lido em lotes via pyarrow, que só é
+exigido se houver algum arquivo .parquet). O nome do arquivo é comparado com
+o da aba sem diferenciar maiúsculas de minúsculas (campos.csv é a aba CAMPOS).
+
+As funções de workbook (read_sheet, iter_sheet_rows, sheet_digest, ...)
+aceitam o caminho da pasta no lugar do .xlsx e delegam para este módulo,
+então as etapas não precisam saber de onde vêm as linhas.
+"""
+import os
+import csv
+import json
+from workbook import cell_to_str
+
+# Extensão -> formato. Na ordem de preferência, se houver dois arquivos
+# para a mesma aba.
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+}
+
+# Linhas por lote lido do .parquet
+PARQUET_BATCH_ROWS = 10_000
+
+def is_source_dir(path):
+    return os.path.isdir(path)
+
+def sheet_files(source_dir):
+    """
+    { nome_da_aba: caminho } dos arquivos reconhecidos da pasta. Arquivos
+    cujos nomes só diferem em maiúsculas/minúsculas são a mesma aba.
+    """
+    files = {}
+    preference = list(FORMATS)
+    for filename in sorted(os.listdir(source_dir)):
+        sheet, ext = os.path.splitext(filename)
+        ext = ext.lower()
+        if ext not in FORMATS:
+            continue
+        current = files.get(sheet.casefold())
+        if current is None or preference.index(ext) < preference.index(os.path.splitext(current[1])[1].lower()):
+            files[sheet.casefold()] = (sheet, os.path.join(source_dir, filename))
+    return dict(files.values())
+
+def sheet_file(source_dir, sheet_name):
+    wanted = sheet_name.casefold()
+    for sheet, path in sheet_files(source_dir).items():
+        if sheet.casefold() == wanted:
+            return path
+    raise ValueError(f"Worksheet named '{sheet_name}' not found")
+
+def signature(source_dir):
+    """
+    Assinatura da pasta: (aba, mtime, tamanho) de cada arquivo reconhecido.
+    Muda quando um arquivo é alterado, criado, removido ou renomeado.
+    """
+    entries = []
+    for sheet, path in sheet_files(source_dir).items():
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((sheet, os.path.basename(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(entries)
+
+def _iter_csv(path):
+    # utf-8-sig: planilhas exportadas como CSV costumam vir com BOM
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        yield header
+        for values in reader:
+            yield reader.line_num, dict(zip(header, values))
+
+def _iter_jsonl(path):
+    # O cabeçalho é a união das chaves, que só se conhece no fim do arquivo:
+    # em vez de ler o arquivo duas vezes, as colunas são descobertas
+    # registro a registro (ver iter_records)
+    yield None
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError(f"{path}, linha {line_number}: esperado um objeto JSON")
+            yield line_number, record
+
+def _iter_parquet(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError(f"ler '{path}' requer o pacote pyarrow (pip install pyarrow)") from e
+
+    parquet_file = pq.ParquetFile(path)
+    yield list(parquet_file.schema_arrow.names)
+    row_number = 0
+    for batch in parquet_file.iter_batches(batch_size=PARQUET_BATCH_ROWS):
+        for record in batch.to_pylist():
+            row_number += 1
+            yield row_number, record
+
+_READERS = {"csv": _iter_csv, "jsonl": _iter_jsonl, "parquet": _iter_parquet}
+
+def iter_records(path):
+    """
+    Primeiro o cabeçalho (lista de colunas) e depois (número da linha, dict)
+    para cada registro, com os valores como estão no arquivo. Em JSON-lines
+    o cabeçalho é None: cada registro pode trazer colunas novas.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    return _READERS[FORMATS[ext]](path)
+
+def iter_rows(path, with_row_numbers=False):
+    """
+    Mesmo contrato de workbook.iter_sheet_rows(): um dict { coluna: valor_str }
+    por registro, com valores ausentes como "" e registros vazios ignorados.
+    O número da linha é o do arquivo (CSV e JSON-lines) ou a posição do
+    registro (Parquet).
+
+    Em JSON-lines, cada dict tem as colunas vistas até aquele registro (o
+    último tem todas); uma coluna que só aparece adiante fica ausente, não "".
+    """
+    records = iter_records(path)
+    try:
+        header = next(records)
+    except StopIteration:
+        return
+    columns = dict.fromkeys(header or ())
+    for row_number, record in records:
+        if header is None:
+            columns.update(dict.fromkeys(record))
+        row = {name: cell_to_str(record.get(name)) for name in columns}
+        if not any(row.values()):
+            continue
+        yield (row_number, row) if with_row_numbers else row
+
+def read_frame(path):
+    """
+    A aba como DataFrame, como pd.read_excel(..., dtype=str): todas as
+    colunas como texto e células vazias como NaN.
+    """
+    import pandas as pd
+
+    if FORMATS[os.path.splitext(path)[1].lower()] == "csv":
+        # O leitor em C do pandas é bem mais rápido que csv.reader
+        return pd.read_csv(path, dtype=str, keep_default_na=False, na_values=[""], encoding="utf-8-sig")
+
+    # Monta as colunas direto dos registros, sem lista de linhas intermediária
+    records = iter_records(path)
+    header = next(records, None)
+    columns = {name: [] for name in header or ()}
+    count = 0
+    for _, record in records:
+        if header is None:
+            for name in record:
+                if name not in columns:
+                    columns[name] = [None] * count
+        for name, values in columns.items():
+            values.append(cell_to_str(record.get(name)) or None)
+        count += 1
+    return pd.DataFrame(columns, dtype=str)
@@ -0,0 +1,147 @@
+"""
+Testes do gerador de JDL.
+
+    python -m pytest -q jdl_generator/tests
+
+data/catalogo é uma planilha de exemplo em forma de pasta (um .csv por
+aba, ver sources). Os testes geram a mesma planilha em .xlsx (ver a
+fixture 'xlsx_source') para cobrir as duas fontes.
+
+data/baseline guarda a saída dos scripts originais (commit "baseline"),
+não a do código atual: a planilha, com os cabeçalhos de CANONICAL_HEADERS,
+foi gravada como TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx numa cópia desse
+commit (git archive) e os .jdl gerados por main.py foram copiados para cá.
+A saída esperada de cada arquivo (ver expected) é a da baseline com as
+diferenças intencionais de INTENDED_CHANGES, e nada mais.
+"""
+import os
+import csv
+import sys
+
+import pytest
+
+GENERATOR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if GENERATOR_DIR not in sys.path:
+    sys.path.insert(0, GENERATOR_DIR)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CATALOG_DIR = os.path.join(DATA_DIR, "catalogo")
+BASELINE_DIR = os.path.join(DATA_DIR, "baseline")
+
+# Cabeçalhos alternativos do catálogo -> nomes lidos pelos scripts originais
+CANONICAL_HEADERS = {
+    "Entidade": "Entity", "tableName": "Alias", "Option Name": "Option Type",
+    "From Entity": "Entity From", "Injected Field (From)": "Field From",
+    "To Entity": "Entity To", "Injected Field (To)": "Field To",
+}
+
+# Diferenças intencionais em relação à baseline: { motivo: [(trecho da baseline, trecho atual)] }
+INTENDED_CHANGES = {
+    # Entidade sem alias: o modelo usa o nome em minúsculas, em vez de
+    # "(nan)" (que FIX_COMPLETE_JDL reduzia a "()")
+    "alias vazio": [
+        ("entity Order (nan){\n", "entity Order (order){\n"),
+        ("entity Order (){\n", "entity Order (order){\n"),
+    ],
+    # OPTIONS: wildcard com except, entidades na mesma linha e sem linhas repetidas
+    "opções compactadas": [
+        ("dto Owner with mapstruct\ndto Car with mapstruct\ndto Driver with mapstruct\n"
+         "dto Order with mapstruct\npaginate Car with pagination\npaginate Order with pagination\n",
+         "dto * with mapstruct except Passport, Citizen\npaginate Car, Order with pagination\n"),
+        ("service Owner with serviceImpl\nservice Owner with serviceImpl\n",
+         "service Owner with serviceImpl\n"),
+    ],
+    # RELACIONAMENTOS: um bloco por tipo (inclusive "ManyToOne" escrito em
+    # CamelCase), display field, required, builtInEntity e traços como vazio
+    "relacionamentos agrupados": [
+        ("relationship ManyToOne {\n    Car{owner} to Owner{–}\n}\n",
+         "relationship ManyToOne {\n    Car{owner(id)} to Owner\n"
+         "    Order{customer(name) required} to Owner{order}\n"
+         "    Order{user(login)} to User with builtInEntity\n}\n"),
+        ("relationship OneToOne {\n    Citizen{passport} to Passport{-}\n}\n\n"
+         "relationship Manytoone {\n    Order{customer} to Owner{order}\n}\n\n"
+         "relationship Manytoone {\n    Order{user} to User{}\n}\n",
+         "relationship OneToOne {\n    Citizen{passport required} to Passport\n}\n"),
+    ],
+}
+
+# Abas na ordem da planilha modelo
+SHEETS = ["APP", "ENTIDADES", "CAMPOS", "RELACIONAMENTOS", "ENUMS", "OPTIONS"]
+
+def read_catalog(source_dir=CATALOG_DIR):
+    """
+    { aba: [cabeçalho, linha, ...] } dos .csv de 'source_dir'.
+    """
+    sheets = {}
+    for name in SHEETS:
+        with open(os.path.join(source_dir, f"{name}.csv"), encoding="utf-8", newline="") as f:
+            sheets[name] = list(csv.reader(f))
+    return sheets
+
+def write_xlsx(path, sheets):
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    wb.remove(wb.active)
+    for name, rows in sheets.items():
+        ws = wb.create_sheet(name)
+        for row in rows:
+            ws.append([value if value != "" else None for value in row])
+    wb.save(path)
+    return path
+
+def baseline(name):
+    with open(os.path.join(BASELINE_DIR, name), "r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+def expected(name):
+    """
+    Saída esperada (bytes) do arquivo 'name': a da baseline com as
+    diferenças de INTENDED_CHANGES.
+    """
+    text = baseline(name)
+    for changes in INTENDED_CHANGES.values():
+        for old, new in changes:
+            text = text.replace(old, new)
+    return text.encode("utf-8")
+
+@pytest.fixture(autouse=True)
+def reset_workbook_state():
+    """
+    O módulo workbook guarda abas, digests e caminhos em memória no nível do
+    processo; cada teste começa e termina sem nada disso.
+    """
+    import workbook
+
+    workbook.clear_cache()
+    workbook.disable_streaming()
+    workbook.set_disk_cache(True)
+    yield
+    workbook.clear_cache()
+    workbook.disable_streaming()
+    workbook._workbook_paths.clear()
+
+@pytest.fixture
+def catalog_source():
+    return CATALOG_DIR
+
+@pytest.fixture
+def xlsx_source(tmp_path):
+    return write_xlsx(str(tmp_path / "catalogo.xlsx"), read_catalog())
+
+@pytest.fixture
+def run(tmp_path):
+    """
+    Executa o pipeline com a saída em uma pasta temporária e devolve essa
+    pasta. Sem cache em disco das abas, para não gravar nada em data/.
+    """
+    from pipeline import run_pipeline
+
+    def run(source, out_dir=None, **options):
+        out_dir = str(out_dir or tmp_path / "out")
+        os.makedirs(out_dir, exist_ok=True)
+        options.setdefault("workbook_cache", False)
+        run_pipeline(base_dir=out_dir, excel_file_path=source, **options)
+        return out_dir
+
+    return run
@@ -0,0 +1,46 @@
+import os
+import shutil
+
+import pytest
+
+from api import build_model, render_jdl
+from conftest import GENERATOR_DIR, expected
+from test_pipeline import read_output
+
+BACKUP_WORKBOOK = os.path.join(GENERATOR_DIR, "TABELA_DE_CONFIGURACAO_JHIPSTER_backup.xlsx")
+
+@pytest.fixture(params=["catalog", "xlsx", "backup"])
+def source(request, catalog_source, tmp_path):
+    if request.param == "catalog":
+        return catalog_source
+    if request.param == "xlsx":
+        return request.getfixturevalue("xlsx_source")
+    # Cópia, para que nada seja gravado ao lado da planilha do repositório
+    return shutil.copy(BACKUP_WORKBOOK, str(tmp_path / "backup.xlsx"))
+
+def test_render_jdl_matches_pipeline_output(run, source):
+    out_dir = run(source, incremental=False)
+    model = build_model(source)
+    assert len(model.entities) > 1
+    assert "".join(render_jdl(model)).encode("utf-8") == read_output(out_dir, "complete_fixed.jdl")
+    assert "".join(render_jdl(model, fix=False)).encode("utf-8") == read_output(out_dir, "complete.jdl")
+
+def test_render_jdl_matches_fixture(catalog_source):
+    assert "".join(render_jdl(build_model(catalog_source))).encode("utf-8") == expected("complete_fixed.jdl")
+
+def test_render_jdl_without_application(catalog_source):
+    content = "".join(render_jdl(build_model(catalog_source, application=False)))
+    assert expected("complete_fixed.jdl").decode("utf-8").endswith(content)
+    assert not content.startswith("application")
+
+def test_render_jdl_matches_pipeline_on_non_ascii_identifiers(run, catalog_source, tmp_path):
+    source_dir = tmp_path / "src"
+    shutil.copytree(catalog_source, source_dir)
+    with open(source_dir / "ENTIDADES.csv", "a", encoding="utf-8") as f:
+        f.write("Órgão,órgão_público\n")
+    with open(source_dir / "CAMPOS.csv", "a", encoding="utf-8") as f:
+        f.write("Órgão,descrição,String,sim,,,,,,,,,,Descrição do órgão,\n")
+    out_dir = run(str(source_dir), incremental=False)
+    content = read_output(out_dir, "complete_fixed.jdl")
+    assert "entity Órgão (órgãoPúblico){\n".encode("utf-8") in content
+    assert "".join(render_jdl(build_model(str(source_dir)))).encode("utf-8") == content
@@ -0,0 +1,33 @@
+import pytest
+
+from conftest import CANONICAL_HEADERS, CATALOG_DIR, INTENDED_CHANGES, baseline, read_catalog, write_xlsx
+from test_pipeline import OUTPUTS, assert_outputs, read_output
+
+CHANGES = [(reason, old, new) for reason, changes in INTENDED_CHANGES.items() for old, new in changes]
+
+@pytest.fixture(scope="module")
+def outputs(tmp_path_factory):
+    from pipeline import run_pipeline
+
+    out_dir = str(tmp_path_factory.mktemp("out"))
+    run_pipeline(base_dir=out_dir, excel_file_path=CATALOG_DIR, incremental=False, workbook_cache=False)
+    return {name: read_output(out_dir, name).decode("utf-8") for name in OUTPUTS}
+
+@pytest.mark.parametrize("reason, old, new", CHANGES, ids=[f"{r}-{i}" for i, (r, _, _) in enumerate(CHANGES)])
+def test_intended_change(outputs, reason, old, new):
+    # O trecho existia na saída dos scripts originais e foi substituído
+    in_baseline = [name for name in OUTPUTS if old in baseline(name)]
+    assert in_baseline, reason
+    for name in in_baseline:
+        assert old not in outputs[name], name
+        assert new in outputs[name], name
+
+def test_application_is_unchanged(outputs):
+    assert outputs["APP.jdl"] == baseline("APP.jdl")
+
+def test_canonical_headers_give_the_same_output(run, tmp_path):
+    # A baseline foi gerada com os cabeçalhos lidos pelos scripts originais
+    sheets = read_catalog()
+    for rows in sheets.values():
+        rows[0] = [CANONICAL_HEADERS.get(h, h) for h in rows[0]]
+    assert_outputs(run(write_xlsx(str(tmp_path / "canonico.xlsx"), sheets), incremental=False))
@@ -0,0 +1,27 @@
+import random
+
+import CAMPOS
+from jdl_model import render_field
+from workbook import iter_frame_rows
+
+COLUMNS = [
+    "Entity", "Field Name", "Field Type", "Required", "Minlength", "Maxlength", "Pattern", "Unique",
+    "Min", "Max", "Minbytes", "Maxbytes", "Field Annotation(s)", "Field Javadoc/Comment", "Observações/Exemplo",
+]
+VALUES = [None, "", " ", "nan", "NaN", "yes", "Sim", "1", "0", "12", "-3.5", "1.2.3", "--1",
+          "abc", "/x/", "^a$/", "/", 'a"b', " 7 ", "Foo", "x}y"]
+
+def random_sheet(rows, seed):
+    import pandas as pd
+
+    rng = random.Random(seed)
+    return pd.DataFrame([[rng.choice(VALUES) for _ in COLUMNS] for _ in range(rows)], columns=COLUMNS)
+
+def rendered(items):
+    return [(entity, render_field(field)) for entity, field in items]
+
+def test_vectorized_and_row_paths_build_the_same_fields():
+    df = random_sheet(3000, seed=1)
+    by_row = rendered(filter(None, map(CAMPOS.build_field, iter_frame_rows(df))))
+    assert by_row == rendered(CAMPOS.build_fields(df))
+    assert len(by_row) > 1000
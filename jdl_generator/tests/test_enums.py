@@ -0,0 +1,15 @@
+import ENUMS
+from conftest import write_xlsx
+from jdl_model import JdlModel
+
+def test_populate_from_sheet_without_optional_columns(tmp_path):
+    path = write_xlsx(str(tmp_path / "w.xlsx"), {"ENUMS": [
+        ["Enum Name", "Enum Key", "Enum Value (opcional)"],
+        [" Color ", " red ", " 'Red' "],
+        ["Color", None, "x"],
+        [None, "BLUE", None],
+        ["Color", "blue", None],
+    ]})
+    model = ENUMS.populate(JdlModel(), path)
+    items = [(it.key, it.value, it.comment, it.obs) for it in model.enums["Color"].items]
+    assert items == [("RED", "Red", "", ""), ("BLUE", "", "", "")]
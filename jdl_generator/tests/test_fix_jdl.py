@@ -0,0 +1,112 @@
+import time
+
+import pytest
+
+from FIX_COMPLETE_JDL import _iter_fixed_chunks, fix_jdl_content, fix_jdl_file, snake_to_camel_case
+from conftest import expected
+
+def test_snake_to_camel_case():
+    assert snake_to_camel_case("profile_custom") == "profileCustom"
+    assert snake_to_camel_case("pass_port_x") == "passPortX"
+    assert snake_to_camel_case("car") == "car"
+
+def test_entity_alias_to_camel_case():
+    assert fix_jdl_content("entity Profile (profile_custom){\n}") == "entity Profile (profileCustom){\n}"
+    assert fix_jdl_content("entity Profile(profile_custom) {") == "entity Profile(profileCustom) {"
+
+@pytest.mark.parametrize("text, fixed", [
+    ("name String min(nan) max(10)", "name String  max(10)"),
+    ("name String minbytes(n) maxbytes( )", "name String  "),
+    ("name String pattern('/nan/') required", "name String  required"),
+    ("name String nan", "name String "),
+])
+def test_empty_validations_are_removed(text, fixed):
+    assert fix_jdl_content(text) == fixed
+
+def test_valid_pattern_is_kept():
+    text = 'code String pattern(/^[a-z]{2}"nan"\\/x$/) required'
+    assert fix_jdl_content(text) == text
+
+def test_comments_and_strings_are_kept():
+    text = (
+        "/**\n"
+        " * min(nan) // entity A (b_c)\n"
+        " */\n"
+        '// pattern(/nan/) "x\n'
+        'X ("min(nan)")\n'
+    )
+    assert fix_jdl_content(text) == text
+
+def test_enum_bodies_are_kept():
+    text = 'enum Color {\n  /**\n   * }\n   */\n  RED ("}")\n  NAN\n}\nname String min(nan)'
+    assert fix_jdl_content(text) == text[:-len("min(nan)")]
+
+def test_fix_jdl_file_matches_fix_jdl_content(tmp_path):
+    source = tmp_path / "complete.jdl"
+    output = tmp_path / "complete_fixed.jdl"
+    source.write_bytes(expected("complete.jdl"))
+    fix_jdl_file(str(source), str(output))
+    assert output.read_bytes() == expected("complete_fixed.jdl")
+    assert fix_jdl_content(expected("complete.jdl").decode("utf-8")).encode("utf-8") == expected("complete_fixed.jdl")
+
+def test_fix_jdl_file_empty_input(tmp_path):
+    source = tmp_path / "complete.jdl"
+    output = tmp_path / "complete_fixed.jdl"
+    source.write_bytes(b"")
+    fix_jdl_file(str(source), str(output))
+    assert output.read_bytes() == b""
+
+@pytest.mark.parametrize("entries", [20, 2000])
+def test_unterminated_enum_is_linear(entries):
+    # Used to backtrack exponentially in the number of entries
+    body = "".join(f'  K{i} ("v") /* c */ // nan\n' for i in range(entries))
+    text = "enum E {\n" + body + "entity A (b_c) min(nan)\n"
+    start = time.perf_counter()
+    fixed = fix_jdl_content(text)
+    assert time.perf_counter() - start < 1.0
+    # An enum that is never closed runs to the end of the document
+    assert fixed == text
+    assert b"".join(_iter_fixed_chunks(text.encode("utf-8"))) == text.encode("utf-8")
+
+def test_enum_is_closed_by_first_brace_outside_comments_and_strings():
+    text = 'enum E {\n  A ("}") /* } */ // }\n}\nname String min(nan) nan\n'
+    assert fix_jdl_content(text) == 'enum E {\n  A ("}") /* } */ // }\n}\nname String  \n'
+
+# Cases where the output differs from the original regex-based fix, which
+# removed every 'nan' first and then only min/max/minbytes/maxbytes/pattern
+# with empty parentheses. Its output is in the comment of each case.
+@pytest.mark.parametrize("text, fixed", [
+    # minlength() pattern(//)  (invalid JDL)
+    ("name String minlength(nan) pattern(/nan/) min(nan)", "name String   "),
+    # maxlength() required
+    ("name String maxlength(nan) required", "name String  required"),
+    # pattern('//')
+    ("name String pattern('/nan/')", "name String "),
+    # pattern(//)
+    ("name String pattern(//)", "name String "),
+    # entity A (){  (invalid JDL)
+    ("entity A (nan){", "entity A{"),
+    # entity  (nan_alias){  (entity name removed)
+    ("entity Nan (nan_alias){", "entity Nan (nanAlias){"),
+    # /**\n * Comment: \n */
+    ("/**\n * Comment: nan\n */", "/**\n * Comment: nan\n */"),
+    # enum E {\n   ("")\n}
+    ('enum E {\n  NAN ("nan")\n}', 'enum E {\n  NAN ("nan")\n}'),
+])
+def test_changes_from_original_fix(text, fixed):
+    assert fix_jdl_content(text) == fixed
+
+@pytest.mark.parametrize("text, fixed", [
+    ("entity Ação (ação_x) {\n", "entity Ação (açãoX) {\n"),
+    ("entity Órgão (nan){\n", "entity Órgão{\n"),
+    # 'ãnan' and 'nanã' are single words, not a bare 'nan'
+    ("descrição String min(nan) ãnan nanã nan\n", "descrição String  ãnan nanã \n"),
+    ('/** Comentário: nan */ código String pattern(/^çã$/)\n', '/** Comentário: nan */ código String pattern(/^çã$/)\n'),
+])
+def test_non_ascii_text_is_fixed_the_same_way_from_a_file(tmp_path, text, fixed):
+    source = tmp_path / "complete.jdl"
+    output = tmp_path / "complete_fixed.jdl"
+    source.write_bytes(text.encode("utf-8"))
+    fix_jdl_file(str(source), str(output))
+    assert fix_jdl_content(text) == fixed
+    assert output.read_bytes() == fixed.encode("utf-8")
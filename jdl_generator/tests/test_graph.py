@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+import graph
+
+from api import build_model
+from conftest import expected
+from graph import ModelGraph, render_subset_jdl
+from jdl_model import subset_model
+from test_pipeline import read_output
+
+@pytest.fixture
+def model(catalog_source):
+    return build_model(catalog_source)
+
+def test_relationships_to_entities_outside_the_model_are_kept(model):
+    entities = ModelGraph(model).closure(["Order"])
+    assert entities == ["Owner", "Car", "Driver", "Order"]
+    subset = subset_model(model, entities)
+    assert [(r.entity_from, r.entity_to) for r in subset.relationships if r.entity_from == "Order"] == [
+        ("Order", "Owner"), ("Order", "User"),
+    ]
+    assert "Order{user(login)} to User with builtInEntity\n" in render_subset_jdl(model, entities)
+
+def test_relationships_to_entities_left_out_are_dropped(model):
+    subset = subset_model(model, ["Car"])
+    assert subset.relationships == []
+
+def test_application_comes_from_the_model(model):
+    content = render_subset_jdl(model, ["Driver"])
+    assert content.startswith(expected("APP.jdl").decode("utf-8"))
+    assert not render_subset_jdl(model, ["Driver"], application=False).startswith("application")
+
+def test_all_entities_render_like_complete_fixed(model):
+    # Só as opções de entidades que o modelo não declara (Audit) ficam de fora
+    full = expected("complete_fixed.jdl").decode("utf-8")
+    assert render_subset_jdl(model, list(model.entities)) == full.replace("search Audit with elasticsearch\n", "")
+
+def test_changes_jdl_takes_application_from_the_workbook(run, catalog_source):
+    out_dir = run(catalog_source, incremental=False, changes_jdl=True)
+    content = read_output(out_dir, "changes.jdl").decode("utf-8")
+    assert content.startswith(expected("APP.jdl").decode("utf-8"))
+    assert "Order{user(login)} to User with builtInEntity\n" in content
+
+def test_subset_is_not_written_where_join_would_pick_it_up(xlsx_source, tmp_path):
+    inside = tmp_path / "pedidos.jdl"
+    assert graph.main(["Order", "--workbook", xlsx_source, "-o", str(inside)]) == 1
+    assert not inside.exists()
+
+    subset = tmp_path / "subsets" / "pedidos.jdl"
+    assert graph.main(["Order", "--workbook", xlsx_source, "-o", str(subset)]) == 0
+    assert "entity Order" in subset.read_text(encoding="utf-8")
+    assert os.listdir(tmp_path / "subsets") == ["pedidos.jdl"]
@@ -0,0 +1,13 @@
+import pytest
+
+from jdl_model import Field, Validation
+from jhipster_json import field_descriptor
+
+@pytest.mark.parametrize("pattern, expected", [
+    ("/^[A-Z][a-z]+$/", "^[A-Z][a-z]+$"),
+    ("/^https?://.+/$/", "^https?://.+/$"),
+    ("//x//", "/x/"),
+])
+def test_pattern_keeps_slashes_of_the_regex(pattern, expected):
+    field = Field("site", "String", [Validation("pattern", pattern)])
+    assert field_descriptor(field, {})["fieldValidateRulesPattern"] == expected
@@ -0,0 +1,65 @@
+import time
+
+from jdl_model import JdlModel, Option, render_options
+
+def model_with(entities, options):
+    model = JdlModel()
+    for name in entities:
+        model.add_entity(name, name.lower())
+    model.options = [Option(option_type, entity, value) for option_type, entity, value in options]
+    return model
+
+def test_option_for_every_entity_uses_wildcard():
+    model = model_with("ABC", [("dto", e, "mapstruct") for e in "ABC"])
+    assert render_options(model) == "dto * with mapstruct\n"
+
+def test_option_for_most_entities_uses_except():
+    model = model_with("ABCD", [("service", e, "serviceImpl") for e in "DAC"])
+    assert render_options(model) == "service * with serviceImpl except B\n"
+
+def test_option_for_few_entities_is_listed_in_order_of_appearance():
+    model = model_with("ABCD", [("paginate", "C", "pagination"), ("paginate", "A", "pagination")])
+    assert render_options(model) == "paginate C, A with pagination\n"
+
+def test_half_of_the_entities_is_listed():
+    model = model_with("ABCD", [("readOnly", "A", ""), ("readOnly", "B", "")])
+    assert render_options(model) == "readOnly A, B\n"
+
+def test_unary_option_with_wildcard():
+    model = model_with("ABC", [("readOnly", "A", ""), ("readOnly", "C", "")])
+    assert render_options(model) == "readOnly * except B\n"
+
+def test_values_are_grouped_separately():
+    model = model_with("AB", [
+        ("paginate", "A", "pagination"),
+        ("paginate", "B", "infinite-scroll"),
+        ("dto", "A", "mapstruct"),
+    ])
+    assert render_options(model) == (
+        "paginate A with pagination\n"
+        "paginate B with infinite-scroll\n"
+        "dto A with mapstruct\n"
+    )
+
+def test_duplicated_rows_appear_once():
+    model = model_with("AB", [("search", "A", "elasticsearch"), ("search", "A", "elasticsearch")])
+    assert render_options(model) == "search A with elasticsearch\n"
+
+def test_unknown_entities_never_enter_the_wildcard():
+    model = model_with("AB", [("dto", e, "mapstruct") for e in ("A", "B", "Audit")])
+    assert render_options(model) == "dto * with mapstruct\ndto Audit with mapstruct\n"
+
+def test_no_entities_lists_everything():
+    model = model_with("", [("dto", "A", "mapstruct")])
+    assert render_options(model) == "dto A with mapstruct\n"
+
+def test_many_groups_are_linear():
+    # Used to walk every entity of the model once per (option, value) group
+    names = [f"E{i}" for i in range(5000)]
+    model = model_with(names, [("search", name, f"v{i}") for i, name in enumerate(names)])
+    model.options += [Option("dto", name, "mapstruct") for name in names[:4000]]
+    start = time.perf_counter()
+    content = render_options(model)
+    assert time.perf_counter() - start < 1.0
+    assert content.startswith("search E0 with v0\nsearch E1 with v1\n")
+    assert content.endswith("dto * with mapstruct except " + ", ".join(names[4000:]) + "\n")
@@ -0,0 +1,153 @@
+import os
+import json
+import shutil
+
+import pytest
+
+from conftest import CATALOG_DIR, expected, read_catalog, write_xlsx
+
+OUTPUTS = ["APP.jdl", "ENTIDADES.jdl", "OPTIONS.jdl", "RELACIONAMENTOS.jdl", "complete.jdl", "complete_fixed.jdl"]
+
+def read_output(out_dir, name):
+    with open(os.path.join(out_dir, name), "rb") as f:
+        return f.read()
+
+def assert_outputs(out_dir):
+    for name in OUTPUTS:
+        assert read_output(out_dir, name) == expected(name), name
+
+def test_folder_source(run, catalog_source):
+    assert_outputs(run(catalog_source, incremental=False))
+
+def test_xlsx_source(run, xlsx_source):
+    assert_outputs(run(xlsx_source, incremental=False))
+
+def test_jsonl_source(run, tmp_path):
+    source_dir = tmp_path / "jsonl"
+    source_dir.mkdir()
+    for name, rows in read_catalog().items():
+        header, records = rows[0], rows[1:]
+        # Nomes de arquivo em minúsculas: campos.jsonl é a aba CAMPOS
+        with open(source_dir / f"{name.lower()}.jsonl", "w", encoding="utf-8") as f:
+            for record in records:
+                values = {k: v for k, v in zip(header, record) if v != ""}
+                f.write(json.dumps(values, ensure_ascii=False) + "\n")
+    assert_outputs(run(str(source_dir), incremental=False))
+
+def test_parquet_source(run, tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    source_dir = tmp_path / "parquet"
+    source_dir.mkdir()
+    for name, rows in read_catalog().items():
+        header, records = rows[0], rows[1:]
+        columns = {k: [r[i] or None for r in records] for i, k in enumerate(header)}
+        pq.write_table(pa.table(columns), str(source_dir / f"{name}.parquet"))
+    assert_outputs(run(str(source_dir), incremental=False))
+
+@pytest.mark.parametrize("options", [
+    {"streaming": True},
+    {"jobs": 4},
+    {"streaming": True, "jobs": 4},
+])
+def test_options_keep_output(run, xlsx_source, options):
+    assert_outputs(run(xlsx_source, incremental=False, **options))
+
+def test_incremental_rebuild(run, tmp_path, capsys):
+    source_dir = str(tmp_path / "src")
+    shutil.copytree(CATALOG_DIR, source_dir)
+
+    out_dir = run(source_dir)
+    assert_outputs(out_dir)
+
+    # Nada mudou: nenhuma etapa é executada
+    capsys.readouterr()
+    run(source_dir, out_dir)
+    assert "Running" not in capsys.readouterr().out
+    assert_outputs(out_dir)
+
+    # Só a aba OPTIONS mudou: as etapas das demais abas são puladas
+    with open(os.path.join(source_dir, "OPTIONS.csv"), "a", encoding="utf-8", newline="") as f:
+        f.write("Driver,readOnly,\n")
+    run(source_dir, out_dir)
+    log = capsys.readouterr().out
+    ran = {os.path.basename(line.split()[1])[:-len(".py")] for line in log.splitlines() if line.startswith("Running")}
+    assert ran == {"VALIDACAO", "OPTIONS", "JOIN_JDLS", "FIX_COMPLETE_JDL"}
+    assert "readOnly Car, Driver\n" in read_output(out_dir, "OPTIONS.jdl").decode("utf-8")
+    assert read_output(out_dir, "ENTIDADES.jdl") == expected("ENTIDADES.jdl")
+
+def test_stage_fingerprint_covers_imported_code():
+    from pipeline import STAGES, stage_code_files
+
+    for name in STAGES:
+        files = stage_code_files(name)
+        assert files[0] == f"{name}.py"
+        assert {"instrumentation.py", "outputs.py", "build_cache.py"} <= set(files), name
+        if name not in ("JOIN_JDLS", "FIX_COMPLETE_JDL"):
+            # Leitura das abas: .xlsx, cache em disco e pastas de arquivos
+            assert {"workbook.py", "workbook_cache.py", "sources.py"} <= set(files), name
+
+def test_parallel_stages_populate_a_skipped_dependency_once(run, tmp_path, monkeypatch):
+    import time
+    import ENTIDADES
+
+    source_dir = str(tmp_path / "src")
+    shutil.copytree(CATALOG_DIR, source_dir)
+    out_dir = run(source_dir)
+
+    # CAMPOS e OPTIONS rodam juntos e ambos dependem de ENTIDADES, pulada
+    for name, row in [("CAMPOS", "Driver,age,Integer"), ("OPTIONS", "Driver,readOnly,")]:
+        with open(os.path.join(source_dir, f"{name}.csv"), "a", encoding="utf-8", newline="") as f:
+            f.write(row + "\n")
+    calls = []
+    populate = ENTIDADES.populate
+
+    def slow_populate(*args, **kwargs):
+        calls.append(args)
+        time.sleep(0.05)
+        return populate(*args, **kwargs)
+
+    monkeypatch.setattr(ENTIDADES, "populate", slow_populate)
+    run(source_dir, out_dir, jobs=4)
+    assert len(calls) == 1
+    assert "entity Driver (driver){\n  license String unique\n  age Integer\n}" in read_output(out_dir, "ENTIDADES.jdl").decode("utf-8")
+    assert "readOnly Car, Driver\n" in read_output(out_dir, "OPTIONS.jdl").decode("utf-8")
+
+def test_failed_stage_is_not_cached(run, tmp_path, capsys):
+    from pipeline import StageError
+
+    source_dir = str(tmp_path / "src")
+    shutil.copytree(CATALOG_DIR, source_dir)
+    out_dir = run(source_dir)
+
+    sheet = os.path.join(source_dir, "RELACIONAMENTOS.csv")
+    os.rename(sheet, sheet + ".bak")
+    capsys.readouterr()
+    for _ in range(2):
+        with pytest.raises(StageError, match="RELACIONAMENTOS"):
+            run(source_dir, out_dir)
+        # O fragmento do build anterior não sobrevive à falha
+        assert not os.path.exists(os.path.join(out_dir, "RELACIONAMENTOS.jdl"))
+        assert "All scripts executed successfully!" not in capsys.readouterr().out
+
+    os.rename(sheet + ".bak", sheet)
+    run(source_dir, out_dir)
+    log = capsys.readouterr().out
+    assert "Running" in log and "RELACIONAMENTOS.py" in log
+    assert_outputs(out_dir)
+
+def test_profile_reports_only_stages_that_ran(run, tmp_path, capsys):
+    source_dir = str(tmp_path / "src")
+    shutil.copytree(CATALOG_DIR, source_dir)
+    out_dir = run(source_dir, profile=True)
+    profile_dir = os.path.join(out_dir, ".jdl_profile")
+    assert "ENTIDADES.prof" in os.listdir(profile_dir)
+
+    with open(os.path.join(source_dir, "OPTIONS.csv"), "a", encoding="utf-8", newline="") as f:
+        f.write("Driver,readOnly,\n")
+    capsys.readouterr()
+    run(source_dir, out_dir, profile=True)
+    profiled = {name.split(".")[0] for name in os.listdir(profile_dir)}
+    assert profiled == {"VALIDACAO", "OPTIONS", "JOIN_JDLS", "FIX_COMPLETE_JDL"}
+    hotspots = capsys.readouterr().out.split("funções por tempo próprio", 1)[1]
+    assert not any(line.startswith(("ENTIDADES", "CAMPOS")) for line in hotspots.splitlines())
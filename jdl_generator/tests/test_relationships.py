@@ -0,0 +1,40 @@
+import pytest
+
+import RELACIONAMENTOS
+import VALIDACAO
+from jdl_model import JdlModel, Relationship, render_relationships
+
+@pytest.mark.parametrize("value", ["", "  ", "-", "–", "—", None])
+def test_placeholders_are_empty(value):
+    assert RELACIONAMENTOS.clean_cell(value) == ""
+
+def test_placeholder_injected_field_is_not_emitted(catalog_source):
+    model = RELACIONAMENTOS.populate(JdlModel(), catalog_source)
+    car_owner = next(r for r in model.relationships if r.entity_from == "Car" and r.entity_to == "Owner")
+    assert car_owner.field_from == "owner(id)"
+    assert car_owner.field_to == ""
+    assert "Car{owner(id)} to Owner\n" in render_relationships(model)
+
+def test_relationships_are_grouped_by_type_in_order_of_appearance():
+    model = JdlModel()
+    model.relationships = [
+        Relationship("ManyToOne", "A", "b", "B", ""),
+        Relationship("OneToOne", "C", "d", "D", "c", required_from=True, required_to=True),
+        Relationship("ManyToOne", "E", "user(login)", "User", "", built_in_entity=True),
+    ]
+    assert render_relationships(model) == (
+        "relationship ManyToOne {\n"
+        "    A{b} to B\n"
+        "    E{user(login)} to User with builtInEntity\n"
+        "}\n\n"
+        "relationship OneToOne {\n"
+        "    C{d required} to D{c required}\n"
+        "}\n\n"
+    )
+
+def test_required_without_injected_field_is_reported(catalog_source):
+    problems = [str(p) for p in VALIDACAO.validate(catalog_source)]
+    assert ("[AVISO] RELACIONAMENTOS, linha 5: 'Required (To)' marcado, mas o lado 'Passport' "
+            "não tem campo injetado ('required' ignorado)") in problems
+    # "-" em Required (To) não é 'required'
+    assert not any("linha 3" in p and "RELACIONAMENTOS" in p for p in problems)
@@ -0,0 +1,39 @@
+import json
+
+import pytest
+
+import sources
+
+RECORDS = [{"Entity": "Car", "Field Name": "plate"}, {}, {"Entity": "Car", "Pattern": "^[A-Z]+$"}]
+
+@pytest.fixture
+def jsonl(tmp_path):
+    path = tmp_path / "campos.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in RECORDS), encoding="utf-8")
+    return str(path)
+
+def test_jsonl_lines_are_parsed_once(jsonl, monkeypatch):
+    calls = []
+    loads = json.loads
+    monkeypatch.setattr(sources.json, "loads", lambda s: calls.append(s) or loads(s))
+    rows = list(sources.iter_rows(jsonl))
+    assert len(calls) == len(RECORDS)
+    assert rows == [
+        {"Entity": "Car", "Field Name": "plate"},
+        {"Entity": "Car", "Field Name": "", "Pattern": "^[A-Z]+$"},
+    ]
+
+def test_jsonl_frame_has_every_column(jsonl):
+    df = sources.read_frame(jsonl)
+    assert list(df.columns) == ["Entity", "Field Name", "Pattern"]
+    assert df.fillna("").values.tolist() == [["Car", "plate", ""], ["", "", ""], ["Car", "", "^[A-Z]+$"]]
+
+def test_sheet_names_ignore_case(tmp_path, jsonl):
+    (tmp_path / "CAMPOS.csv").write_text("Entity\nCar\n", encoding="utf-8")
+    (tmp_path / "Enums.csv").write_text("Enum Name\n", encoding="utf-8")
+    assert sources.sheet_files(str(tmp_path)) == {
+        "CAMPOS": str(tmp_path / "CAMPOS.csv"), "Enums": str(tmp_path / "Enums.csv"),
+    }
+    assert sources.sheet_file(str(tmp_path), "ENUMS") == str(tmp_path / "Enums.csv")
+    with pytest.raises(ValueError):
+        sources.sheet_file(str(tmp_path), "OPTIONS")
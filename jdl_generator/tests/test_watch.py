@@ -0,0 +1,19 @@
+import functools
+
+import workbook
+from watch import changed_sheets, rebuild
+
+def test_changed_sheets():
+    assert changed_sheets({"A": 1, "B": 2}, {"A": 1, "B": 3, "C": 4}) == ["B", "C"]
+    assert changed_sheets({"A": 1, "B": 2}, {"A": 1}) == ["B"]
+
+def test_corrupt_workbook_does_not_stop_watch(xlsx_source, capsys):
+    workbook.read_workbook(xlsx_source)
+    with open(xlsx_source, "wb") as f:
+        f.write(b"salvo pela metade")
+
+    ran = []
+    refresh = functools.partial(workbook.refresh_sheets, xlsx_source, ["ENTIDADES"])
+    assert rebuild(lambda **options: ran.append(options), refresh=refresh) is False
+    assert ran == []
+    assert "[ERRO] Geração falhou" in capsys.readouterr().out
@@ -0,0 +1,72 @@
+import os
+import pickle
+
+import pytest
+
+import workbook
+import workbook_cache
+from workbook_cache import WorkbookCache
+from conftest import read_catalog, write_xlsx
+from test_pipeline import assert_outputs
+
+requires_pyarrow = pytest.mark.skipif(not workbook_cache.available(), reason="cache em disco requer pyarrow")
+
+def cache_dir(xlsx_source):
+    return os.path.join(os.path.dirname(xlsx_source), ".jdl_cache", "workbooks")
+
+@requires_pyarrow
+def test_round_trip_matches_xlsx(tmp_path):
+    sheets = read_catalog()
+    sheets["EXTRA"] = [[1, "Name", None], ["a", None, None]]
+    sheets["EMPTY"] = []
+    path = write_xlsx(str(tmp_path / "w.xlsx"), sheets)
+
+    parsed = workbook.read_workbook(path)
+    workbook.clear_cache()
+    cached = workbook.read_workbook(path)
+    assert list(cached) == list(parsed)
+    for name, df in parsed.items():
+        assert list(cached[name].columns) == list(df.columns), name
+        assert cached[name].equals(df), name
+
+@requires_pyarrow
+def test_warm_run_keeps_output(run, xlsx_source, tmp_path):
+    run(xlsx_source, tmp_path / "cold", workbook_cache=True, incremental=False)
+    assert os.listdir(cache_dir(xlsx_source))
+    workbook.clear_cache()
+    assert_outputs(run(xlsx_source, tmp_path / "warm", workbook_cache=True, incremental=False))
+
+@requires_pyarrow
+def test_legacy_pickles_are_removed(xlsx_source):
+    class Boom:
+        def __reduce__(self):
+            return (os.system, ("exit 1",))
+
+    directory = cache_dir(xlsx_source)
+    os.makedirs(directory)
+    legacy = os.path.join(directory, "0" * 32 + ".pkl")
+    with open(legacy, "wb") as f:
+        pickle.dump(Boom(), f)
+
+    workbook.read_workbook(xlsx_source)
+    assert not os.path.exists(legacy)
+    assert not any(name.endswith(".pkl") for name in os.listdir(directory))
+
+@requires_pyarrow
+def test_corrupted_entry_is_discarded(xlsx_source):
+    parsed = workbook.read_workbook(xlsx_source)
+    entry = next(os.path.join(cache_dir(xlsx_source), n) for n in os.listdir(cache_dir(xlsx_source))
+                 if not n.endswith(".json"))
+    with open(os.path.join(entry, "0.feather"), "wb") as f:
+        f.write(b"not arrow")
+
+    cache = WorkbookCache.for_workbook(xlsx_source)
+    assert cache.load(os.path.abspath(xlsx_source), os.stat(xlsx_source)) is None
+    assert not os.path.exists(entry)
+    workbook.clear_cache()
+    assert list(workbook.read_workbook(xlsx_source)) == list(parsed)
+
+def test_no_disk_cache_without_pyarrow(xlsx_source, monkeypatch):
+    monkeypatch.setattr(workbook_cache, "available", lambda: False)
+    workbook.read_workbook(xlsx_source)
+    assert not os.path.exists(cache_dir(xlsx_source))
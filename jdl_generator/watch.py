@@ -0,0 +1,153 @@
+"""
+Modo --watch: um processo que fica aberto, observa a planilha e regera o
+JDL a cada salvamento, sem pagar de novo a inicialização do Python, o
+import do pandas e a leitura de todas as abas.
+
+A planilha é verificada por polling (mtime/tamanho). O debounce é
+adaptativo: um salvamento atômico (o Excel grava em um temporário e o
+renomeia) é lido logo após a primeira espera curta; só enquanto o arquivo
+continua mudando a espera dobra, até MAX_DEBOUNCE. A cada salvamento só as
+abas cujo conteúdo mudou (ver workbook.sheet_digests) são relidas; as
+demais continuam em memória, e o build incremental só executa as etapas
+afetadas. Uma pasta de arquivos por aba (ver sources) é observada da mesma
+forma.
+
+Só as abas ficam em memória entre os salvamentos: o modelo é montado de novo
+a cada geração (as etapas puladas pelo cache ainda o preenchem a partir das
+abas em memória, ver pipeline.run_pipeline), e os fragmentos .jdl são os
+gravados em disco pelo build anterior.
+
+O tempo mostrado após cada geração é o do salvamento (mtime do arquivo)
+até o complete_fixed.jdl gravado, incluindo o polling e o debounce.
+"""
+import os
+import time
+import zipfile
+import functools
+
+DEFAULT_INTERVAL = 0.05
+DEFAULT_DEBOUNCE = 0.02
+MAX_DEBOUNCE = 1.0
+
+def file_signature(path):
+    """
+    (mtime_ns, tamanho) do arquivo, ou None se ele não existir no momento
+    (o Excel grava em um arquivo temporário e depois o renomeia).
+    """
+    from workbook import source_signature
+    try:
+        return source_signature(path)
+    except OSError:
+        return None
+
+def wait_until_stable(path, signature, debounce, max_debounce=MAX_DEBOUNCE):
+    """
+    Espera até a assinatura do arquivo ficar igual por 'debounce' segundos
+    e devolve a assinatura final. A cada mudança durante a espera, o
+    intervalo dobra (até 'max_debounce').
+    """
+    while True:
+        time.sleep(debounce)
+        current = file_signature(path)
+        if current == signature:
+            return current
+        signature = current
+        debounce = min(debounce * 2, max_debounce)
+
+def last_modified(path):
+    """
+    Momento (time.time()) da última gravação do .xlsx ou, numa pasta de
+    arquivos, do arquivo de aba alterado por último.
+    """
+    if os.path.isdir(path):
+        import sources
+        paths = list(sources.sheet_files(path).values())
+    else:
+        paths = [path]
+    mtimes = []
+    for p in paths:
+        try:
+            mtimes.append(os.stat(p).st_mtime)
+        except OSError:
+            pass
+    return max(mtimes, default=None)
+
+def changed_sheets(old_digests, new_digests):
+    names = list(new_digests) + [name for name in old_digests if name not in new_digests]
+    return [name for name in names if old_digests.get(name) != new_digests.get(name)]
+
+def rebuild(run, saved_at=None, refresh=None, **pipeline_options):
+    """
+    Executa 'refresh' (releitura das abas alteradas), se houver, e o pipeline
+    e mostra o tempo gasto e, com 'saved_at' (momento do salvamento, ver
+    last_modified), o tempo desde o salvamento. Falhas (planilha corrompida
+    ou salva pela metade, planilha inválida com --strict, aba sem coluna
+    obrigatória, etc.) são mostradas, mas não encerram o modo watch.
+    """
+    start = time.perf_counter()
+    try:
+        if refresh is not None:
+            refresh()
+        run(**pipeline_options)
+    except Exception as e:
+        print(f"[ERRO] Geração falhou: {e}. Aguardando a próxima alteração...")
+        return False
+    message = f"[INFO] JDL regerado em {(time.perf_counter() - start) * 1000:.0f} ms"
+    if saved_at is not None:
+        message += f" ({max(time.time() - saved_at, 0) * 1000:.0f} ms desde o salvamento)"
+    print(message + ".")
+    return True
+
+def watch(base_dir=None, interval=DEFAULT_INTERVAL, debounce=DEFAULT_DEBOUNCE, **pipeline_options):
+    """
+    Gera o JDL uma vez e, em seguida, regera a cada alteração da planilha até
+    ser interrompido (Ctrl+C). 'pipeline_options' são repassadas a
+    run_pipeline() (streaming, jobs, strict, changes, ...); o build é sempre
+    incremental.
+    """
+    import workbook
+    from pipeline import BASE_DIR, run_pipeline
+
+    base_dir = base_dir or BASE_DIR
+    if pipeline_options.get("excel_file_path"):
+        workbook.set_workbook_path(base_dir, pipeline_options["excel_file_path"])
+    excel_file_path = workbook.workbook_path(base_dir)
+    pipeline_options = dict(pipeline_options, base_dir=base_dir, incremental=True)
+
+    signature = file_signature(excel_file_path)
+    digests = {}
+    if signature is not None:
+        rebuild(run_pipeline, **pipeline_options)
+        digests = workbook.sheet_digests(excel_file_path)
+    else:
+        print(f"[AVISO] Arquivo de planilha '{excel_file_path}' não encontrado; aguardando...")
+    print(f"[INFO] Observando {excel_file_path} (Ctrl+C para sair)")
+
+    try:
+        while True:
+            time.sleep(interval)
+            current = file_signature(excel_file_path)
+            if current is None or current == signature:
+                continue
+            current = wait_until_stable(excel_file_path, current, debounce)
+            if current is None:
+                continue
+            try:
+                new_digests = workbook.sheet_digests(excel_file_path)
+            except (OSError, KeyError, zipfile.BadZipFile):
+                # Arquivo ainda sendo gravado: tenta de novo na próxima volta
+                continue
+            signature = current
+
+            changed = changed_sheets(digests, new_digests)
+            if not changed:
+                print("[INFO] Planilha salva sem alterações no conteúdo das abas.")
+                continue
+            print(f"[INFO] Abas alteradas: {', '.join(changed)}")
+            refresh = functools.partial(workbook.refresh_sheets, excel_file_path, changed)
+            if rebuild(run_pipeline, saved_at=last_modified(excel_file_path), refresh=refresh,
+                       **pipeline_options):
+                digests = new_digests
+            # Após uma falha, as abas alteradas são relidas de novo no próximo salvamento
+    except KeyboardInterrupt:
+        print("\n[INFO] Modo watch encerrado.")
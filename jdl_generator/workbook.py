@@ -0,0 +1,381 @@
+import os
+import re
+import hashlib
+import threading
+
+EXCEL_FILE_NAME = "TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx"
+
+# pandas (e openpyxl) só são importados dentro das funções que leem abas:
+# etapas como JOIN_JDLS e FIX_COMPLETE_JDL, --help e o modo --stages não
+# pagam o custo do import.
+
+# Cache das planilhas já lidas, indexado pelo caminho absoluto do arquivo.
+# Cada entrada guarda (mtime, tamanho) para detectar alterações no .xlsx.
+_sheets_cache = {}
+_cache_lock = threading.Lock()
+
+# Digests de cada aba (ver sheet_digest), com a assinatura da fonte
+_digests_cache = {}
+
+# Abas lidas em modo streaming (linha a linha, via openpyxl read_only).
+# Essas abas NÃO são carregadas em DataFrame por read_workbook().
+_streaming_sheets = set()
+
+# Planilha de cada pasta de saída, quando não é a padrão
+# (<pasta>/TABELA_DE_CONFIGURACAO_JHIPSTER.xlsx); ver set_workbook_path
+_workbook_paths = {}
+
+# Cache em disco das abas já lidas (ver workbook_cache), reaproveitado entre
+# execuções enquanto o .xlsx não mudar; só é usado com pyarrow instalado
+_disk_cache_enabled = True
+
+def workbook_path(base_dir):
+    """
+    Caminho da planilha lida pelas etapas que gravam em 'base_dir'.
+    """
+    base_dir = os.path.abspath(base_dir)
+    return _workbook_paths.get(base_dir, os.path.join(base_dir, EXCEL_FILE_NAME))
+
+def set_workbook_path(base_dir, excel_file_path):
+    """
+    Faz as etapas que gravam em 'base_dir' lerem 'excel_file_path' em vez da
+    planilha padrão da pasta (None volta ao padrão). Usado pelo modo batch,
+    em que cada planilha gera seus arquivos em uma pasta própria.
+    """
+    base_dir = os.path.abspath(base_dir)
+    if excel_file_path is None:
+        _workbook_paths.pop(base_dir, None)
+    else:
+        _workbook_paths[base_dir] = os.path.abspath(excel_file_path)
+
+def enable_streaming(*sheet_names):
+    """
+    Ativa o modo streaming para as abas informadas (ex.: enable_streaming("CAMPOS")).
+    A etapa correspondente passa a consumir iter_sheet_rows() em vez de um DataFrame:
+    o ganho é não materializar o DataFrame da aba inteira (nem guardá-lo no
+    cache). O que a etapa monta a partir das linhas (ex.: todos os Field de
+    CAMPOS no modelo) continua em memória até o fim do build.
+    """
+    if set(sheet_names) <= _streaming_sheets:
+        return
+    _streaming_sheets.update(sheet_names)
+    _sheets_cache.clear()
+
+def disable_streaming():
+    _streaming_sheets.clear()
+    _sheets_cache.clear()
+
+def is_streaming(sheet_name):
+    return sheet_name in _streaming_sheets
+
+def set_disk_cache(enabled):
+    """
+    Liga/desliga o cache em disco das abas lidas (.jdl_cache/workbooks).
+    """
+    global _disk_cache_enabled
+    _disk_cache_enabled = enabled
+
+def read_workbook(excel_file_path):
+    """
+    Lê TODAS as abas da planilha de uma só vez (dtype=str) e devolve um dict
+    { nome_da_aba: DataFrame }. O arquivo .xlsx só é aberto/descompactado
+    novamente se tiver sido modificado desde a última leitura.
+
+    Abas em modo streaming (ver enable_streaming) ficam de fora do dict.
+
+    Fora da memória, as abas são procuradas no cache em disco (ver
+    workbook_cache), que evita descompactar e interpretar o XML do .xlsx
+    quando a planilha não mudou desde a execução anterior.
+
+    Os DataFrames retornados são compartilhados entre as etapas e não devem
+    ser alterados in-place (use fillna(...), copy(), etc., que geram cópias).
+
+    'excel_file_path' também pode ser uma pasta com um arquivo por aba (ver
+    sources); nesse caso cada aba é lida e guardada separadamente.
+    """
+    path = os.path.abspath(excel_file_path)
+    if os.path.isdir(path):
+        from sources import sheet_files
+        return {name: read_sheet(path, name) for name in sheet_files(path) if name not in _streaming_sheets}
+
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+
+    # Etapas executadas em paralelo (--jobs) esperam a primeira leitura
+    # em vez de abrir o mesmo .xlsx várias vezes
+    with _cache_lock:
+        cached = _sheets_cache.get(path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        disk_cache = None
+        variant = ",".join(sorted(_streaming_sheets))
+        if _disk_cache_enabled:
+            import workbook_cache
+            if workbook_cache.available():
+                disk_cache = workbook_cache.WorkbookCache.for_workbook(path)
+        if disk_cache is not None:
+            sheets = disk_cache.load(path, stat, variant)
+            if sheets is not None:
+                _sheets_cache[path] = (signature, sheets)
+                return sheets
+
+        import pandas as pd
+        with pd.ExcelFile(path) as xls:
+            names = [name for name in xls.sheet_names if name not in _streaming_sheets]
+            sheets = {name: xls.parse(name, dtype=str) for name in names}
+        _sheets_cache[path] = (signature, sheets)
+        if disk_cache is not None:
+            disk_cache.store(path, stat, sheets, variant)
+        return sheets
+
+def read_sheet(excel_file_path, sheet_name):
+    """
+    Devolve a aba 'sheet_name' a partir da leitura compartilhada da planilha.
+    Equivale a pd.read_excel(excel_file_path, sheet_name=sheet_name, dtype=str).
+    """
+    if os.path.isdir(excel_file_path):
+        return _read_source_sheet(os.path.abspath(excel_file_path), sheet_name)
+    sheets = read_workbook(excel_file_path)
+    if sheet_name not in sheets:
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+    return sheets[sheet_name]
+
+def _read_source_sheet(source_dir, sheet_name):
+    """
+    Aba de uma pasta de arquivos (ver sources), guardada em memória enquanto
+    o arquivo não mudar.
+    """
+    import sources
+
+    path = sources.sheet_file(source_dir, sheet_name)
+    stat = os.stat(path)
+    signature = (path, stat.st_mtime_ns, stat.st_size)
+    key = (source_dir, sheet_name)
+    with _cache_lock:
+        cached = _sheets_cache.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        df = sources.read_frame(path)
+        _sheets_cache[key] = (signature, df)
+        return df
+
+def normalize_headers(df, aliases):
+    """
+    Renomeia colunas com nomes alternativos para o nome esperado pelo código.
+    'aliases' é um dict { nome_esperado: [nomes alternativos] }; a primeira
+    alternativa presente na aba é usada, e só se o nome esperado não existir.
+    Devolve um novo DataFrame (o original, compartilhado, não é alterado).
+    """
+    renames = {}
+    for expected, alternatives in aliases.items():
+        if expected in df.columns:
+            continue
+        for alternative in alternatives:
+            if alternative in df.columns and alternative not in renames:
+                renames[alternative] = expected
+                break
+    return df.rename(columns=renames) if renames else df
+
+def column_values(df, name):
+    """
+    Valores da coluna como lista de strings sem espaços nas pontas (coluna
+    ausente = tudo ""). Percorrer listas com zip() é bem mais rápido que
+    iterrows(), que monta uma Series por linha.
+    """
+    if name not in df.columns:
+        return [""] * len(df)
+    return [str(v).strip() for v in df[name].tolist()]
+
+def iter_frame_rows(df):
+    """
+    Um dict { coluna: valor } por linha do DataFrame, com células vazias como
+    "", montado a partir das listas de cada coluna (bem mais barato que
+    iterrows() ou to_dict("records") em abas pequenas).
+    """
+    columns = list(df.columns)
+    for values in zip(*(df[name].fillna("").tolist() for name in columns)):
+        yield dict(zip(columns, values))
+
+def cell_to_str(value):
+    """
+    Converte o valor de uma célula para string, como o pandas faz com dtype=str
+    seguido de fillna(""): células vazias viram "".
+    """
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def iter_sheet_rows(excel_file_path, sheet_name, with_row_numbers=False):
+    """
+    Percorre a aba linha a linha com openpyxl em modo read_only, sem montar
+    DataFrame. Para cada linha de dados gera um dict { cabeçalho: valor_str },
+    com células vazias como "", sem materializar o DataFrame da aba inteira.
+    Com with_row_numbers=True, gera (número da linha na planilha, dict).
+
+    Em uma pasta de arquivos (ver sources), o arquivo da aba é lido da mesma
+    forma, registro a registro (ou em lotes, no caso do Parquet).
+    """
+    if os.path.isdir(excel_file_path):
+        import sources
+        yield from sources.iter_rows(sources.sheet_file(excel_file_path, sheet_name), with_row_numbers)
+        return
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(excel_file_path, read_only=True, data_only=True)
+    try:
+        if sheet_name not in wb.sheetnames:
+            raise ValueError(f"Worksheet named '{sheet_name}' not found")
+        rows = wb[sheet_name].iter_rows(values_only=True)
+
+        header_row = next(rows, None)
+        if header_row is None:
+            return
+        header = [
+            str(name) if name is not None else f"Unnamed: {idx}"
+            for idx, name in enumerate(header_row)
+        ]
+
+        for row_number, values in enumerate(rows, start=2):
+            if values is None or all(v is None for v in values):
+                continue
+            row = {name: cell_to_str(value) for name, value in zip(header, values)}
+            yield (row_number, row) if with_row_numbers else row
+    finally:
+        wb.close()
+
+def sheet_digest(excel_file_path, sheet_name):
+    """
+    Impressão digital (sha256) do conteúdo de uma aba, usada pelo build
+    incremental para saber se a aba mudou. Vem do XML da aba no .xlsx (ver
+    sheet_digests), então saber que nada mudou não exige importar o
+    pandas nem interpretar a planilha. Abas inexistentes têm um digest fixo.
+    """
+    path = os.path.abspath(excel_file_path)
+    signature = source_signature(path)
+    with _cache_lock:
+        cached = _digests_cache.get(path)
+        if cached is None or cached[0] != signature:
+            cached = (signature, sheet_digests(path))
+            _digests_cache[path] = cached
+    return cached[1].get(sheet_name, "missing")
+
+def source_signature(excel_file_path):
+    """
+    (mtime, tamanho) do .xlsx ou, para uma pasta de arquivos, a assinatura
+    de todos os arquivos de abas (ver sources.signature).
+    """
+    if os.path.isdir(excel_file_path):
+        import sources
+        return sources.signature(excel_file_path)
+    stat = os.stat(excel_file_path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def sheet_digests(excel_file_path):
+    """
+    { nome_da_aba: sha256 } do .xlsx (ver sheet_xml_digests) ou de uma
+    pasta de arquivos, em que o digest é o do arquivo de cada aba.
+    """
+    if os.path.isdir(excel_file_path):
+        import sources
+        from build_cache import file_digest
+        return {name: file_digest(path) for name, path in sources.sheet_files(excel_file_path).items()}
+    return sheet_xml_digests(excel_file_path)
+
+def refresh_sheets(excel_file_path, sheet_names):
+    """
+    Relê só as abas 'sheet_names' de uma planilha já mantida em memória e
+    atualiza o cache com a nova assinatura do arquivo; as demais abas são
+    reaproveitadas. Abas que deixaram de existir são descartadas. Se a
+    planilha ainda não foi lida, equivale a read_workbook().
+
+    Numa pasta de arquivos (ver sources), só descarta as abas alteradas e
+    devolve None: cada aba é relida quando uma etapa a pedir (a aba CAMPOS de
+    uma pasta nem vira DataFrame, ver CAMPOS.populate).
+    """
+    path = os.path.abspath(excel_file_path)
+    if os.path.isdir(path):
+        with _cache_lock:
+            for name in sheet_names:
+                _sheets_cache.pop((path, name), None)
+        return None
+
+    with _cache_lock:
+        cached = _sheets_cache.get(path)
+    if cached is None:
+        return read_workbook(path)
+
+    import pandas as pd
+    stat = os.stat(path)
+    sheets = dict(cached[1])
+    names = [name for name in sheet_names if name not in _streaming_sheets]
+    with pd.ExcelFile(path) as xls:
+        available = set(xls.sheet_names)
+        for name in names:
+            if name in available:
+                sheets[name] = xls.parse(name, dtype=str)
+            else:
+                sheets.pop(name, None)
+    with _cache_lock:
+        _sheets_cache[path] = ((stat.st_mtime_ns, stat.st_size), sheets)
+    return sheets
+
+_XLSX_NS = {
+    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+_R_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+
+# Células do tipo "s" guardam só o índice na tabela de strings compartilhadas
+_SHARED_STRING_CELL = re.compile(rb'(<c\b[^>]*\bt="s"[^>]*>\s*<v>)(\d+)(</v>)')
+_SHARED_STRING_ITEM = re.compile(rb'<si\b.*?</si>', re.DOTALL)
+
+def _shared_string(shared, index):
+    index = int(index)
+    return shared[index] if index < len(shared) else b""
+
+def sheet_xml_digests(excel_file_path):
+    """
+    { nome_da_aba: sha256 } calculado direto do XML de cada aba dentro do
+    .xlsx, sem pandas/openpyxl. Como os textos ficam em sharedStrings.xml e
+    a aba só guarda índices, cada índice é trocado pelo texto correspondente
+    antes do hash: alterar um texto muda o digest só das abas que o usam, e
+    a renumeração da tabela ao salvar não muda o digest das demais.
+    Serve para descobrir, barato, quais abas mudaram após um salvamento.
+    """
+    import zipfile
+    import posixpath
+    import xml.etree.ElementTree as ET
+
+    with zipfile.ZipFile(excel_file_path) as archive:
+        workbook_xml = ET.fromstring(archive.read("xl/workbook.xml"))
+        rels_xml = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        targets = {rel.get("Id"): rel.get("Target") for rel in rels_xml.findall("rel:Relationship", _XLSX_NS)}
+        try:
+            shared = _SHARED_STRING_ITEM.findall(archive.read("xl/sharedStrings.xml"))
+        except KeyError:
+            shared = []
+
+        digests = {}
+        for sheet in workbook_xml.findall("main:sheets/main:sheet", _XLSX_NS):
+            target = targets.get(sheet.get(_R_ID), "")
+            if target.startswith("/"):
+                part = target.lstrip("/")
+            else:
+                part = posixpath.normpath(posixpath.join("xl", target))
+            data = _SHARED_STRING_CELL.sub(
+                lambda m: m.group(1) + _shared_string(shared, m.group(2)) + m.group(3),
+                archive.read(part),
+            )
+            digests[sheet.get("name")] = hashlib.sha256(data).hexdigest()
+        return digests
+
+def clear_cache():
+    """
+    Descarta todas as planilhas mantidas em memória.
+    """
+    _sheets_cache.clear()
+    _digests_cache.clear()
@@ -0,0 +1,211 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import pandas as pd
+from build_cache import CACHE_DIR_NAME, file_digest
+
+WORKBOOKS_DIR_NAME = "workbooks"
+
+# Limites do cache em disco; ao passar de qualquer um deles, as entradas
+# usadas há mais tempo são removidas
+MAX_ENTRIES = 8
+MAX_BYTES = 512 * 1024 * 1024
+
+# Versão do formato; alterar invalida todas as entradas existentes
+FORMAT_VERSION = 2
+
+def available():
+    """
+    O cache só é usado com o pacote pyarrow instalado: as abas são guardadas
+    em Feather (Arrow IPC), que, ao contrário de pickle, não executa código
+    ao ser lido. Sem pyarrow a planilha é sempre lida do .xlsx.
+    """
+    try:
+        import pyarrow.feather  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+class WorkbookCache:
+    """
+    Cache em disco das abas já lidas de uma planilha, guardado em
+    <pasta da planilha>/.jdl_cache/workbooks. Cada planilha (caminho absoluto
+    + abas em modo streaming) tem uma entrada com:
+
+      - <chave>/<n>.feather: a n-ésima aba, com as colunas renomeadas para
+        "0", "1", ... (Feather só aceita nomes de coluna str);
+      - <chave>.json: caminho, tamanho, mtime e sha256 do .xlsx de origem,
+        mais o nome e as colunas de cada aba.
+
+    Uma entrada só é usada se o .xlsx tiver o mesmo tamanho e mtime, ou,
+    caso o mtime tenha mudado (cópia, checkout), o mesmo sha256.
+
+    Entradas .pkl de versões anteriores nunca são lidas; evict() as remove.
+    """
+
+    def __init__(self, cache_dir, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def for_workbook(cls, excel_file_path):
+        base_dir = os.path.dirname(os.path.abspath(excel_file_path))
+        return cls(os.path.join(base_dir, CACHE_DIR_NAME, WORKBOOKS_DIR_NAME))
+
+    def _key(self, path, variant):
+        raw = "\0".join([path, variant, pd.__version__, str(FORMAT_VERSION)])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir, key)
+        return base, base + ".json"
+
+    def load(self, path, stat, variant=""):
+        """
+        Devolve o dict de DataFrames guardado para a planilha 'path' (com
+        'stat' = os.stat(path)) ou None se não houver entrada válida.
+        """
+        data_dir, meta_path = self._paths(self._key(path, variant))
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if meta.get("size") != stat.st_size:
+            return None
+        if meta.get("mtime_ns") != stat.st_mtime_ns:
+            # Mesmo tamanho, mtime diferente: confere o conteúdo
+            if meta.get("sha256") != file_digest(path):
+                return None
+            meta["mtime_ns"] = stat.st_mtime_ns
+            self._write_meta(meta_path, meta)
+
+        try:
+            sheets = {
+                sheet["name"]: _read_sheet(os.path.join(data_dir, f"{index}.feather"), sheet["columns"])
+                for index, sheet in enumerate(meta["sheets"])
+            }
+        except Exception:
+            # Entrada corrompida/incompatível: descarta e lê o .xlsx de novo
+            self._remove(data_dir, meta_path)
+            return None
+
+        # Marca a entrada como usada recentemente (ordem de remoção)
+        os.utime(meta_path)
+        return sheets
+
+    def store(self, path, stat, sheets, variant=""):
+        """
+        Guarda 'sheets' para a planilha 'path' e aplica os limites do cache.
+        Falhas de escrita (disco cheio, pasta sem permissão) e abas que não
+        cabem no formato (ex.: cabeçalho do tipo data) são ignoradas.
+        """
+        data_dir, meta_path = self._paths(self._key(path, variant))
+        meta = {
+            "path": path,
+            "variant": variant,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_digest(path),
+            "created_at": time.time(),
+            "sheets": [{"name": name, "columns": list(df.columns)} for name, df in sheets.items()],
+        }
+        tmp_dir = f"{data_dir}.{os.getpid()}.tmp"
+        try:
+            json.dumps(meta)
+            os.makedirs(tmp_dir, exist_ok=True)
+            for index, df in enumerate(sheets.values()):
+                _write_sheet(os.path.join(tmp_dir, f"{index}.feather"), df)
+            self._remove(data_dir)
+            os.replace(tmp_dir, data_dir)
+            self._write_meta(meta_path, meta)
+        except (OSError, TypeError, ValueError) as e:
+            self._remove(tmp_dir)
+            print(f"[AVISO] Não foi possível gravar o cache da planilha: {str(e)}")
+            return
+        self.evict()
+
+    def _write_meta(self, meta_path, meta):
+        tmp_path = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_path, meta_path)
+
+    def _remove(self, *paths):
+        for path in paths:
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _entry_size(self, data_dir):
+        try:
+            return sum(entry.stat().st_size for entry in os.scandir(data_dir))
+        except OSError:
+            return 0
+
+    def evict(self):
+        """
+        Remove as entradas usadas há mais tempo até respeitar max_entries e
+        max_bytes, além das entradas .pkl de versões anteriores.
+        """
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        entries = []
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            if name.endswith(".pkl"):
+                self._remove(path, path[:-len(".pkl")] + ".json")
+                continue
+            if not name.endswith(".json"):
+                continue
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            data_dir = path[:-len(".json")]
+            entries.append((st.st_mtime, self._entry_size(data_dir), data_dir, path))
+        entries.sort(reverse=True)  # mais recentes primeiro
+
+        total = 0
+        for index, (_, size, data_dir, meta_path) in enumerate(entries):
+            total += size
+            if index >= self.max_entries or total > self.max_bytes:
+                self._remove(data_dir, meta_path)
+
+def _write_sheet(path, df):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    # Toda coluna vira string (as abas são lidas com dtype=str), inclusive as
+    # totalmente vazias, que o Arrow inferiria como tipo null
+    table = pa.table({
+        str(index): pa.array(df.iloc[:, index], type=pa.string(), from_pandas=True)
+        for index in range(len(df.columns))
+    })
+    feather.write_feather(table, path, compression="uncompressed")
+
+def _read_sheet(path, columns):
+    import numpy as np
+    import pyarrow.feather as feather
+
+    df = feather.read_table(path, memory_map=True).to_pandas()
+    if len(df.columns) != len(columns):
+        raise ValueError(f"{path}: esperadas {len(columns)} colunas")
+    df.columns = columns
+    # Com dtype object (pandas < 3), o Arrow devolve células vazias como None;
+    # o .xlsx lido com dtype=str, como NaN
+    for index, dtype in enumerate(df.dtypes):
+        if dtype == object:
+            values = df.iloc[:, index]
+            df.isetitem(index, values.where(values.notna(), np.nan))
+    return df